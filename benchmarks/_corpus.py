@@ -0,0 +1,54 @@
+"""
+Synthetic prompt corpus shared by the benchmark scripts.
+"""
+
+import random
+from typing import List
+
+_SENTENCES = (
+    "Write a short story about a robot who learns to paint.",
+    "Explain how does a hash map work under heavy load.",
+    "Debug this Python function that parses the server response.",
+    "Compare the pros and cons of two database frameworks.",
+    "What is the definition of a closure, with an example?",
+    "Let's chat casually about your opinion on remote work.",
+    "Analyze the data from the research study and write a summary.",
+    "Help me with something about the things in my project.",
+    "Create a tutorial that teaches beginners the concept of recursion.",
+    "Please list the advantages of this software development approach.",
+)
+
+
+def make_prompt(length: int, seed: int = 0) -> str:
+    """Build a deterministic prompt of roughly ``length`` characters."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    size = 0
+    while size < length:
+        sentence = rng.choice(_SENTENCES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)[:length]
+
+
+def make_corpus(count: int, min_length: int = 20, max_length: int = 400,
+                seed: int = 0) -> List[str]:
+    """Build ``count`` prompts with lengths spread over the given range."""
+    rng = random.Random(seed)
+    return [
+        make_prompt(rng.randint(min_length, max_length), seed + index)
+        for index in range(count)
+    ]
+
+
+def make_topical_prompt(length: int, seed: int = 0, focus: float = 0.4) -> str:
+    """Build a prompt where one seed-chosen sentence makes up ``focus`` of it."""
+    rng = random.Random(seed)
+    topic = rng.choice(_SENTENCES)
+    parts: List[str] = []
+    size = 0
+    while size < length:
+        sentence = topic if rng.random() < focus else rng.choice(_SENTENCES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)[:length]
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-length chunked analysis vs. the old 1000-character prefix.
+
+Prompts carry a format or constraint cue near the end. The prefix checks
+miss it; the chunked scanner finds it at a bounded cost. Run with
+``python benchmarks/bench_chunked_analysis.py``.
+"""
+
+import re
+import time
+
+from _corpus import make_prompt
+
+from dmps.engine import OptimizationEngine
+
+LENGTHS = (500, 2000, 5000, 10000)
+REPEAT = 200
+LIMIT = OptimizationEngine.MAX_REGEX_INPUT
+LENGTH_CUES = [
+    re.compile(r"\b\d{1,4}\s*words?\b", re.IGNORECASE),
+    re.compile(r"\b\d{1,4}\s*characters?\b", re.IGNORECASE),
+    re.compile(r"\bbrief\b", re.IGNORECASE),
+    re.compile(r"\bdetailed\b", re.IGNORECASE),
+    re.compile(r"\bshort\b", re.IGNORECASE),
+    re.compile(r"\blong\b", re.IGNORECASE),
+]
+JSON_CUE = re.compile(r"\b(?:json|yaml|xml)\b", re.IGNORECASE)
+
+
+def prefix_constraints(prompt: str) -> list:
+    """The old extraction: every check runs on the first chunk only"""
+    safe_prompt = prompt[:LIMIT]
+    found = []
+    if any(pattern.search(safe_prompt) for pattern in LENGTH_CUES):
+        found.append("Length constraint found")
+    if JSON_CUE.search(safe_prompt):
+        found.append("Structured format required")
+    return found
+
+
+def _per_call(func, prompt: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(prompt)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main() -> None:
+    engine = OptimizationEngine()
+    print(f"{'chars':>6} {'prefix µs':>10} {'chunked µs':>11} "
+          f"{'prefix finds':>13} {'chunked finds':>14}")
+    for length in LENGTHS:
+        prompt = make_prompt(length, seed=length) + " Return the answer as JSON."
+        chunked = "JSON format" in engine._extract_user_constraints(prompt)
+        prefix = "Structured format required" in prefix_constraints(prompt)
+        print(
+            f"{len(prompt):>6} {_per_call(prefix_constraints, prompt):>10.1f} "
+            f"{_per_call(engine._extract_user_constraints, prompt):>11.1f} "
+            f"{str(prefix):>13} {str(chunked):>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call instrumentation overhead of IntentClassifier.classify.
+
+"before" rebuilds the import, closure and decorator on every call, the way
+classify() used to; "after" is the class-level monitored method at several
+sampling rates. Overhead is measured against the bare scoring work.
+
+Run with ``python benchmarks/bench_classify_overhead.py``.
+"""
+
+import timeit
+
+from dmps import profiler
+from dmps.intent import IntentClassifier
+
+PROMPT = "Debug this Python code"
+NUMBER = 20000
+REPEAT = 7
+
+
+def per_call_closure(classifier: IntentClassifier, prompt: str) -> str:
+    """classify() as it was: import, nested function and decorator per call."""
+    from dmps.profiler import performance_monitor
+
+    @performance_monitor(threshold=0.05)
+    def _classify_with_monitoring() -> str:
+        scores = classifier._scanner.score(prompt)
+        if max(scores.values()) > 0:
+            return max(scores, key=scores.get)
+        return "general"
+
+    return _classify_with_monitoring()
+
+
+def bare(classifier: IntentClassifier, prompt: str) -> str:
+    scores = classifier._scanner.score(prompt)
+    if max(scores.values()) > 0:
+        return max(scores, key=scores.get)
+    return "general"
+
+
+def _per_call(func) -> float:
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e9
+
+
+def main() -> None:
+    classifier = IntentClassifier()
+    _per_call(lambda: bare(classifier, PROMPT))  # warm up
+    baseline = _per_call(lambda: bare(classifier, PROMPT))
+
+    print(f"bare scoring: {baseline:,.0f} ns/call")
+    print(f"{'variant':<24} {'ns/call':>9} {'overhead':>10}")
+
+    cost = _per_call(lambda: per_call_closure(classifier, PROMPT))
+    print(f"{'before (closure/call)':<24} {cost:>9,.0f} {cost - baseline:>8,.0f}ns")
+    try:
+        for rate in (1.0, 0.01, 0.0):
+            profiler.set_sampling_rate(rate)
+            cost = _per_call(lambda: classifier.classify(PROMPT))
+            label = f"after (rate={rate})"
+            print(f"{label:<24} {cost:>9,.0f} {cost - baseline:>8,.0f}ns")
+    finally:
+        profiler.set_sampling_rate(1.0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fused constraint detection vs. one search per cue.
+
+"per-cue" runs the engine's previous patterns (six length cues, the
+structured-format cue and the two context cues) separately over the full
+prompt; "fused" is ``detect_constraints``, one pass with named groups.
+Run with ``python benchmarks/bench_constraint_detection.py``.
+"""
+
+import re
+import time
+
+from _corpus import make_prompt
+
+from dmps.constraints import detect_constraints
+
+LENGTHS = (200, 1000, 5000, 10000)
+REPEAT = 200
+PER_CUE = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"\b\d{1,4}\s*words?\b",
+        r"\b\d{1,4}\s*characters?\b",
+        r"\bbrief\b",
+        r"\bdetailed\b",
+        r"\bshort\b",
+        r"\blong\b",
+        r"\b(?:json|yaml|xml)\b",
+        r"\b(?:context|background|use case)\b",
+        r"\b(?:style|tone|audience)\b",
+    )
+]
+
+
+def per_cue(prompt: str) -> list:
+    return [pattern.search(prompt) for pattern in PER_CUE]
+
+
+def _per_call(func, prompt: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(prompt)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main() -> None:
+    print(f"{'chars':>6} {'per-cue µs':>11} {'fused µs':>9} {'speedup':>8}")
+    for length in LENGTHS:
+        prompt = make_prompt(length, seed=length)
+        before = _per_call(per_cue, prompt)
+        after = _per_call(detect_constraints, prompt)
+        print(f"{length:>6} {before:>11.1f} {after:>9.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stage pipeline with edit scripts vs. whole-string comparison.
+
+"compare" swaps in the previous rewrite stages, which build each step's
+text with successive string operations and detect a change with
+``rewritten != prompt``; "edit script" is the default pipeline, where each
+step emits edits applied in one join and the change flag is whether the
+script is empty. Run with ``python benchmarks/bench_edit_scripts.py``.
+"""
+
+import re
+import time
+
+from _corpus import make_corpus
+
+from dmps.engine import OptimizationEngine
+from dmps.pipeline import DeliverStage, DesignStage, DevelopStage, StageContext
+from dmps.techniques import VAGUE_TERM_REWRITER, _CONTEXT_KEYWORDS, _FORMAT_KEYWORDS
+from dmps.textstats import text_stats
+
+PROMPTS = 4000
+ROUNDS = 5
+_WHITESPACE = re.compile(r"\s+")
+
+
+def old_develop(plan, prompt: str) -> str:
+    if plan.add_context and not _CONTEXT_KEYWORDS.search(prompt):
+        prompt = "Context: " + prompt
+    prompt = VAGUE_TERM_REWRITER.rewrite(prompt)
+    if text_stats(prompt).word_count < 10:
+        prompt += " Please provide detailed information."
+    return prompt
+
+
+def old_design(plan, prompt: str) -> str:
+    stats = text_stats(prompt)
+    if stats.word_count < 15:
+        prompt = plan.template.apply(stats.lowered.strip())
+    if plan.polite and not prompt.startswith(("Please", "Can you", "How")):
+        prompt = "Please " + prompt.lower()
+    return prompt
+
+
+def old_deliver(plan, prompt: str) -> str:
+    if not _FORMAT_KEYWORDS.search(prompt):
+        prompt += plan.format_suffix
+    if not prompt.endswith((".", "!", "?")):
+        prompt += "."
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+class _CompareStage:
+    """Previous stage: rewrite the text, then compare the whole string"""
+
+    def run(self, ctx: StageContext) -> None:
+        rewritten = self.step(ctx.plan, ctx.prompt)
+        if rewritten != ctx.prompt:
+            ctx.data["improvements"].append(self.improvement)
+            ctx.data["techniques_applied"].append(self.technique)
+            ctx.prompt = rewritten
+
+
+class CompareDevelop(_CompareStage, DevelopStage):
+    step = staticmethod(old_develop)
+
+
+class CompareDesign(_CompareStage, DesignStage):
+    step = staticmethod(old_design)
+
+
+class CompareDeliver(_CompareStage, DeliverStage):
+    step = staticmethod(old_deliver)
+
+
+def _engine(compare: bool) -> OptimizationEngine:
+    engine = OptimizationEngine()
+    if compare:
+        for stage in (CompareDevelop(), CompareDesign(), CompareDeliver()):
+            engine.pipeline.remove(stage.name)
+            engine.pipeline.register(stage)
+    return engine
+
+
+def _round(engine: OptimizationEngine, requests) -> float:
+    start = time.perf_counter()
+    for request in requests:
+        engine.apply_optimization(request)
+    return (time.perf_counter() - start) / len(requests) * 1e6
+
+
+def main() -> None:
+    print(f"{'prompt chars':<13} {'compare µs':>11} {'edit script µs':>15}")
+    analyzer = OptimizationEngine()
+    for low, high in ((20, 200), (200, 2000), (2000, 8000)):
+        requests = [
+            analyzer.extract_intent(p) for p in make_corpus(PROMPTS, low, high)
+        ]
+        engines = {"compare": _engine(True), "edits": _engine(False)}
+        best = dict.fromkeys(engines, float("inf"))
+        for _ in range(ROUNDS):
+            for name, engine in engines.items():
+                best[name] = min(best[name], _round(engine, requests))
+        print(f"{f'{low}-{high}':<13} {best['compare']:>11.1f} {best['edits']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
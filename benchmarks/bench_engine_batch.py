@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: apply_optimization_many() vs. the per-prompt engine calls.
+
+The per-prompt path is ``extract_intent`` + ``apply_optimization`` +
+``assemble_prompt`` for each prompt. The batch target is
+``TARGET_RATE`` prompts/sec on one core for 20-400 character prompts.
+Run with ``python benchmarks/bench_engine_batch.py``.
+"""
+
+import time
+
+from _corpus import make_corpus
+
+from dmps.engine import OptimizationEngine
+
+BATCH_SIZE = 10000
+TARGET_RATE = 3000
+
+
+def per_prompt(engine: OptimizationEngine, prompts) -> list:
+    results = []
+    for prompt in prompts:
+        request = engine.extract_intent(prompt)
+        data = engine.apply_optimization(request)
+        results.append((engine.assemble_prompt(data, request), data, request))
+    return results
+
+
+def _rate(func) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return BATCH_SIZE / best
+
+
+def main() -> None:
+    engine = OptimizationEngine()
+    prompts = make_corpus(BATCH_SIZE, 20, 400)
+    batch = engine.apply_optimization_many(prompts)
+    assert [item[0] for item in batch] == [
+        item[0] for item in per_prompt(engine, prompts)
+    ]
+
+    print(f"{'path':<26} {'prompts/sec':>12}")
+    loop_rate = _rate(lambda: per_prompt(engine, prompts))
+    print(f"{'per-prompt calls':<26} {loop_rate:>12,.0f}")
+    batch_rate = _rate(lambda: engine.apply_optimization_many(prompts))
+    print(f"{'apply_optimization_many':<26} {batch_rate:>12,.0f}")
+    status = "met" if batch_rate >= TARGET_RATE else "MISSED"
+    print(f"\ntarget {TARGET_RATE:,} prompts/sec on one core: {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Benchmark: classify_many() vs. one classify() call per prompt.
+
+Run with ``python benchmarks/bench_intent_batch.py``.
+"""
+
+import time
+
+from _corpus import make_corpus
+
+from dmps.intent import IntentClassifier, _load_numpy
+
+BATCH_SIZE = 20000
+
+
+def _rate(func) -> float:
+    start = time.perf_counter()
+    func()
+    return BATCH_SIZE / (time.perf_counter() - start)
+
+
+def main() -> None:
+    classifier = IntentClassifier()
+    prompts = make_corpus(BATCH_SIZE)
+
+    print(f"{'path':<22} {'prompts/sec':>12}")
+    print(f"{'classify() loop':<22} "
+          f"{_rate(lambda: [classifier.classify(p) for p in prompts]):>12,.0f}")
+    array_rate = _rate(lambda: classifier.classify_many(prompts, use_numpy=False))
+    print(f"{'classify_many(array)':<22} {array_rate:>12,.0f}")
+    if _load_numpy() is not None:
+        numpy_rate = _rate(lambda: classifier.classify_many(prompts, use_numpy=True))
+        print(f"{'classify_many(numpy)':<22} {numpy_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
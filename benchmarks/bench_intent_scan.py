@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fused single-pass intent scan vs. one findall per pattern.
+
+Run with ``python benchmarks/bench_intent_scan.py``.
+"""
+
+import timeit
+
+from _corpus import make_prompt
+
+from dmps.intent import IntentClassifier
+
+SIZES = (1000, 5000, 10000)
+REPEAT = 200
+
+# Trigger-dense lines that make the reference ``.*`` regexes backtrack
+ADVERSARIAL = {
+    "target_then_triggers": lambda n: ("story " + "write " * n)[:n],
+    "phrase_triggers": lambda n: ("work " + "how to " * n)[:n],
+}
+
+
+def legacy_scores(classifier: IntentClassifier, prompt: str) -> dict:
+    """Score the way classify() did before the fused scanner."""
+    return {
+        intent: sum(len(pattern.findall(prompt)) for pattern in patterns)
+        for intent, patterns in classifier.compiled_patterns.items()
+    }
+
+
+def main() -> None:
+    classifier = IntentClassifier()
+    scanner = classifier._scanner
+
+    print(f"{'chars':>6} {'per-pattern':>13} {'fused':>10} {'speedup':>8}")
+    for size in SIZES:
+        prompt = make_prompt(size)
+        assert legacy_scores(classifier, prompt) == scanner.score(prompt)
+
+        legacy = timeit.timeit(
+            lambda: legacy_scores(classifier, prompt), number=REPEAT
+        ) / REPEAT
+        fused = timeit.timeit(lambda: scanner.score(prompt), number=REPEAT) / REPEAT
+        print(
+            f"{size:>6} {legacy * 1e6:>11.1f}us {fused * 1e6:>8.1f}us "
+            f"{legacy / fused:>7.2f}x"
+        )
+
+    print("\nadversarial, 10000 chars:")
+    for name, make in ADVERSARIAL.items():
+        prompt = make(10000)
+        legacy = timeit.timeit(lambda: legacy_scores(classifier, prompt), number=3) / 3
+        fused = timeit.timeit(lambda: scanner.score(prompt), number=20) / 20
+        print(f"{name:<22} {legacy * 1e3:>8.1f}ms {fused * 1e3:>6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request cost of eager vs. lazy deconstruct components.
+
+"eager" swaps in a Deconstruct stage that builds the components dict on
+every request, as before; "lazy" is the default stage, which defers it
+until something reads the components. Each request runs the full
+``PromptOptimizer.optimize`` path in the given output mode; the two
+variants alternate rounds and the best round is kept. The Deconstruct
+stage's own median time comes from the pipeline's latency table.
+Run with ``python benchmarks/bench_lazy_components.py``.
+"""
+
+import time
+
+from _corpus import make_corpus
+
+from dmps.engine import OptimizationEngine
+from dmps.optimizer import PromptOptimizer
+from dmps.pipeline import DeconstructStage, StageContext
+from dmps.token_tracker import token_tracker
+
+PROMPTS = 1000
+ROUNDS = 5
+
+
+class EagerDeconstructStage(DeconstructStage):
+    """Builds the components dict up front"""
+
+    def run(self, ctx: StageContext) -> None:
+        ctx.data["components"] = ctx.engine._deconstruct_prompt(
+            ctx.request.raw_input, ctx.request.analysis
+        )
+
+
+def _optimizer(eager: bool) -> PromptOptimizer:
+    engine = OptimizationEngine()
+    if eager:
+        engine.pipeline.remove("deconstruct")
+        engine.pipeline.register(EagerDeconstructStage(), before="develop")
+    optimizer = PromptOptimizer()
+    optimizer._engine = engine
+    return optimizer
+
+
+def _round(optimizer: PromptOptimizer, prompts, mode: str) -> float:
+    token_tracker.traces.clear()
+    start = time.perf_counter()
+    for prompt in prompts:
+        optimizer.optimize(prompt, mode)
+    return (time.perf_counter() - start) / len(prompts) * 1e6
+
+
+def main() -> None:
+    prompts = make_corpus(PROMPTS, 20, 2000)
+    print(
+        f"{'mode':<16} {'variant':<7} {'µs/request':>11} {'deconstruct p50 ns':>19}"
+    )
+    for mode in ("conversational", "structured"):
+        optimizers = {"eager": _optimizer(True), "lazy": _optimizer(False)}
+        best = dict.fromkeys(optimizers, float("inf"))
+        for _ in range(ROUNDS):
+            for variant, optimizer in optimizers.items():
+                best[variant] = min(best[variant], _round(optimizer, prompts, mode))
+        for variant, optimizer in optimizers.items():
+            stage = optimizer.engine.pipeline.latency.snapshot()["deconstruct"]
+            print(
+                f"{mode:<16} {variant:<7} {best[variant]:>11.1f} "
+                f"{stage.p50_ns:>19,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LinearIntentModel inference latency and agreement with the rules.
+
+Trains on rule-labeled synthetic prompts (no labeled corpus ships with the
+repo), writes and memory-maps the weight file, then reports microseconds
+per prompt by length and asserts the model stays within ``BUDGET_US`` at
+every length. The best of several rounds is kept, so the model's weight
+caches are warm. Run with ``python benchmarks/bench_linear_model.py``.
+"""
+
+import os
+import tempfile
+import time
+
+from _corpus import make_corpus
+
+from dmps.intent import IntentClassifier
+from dmps.linear_model import LinearIntentModel, train_model
+
+TRAIN_SIZE = 3000
+TEST_SIZE = 1000
+LATENCY_SAMPLES = 2000
+LENGTHS = (50, 100, 200, 400, 1000, 5000)
+BUDGET_US = 50.0
+
+
+def _microseconds(func, prompts) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for prompt in prompts:
+            func(prompt)
+        best = min(best, time.perf_counter() - start)
+    return best / len(prompts) * 1e6
+
+
+def main() -> None:
+    rules = IntentClassifier()
+    train = make_corpus(TRAIN_SIZE, seed=1)
+    start = time.perf_counter()
+    model = train_model([(prompt, rules.classify(prompt)) for prompt in train])
+    print(f"trained on {TRAIN_SIZE} prompts in {time.perf_counter() - start:.2f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "intent_weights.bin")
+        model.save(path)
+        print(f"weight file: {os.path.getsize(path) / 1024:.0f} KiB")
+        loaded = LinearIntentModel.load(path)
+
+        test = make_corpus(TEST_SIZE, seed=99)
+        agreed = sum(loaded.classify(p) == rules.classify(p) for p in test)
+        print(f"agreement with rule classifier: {agreed / TEST_SIZE:.1%}")
+
+        print(f"\n{'chars':>6} {'linear us':>10} {'rules us':>10}")
+        for length in LENGTHS:
+            prompts = make_corpus(LATENCY_SAMPLES, length, length, seed=length)
+            linear = _microseconds(loaded.classify, prompts)
+            print(f"{length:>6} {linear:>10.1f} "
+                  f"{_microseconds(rules.classify, prompts):>10.1f}")
+            assert linear < BUDGET_US, f"{length} chars: {linear:.1f}us"
+        loaded.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark: apply_optimization() on templated traffic with and without a memo.
+
+The traffic draws from a small pool of distinct prompts, as templated
+upstream callers produce. Run with ``python benchmarks/bench_memo.py``.
+"""
+
+import random
+import time
+
+from _corpus import make_corpus
+
+from dmps.cache import OptimizationMemo
+from dmps.engine import OptimizationEngine
+
+REQUESTS = 20000
+DISTINCT = 200
+
+
+def _rate(engine: OptimizationEngine, requests) -> float:
+    start = time.perf_counter()
+    for request in requests:
+        engine.apply_optimization(request)
+    return len(requests) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    analyzer = OptimizationEngine()
+    pool = [analyzer.extract_intent(p) for p in make_corpus(DISTINCT, 20, 400)]
+    rng = random.Random(0)
+    requests = [rng.choice(pool) for _ in range(REQUESTS)]
+
+    memo = OptimizationMemo()
+    plain = _rate(OptimizationEngine(), requests)
+    memoized = _rate(OptimizationEngine(memo=memo), requests)
+    stats = memo.stats()
+    print(f"{'engine':<10} {'requests/sec':>13}")
+    print(f"{'no memo':<10} {plain:>13,.0f}")
+    print(f"{'memo':<10} {memoized:>13,.0f}")
+    print(
+        f"\nhits {stats.hits:,}  misses {stats.misses:,}  "
+        f"entries {stats.entries}  {stats.total_bytes / 1024:,.0f} KiB stored"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: apply_optimization() through cached plans vs. the per-call path.
+
+The per-call path is the original develop/design/deliver sequence from
+before plans existed: patterns compiled, templates built and access
+checked on every call. Run with
+``python benchmarks/bench_optimization_plans.py``.
+"""
+
+import re
+import time
+
+from _corpus import make_corpus
+
+from dmps.engine import OptimizationEngine
+from dmps.rbac import AccessControl, Role
+
+PROMPTS = 20000
+
+
+def develop_per_call(prompt: str, intent: str) -> str:
+    if intent == "technical" and not re.search(
+        r"context|background|requirements", prompt, re.IGNORECASE
+    ):
+        prompt = f"Context: {prompt}"
+    for pattern, replacement in [
+        (re.compile(r"\bsomething\b", re.IGNORECASE), "a specific item"),
+        (re.compile(r"\banything\b", re.IGNORECASE), "any relevant information"),
+        (re.compile(r"\bstuff\b", re.IGNORECASE), "relevant details"),
+        (re.compile(r"\bthings\b", re.IGNORECASE), "specific elements"),
+    ]:
+        prompt = pattern.sub(replacement, prompt)
+    if len(prompt.split()) < 10:
+        prompt += " Please provide detailed information."
+    return prompt
+
+
+def design_per_call(prompt: str, platform: str, intent: str) -> str:
+    if not AccessControl.validate_platform_access(Role.USER, platform):
+        raise PermissionError(platform)
+    templates = {
+        "claude": {"prefix": "Human: ",
+                   "structure": "Please {action}. Be thorough and accurate.",
+                   "suffix": ""},
+        "chatgpt": {"prefix": "", "structure": "Act as an expert. {action}",
+                    "suffix": "Provide a comprehensive response."},
+        "gemini": {"prefix": "", "structure": "{action}",
+                   "suffix": "Be precise and helpful."},
+        "generic": {"prefix": "", "structure": "{action}", "suffix": ""},
+    }
+    template = templates[platform]
+    if len(prompt.split()) < 15:
+        prompt = template["structure"].format(action=prompt.lower().strip())
+        if template["prefix"]:
+            prompt = template["prefix"] + prompt
+        if template["suffix"]:
+            prompt += " " + template["suffix"]
+    if intent == "technical" and not prompt.startswith(("Please", "Can you", "How")):
+        prompt = f"Please {prompt.lower()}"
+    return prompt
+
+
+def deliver_per_call(prompt: str, output_type: str) -> str:
+    instructions = {
+        "list": "Please format your response as a numbered or bulleted list.",
+        "explanation": "Please provide a clear, step-by-step explanation.",
+        "code": "Please provide code examples with comments and explanations.",
+        "creative": "Please be creative and engaging in your response.",
+        "general": "Please provide a comprehensive and well-structured response.",
+    }
+    if not re.search(r"format|structure|organize", prompt, re.IGNORECASE):
+        prompt += " " + instructions.get(output_type, instructions["general"])
+    if not prompt.endswith((".", "!", "?")):
+        prompt += "."
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def per_call(request) -> str:
+    developed = develop_per_call(request.raw_input, request.intent)
+    designed = design_per_call(developed, request.platform, request.intent)
+    return deliver_per_call(designed, request.output_type)
+
+
+def _rate(func, requests) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for request in requests:
+            func(request)
+        best = min(best, time.perf_counter() - start)
+    return len(requests) / best
+
+
+def main() -> None:
+    engine = OptimizationEngine()
+    platforms = ("claude", "chatgpt", "gemini", "generic")
+    requests = []
+    for index, prompt in enumerate(make_corpus(PROMPTS, 10, 200)):
+        request = engine.extract_intent(prompt)
+        request.platform = platforms[index % len(platforms)]
+        requests.append(request)
+    for request in requests:
+        assert engine.apply_optimization(request)["optimized_prompt"] == per_call(
+            request
+        )
+
+    print(f"{'path':<26} {'requests/sec':>13}")
+    print(f"{'per-call steps':<26} {_rate(per_call, requests):>13,.0f}")
+    plan = engine.techniques.plan
+
+    def planned(request):
+        return plan(request.intent, request.platform, request.output_type).run(
+            request.raw_input
+        )
+
+    print(f"{'cached plan.run':<26} {_rate(planned, requests):>13,.0f}")
+    print(f"{'apply_optimization':<26} "
+          f"{_rate(engine.apply_optimization, requests):>13,.0f}")
+    print(f"\ncompiled plans: {len(engine.techniques._plans)}")
+
+
+if __name__ == "__main__":
+    main()
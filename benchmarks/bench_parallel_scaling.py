@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ParallelOptimizer throughput as workers are added.
+
+Measures prompts/sec for 1, 2, 4, ... workers up to the core count
+(override with ``--max-workers``) and reports speedup and parallel
+efficiency against one worker. Pools are pre-warmed, so worker start-up
+is excluded. Run with ``python benchmarks/bench_parallel_scaling.py``.
+"""
+
+import argparse
+import os
+import time
+
+from _corpus import make_corpus
+
+from dmps.engine import OptimizationEngine
+from dmps.parallel import ParallelOptimizer
+
+
+def worker_counts(limit: int):
+    count = 1
+    while count < limit:
+        yield count
+        count *= 2
+    yield limit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--prompts", type=int, default=40000)
+    args = parser.parse_args()
+    prompts = make_corpus(args.prompts, 20, 400)
+
+    start = time.perf_counter()
+    OptimizationEngine().apply_optimization_many(prompts)
+    in_process = args.prompts / (time.perf_counter() - start)
+    print(f"in-process batch: {in_process:,.0f} prompts/sec\n")
+
+    print(f"{'workers':>7} {'prompts/sec':>12} {'speedup':>8} {'efficiency':>11}")
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        with ParallelOptimizer(max_workers=workers) as pool:
+            start = time.perf_counter()
+            outcomes = pool.optimize_many(prompts)
+            rate = args.prompts / (time.perf_counter() - start)
+        assert all(outcome.ok for outcome in outcomes)
+        baseline = baseline or rate
+        speedup = rate / baseline
+        efficiency = speedup / workers
+        print(f"{workers:>7} {rate:>12,.0f} {speedup:>7.1f}x {efficiency:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
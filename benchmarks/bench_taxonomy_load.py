@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading a large intent taxonomy with and without the disk cache.
+
+Generates a synthetic taxonomy with hundreds of intents, writes it as JSON
+and TOML, and times a cold load (parse + compile) against a warm load from
+the SHA-256-keyed cache. Run with ``python benchmarks/bench_taxonomy_load.py``.
+"""
+
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from dmps import taxonomy
+from dmps.intent import IntentClassifier
+
+INTENTS = 500
+RULES_PER_INTENT = 6
+PHRASES_PER_RULE = 6
+REPEATS = 5
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(7))
+
+
+def make_taxonomy(seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    intents = {}
+    for index in range(INTENTS):
+        rules = [
+            [" ".join(_word(rng) for _ in range(rng.randint(1, 2)))
+             for _ in range(PHRASES_PER_RULE)]
+            for _ in range(RULES_PER_INTENT - 1)
+        ]
+        rules.append({
+            "triggers": [_word(rng) for _ in range(3)],
+            "targets": [_word(rng) for _ in range(3)],
+        })
+        intents[f"intent_{index}"] = {"rules": rules, "keywords": [_word(rng)]}
+    return {"intents": intents}
+
+
+def _toml(document: dict) -> str:
+    lines = []
+    for name, entry in document["intents"].items():
+        lines.append(f"[intents.{name}]")
+        lines.append(f"keywords = {json.dumps(entry['keywords'])}")
+        rules = [
+            "{triggers = %s, targets = %s}"
+            % (json.dumps(rule["triggers"]), json.dumps(rule["targets"]))
+            if isinstance(rule, dict) else json.dumps(rule)
+            for rule in entry["rules"]
+        ]
+        lines.append(f"rules = [{', '.join(rules)}]")
+    return "\n".join(lines) + "\n"
+
+
+def _best(func) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        taxonomy._loaded_banks.clear()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    document = make_taxonomy()
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        (root / "taxonomy.json").write_text(json.dumps(document))
+        (root / "taxonomy.toml").write_text(_toml(document))
+        cache = root / "cache"
+
+        print(f"{INTENTS} intents, {INTENTS * RULES_PER_INTENT} rules")
+        print(f"{'file':<14} {'cold ms':>9} {'cached ms':>10}")
+        for name in ("taxonomy.json", "taxonomy.toml"):
+            path = root / name
+            try:
+                cold = _best(lambda: IntentClassifier.from_taxonomy(
+                    path, use_cache=False))
+            except ImportError as error:
+                print(f"{name:<14} skipped: {error}")
+                continue
+            IntentClassifier.from_taxonomy(path, cache_dir=cache)
+            warm = _best(lambda: IntentClassifier.from_taxonomy(
+                path, cache_dir=cache))
+            print(f"{name:<14} {cold:>9.1f} {warm:>10.1f}")
+
+        classifier = IntentClassifier.from_taxonomy(root / "taxonomy.json",
+                                                    cache_dir=cache)
+        rule = document["intents"]["intent_42"]["rules"][0][0]
+        print(f"\nclassify({rule!r}) -> {classifier.classify(rule)}")
+
+
+if __name__ == "__main__":
+    main()
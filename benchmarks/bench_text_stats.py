@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tokenization and allocations per request, shared vs. recomputed.
+
+"recomputed" swaps the memoized ``text_stats`` for a fresh ``TextStats`` per
+call in every consumer, so each one splits and lowercases its strings again,
+as before the shared cache. Each request runs analysis, the stage pipeline,
+both formatters and the evaluator. Reported per request: split/lower
+calls, characters they copied, the ``tracemalloc`` peak above the starting
+heap, and wall time (measured without tracing).
+Run with ``python benchmarks/bench_text_stats.py``.
+"""
+
+import time
+import tracemalloc
+from functools import lru_cache
+
+from _corpus import make_corpus
+
+from dmps import engine, evaluation, formatters, keywords, techniques, textstats
+from dmps.evaluation import ContextEvaluator
+from dmps.formatters import ConversationalFormatter, StructuredFormatter
+from dmps.token_tracker import token_tracker
+
+PROMPTS = 2000
+CONSUMERS = (engine, evaluation, formatters, keywords, techniques)
+counters = {"calls": 0, "chars": 0}
+
+
+class CountingStats(textstats.TextStats):
+    """TextStats that counts each split/lower it performs"""
+
+    __slots__ = ()
+
+    def _count(self, text: str) -> None:
+        counters["calls"] += 1
+        counters["chars"] += len(text)
+
+    @property
+    def words(self):
+        if self._words is None:
+            self._count(self.text)
+        return super().words
+
+    @property
+    def lowered(self):
+        if self._lowered is None:
+            self._count(self.text)
+        return super().lowered
+
+    @property
+    def lower_words(self):
+        if self._lower_words is None:
+            self._count(self.lowered)
+        return super().lower_words
+
+
+def request_cycle(optimizer, evaluator, formats, prompt: str) -> None:
+    request = optimizer.extract_intent(prompt)
+    data = optimizer.apply_optimization(request)
+    final = data["optimized_prompt"]
+    for formatter in formats:
+        formatter.format(data, request, final)
+    evaluator.evaluate(
+        prompt,
+        final,
+        request.analysis.token_estimate,
+        token_tracker.estimate_tokens(final),
+        analysis=request.analysis,
+    )
+
+
+def measure(prompts, factory) -> dict:
+    for module in CONSUMERS:
+        module.text_stats = factory
+    args = (
+        engine.OptimizationEngine(),
+        ContextEvaluator(),
+        (ConversationalFormatter(), StructuredFormatter()),
+    )
+
+    def reset_caches():
+        keywords.scan_keywords.cache_clear()
+        if hasattr(factory, "cache_clear"):
+            factory.cache_clear()
+
+    reset_caches()
+    counters.update(calls=0, chars=0)
+    start = time.perf_counter()
+    for prompt in prompts:
+        request_cycle(*args, prompt)
+    elapsed = time.perf_counter() - start
+    result = {
+        "us": elapsed / len(prompts) * 1e6,
+        "calls": counters["calls"] / len(prompts),
+        "chars": counters["chars"] / len(prompts),
+    }
+
+    reset_caches()
+    peaks = []
+    tracemalloc.start()
+    for prompt in prompts:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        request_cycle(*args, prompt)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    result["peak"] = sum(peaks) / len(peaks) / 1024
+    return result
+
+
+def main() -> None:
+    prompts = make_corpus(PROMPTS, 20, 2000)
+    shared = textstats.text_stats
+    modes = (
+        ("recomputed", CountingStats),
+        ("shared", lru_cache(maxsize=textstats.STATS_CACHE_SIZE)(CountingStats)),
+    )
+    print(
+        f"{'mode':<12} {'split/lower':>12} {'chars copied':>13} "
+        f"{'peak KiB':>9} {'µs/request':>11}"
+    )
+    for name, factory in modes:
+        row = measure(prompts, factory)
+        print(
+            f"{name:<12} {row['calls']:>12.1f} {row['chars']:>13,.0f} "
+            f"{row['peak']:>9.1f} {row['us']:>11.1f}"
+        )
+    for module in CONSUMERS:
+        module.text_stats = shared
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: token-budgeted optimization.
+
+Part one runs the corpus with no budget and with a budget of the prompt's
+own estimate plus a few tokens, reporting the mean token growth, how many
+results fit, and the time per request. Part two times the Develop stage on
+prompts with a growing number of vague-term additions under a tight
+budget, to show the selection stays linear in the number of additions.
+Run with ``python benchmarks/bench_token_budget.py``.
+"""
+
+import time
+
+from _corpus import make_corpus
+
+from dmps.engine import OptimizationEngine
+from dmps.pipeline import DevelopStage, StageContext
+from dmps.token_tracker import token_tracker
+
+PROMPTS = 2000
+SLACK = 8  # tokens allowed on top of the prompt's own estimate
+
+
+def run_corpus(engine, requests, slack):
+    growth = fitted = 0
+    start = time.perf_counter()
+    for request in requests:
+        request.max_tokens = (
+            None
+            if slack is None
+            else token_tracker.estimate_tokens(request.raw_input) + slack
+        )
+        data = engine.apply_optimization(request)
+        growth += token_tracker.estimate_tokens(
+            data["optimized_prompt"]
+        ) - token_tracker.estimate_tokens(request.raw_input)
+        fitted += data.get("within_budget", True)
+    elapsed = (time.perf_counter() - start) / len(requests) * 1e6
+    return growth / len(requests), fitted / len(requests), elapsed
+
+
+def time_develop(engine, additions: int) -> float:
+    prompt = " ".join(["stuff and"] * additions)
+    request = engine.extract_intent(prompt)
+    plan = engine.techniques.plan(request.intent, "generic", request.output_type)
+    budget = token_tracker.max_chars(token_tracker.estimate_tokens(prompt) + 50)
+    stage = DevelopStage()
+    rounds = 20
+    start = time.perf_counter()
+    for _ in range(rounds):
+        ctx = StageContext(engine, request, plan, prompt, {}, budget)
+        ctx.data.update(improvements=[], techniques_applied=[], edits=[])
+        stage.run(ctx)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main() -> None:
+    engine = OptimizationEngine()
+    requests = [engine.extract_intent(p) for p in make_corpus(PROMPTS, 20, 2000)]
+    print(f"{'budget':<12} {'+tokens':>8} {'fit':>6} {'µs/request':>11}")
+    for label, slack in (("none", None), (f"prompt+{SLACK}", SLACK)):
+        growth, fitted, elapsed = min(
+            (run_corpus(engine, requests, slack) for _ in range(3)),
+            key=lambda row: row[2],
+        )
+        print(f"{label:<12} {growth:>8.1f} {fitted:>6.1%} {elapsed:>11.1f}")
+
+    print(f"\n{'additions':>9} {'develop µs':>11} {'µs/addition':>12}")
+    for additions in (100, 1000, 10000):
+        elapsed = time_develop(engine, additions)
+        print(f"{additions:>9} {elapsed:>11.1f} {elapsed / additions:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vague-term rewriting, four regex passes vs. one table-driven pass.
+
+"four passes" is the previous Develop step: one compiled pattern per term,
+each ``sub`` copying the whole prompt. "one pass" is ``VagueTermRewriter``.
+Prompts are dense with vague terms (about one word in four) or use the
+ordinary benchmark corpus. Run with ``python benchmarks/bench_vague_terms.py``.
+"""
+
+import random
+import re
+import time
+
+from _corpus import make_corpus
+
+from dmps.techniques import VAGUE_TERM_REWRITER
+
+PROMPTS = 2000
+ROUNDS = 5
+_FOUR_PASSES = tuple(
+    (re.compile(rf"\b{term}\b", re.IGNORECASE), replacement)
+    for term, replacement in VAGUE_TERM_REWRITER.replacements.items()
+)
+_FILLER = ("explain", "the", "project", "Something", "stuff", "things", "anything")
+
+
+def four_passes(prompt: str) -> str:
+    for pattern, replacement in _FOUR_PASSES:
+        prompt = pattern.sub(replacement, prompt)
+    return prompt
+
+
+def dense_corpus(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(_FILLER) for _ in range(rng.randint(10, 300)))
+        for _ in range(count)
+    ]
+
+
+def _us_per_prompt(rewrite, prompts) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for prompt in prompts:
+            rewrite(prompt)
+        best = min(best, time.perf_counter() - start)
+    return best / len(prompts) * 1e6
+
+
+def main() -> None:
+    corpora = {
+        "dense": dense_corpus(PROMPTS),
+        "corpus": make_corpus(PROMPTS, 20, 2000),
+    }
+    print(f"{'prompts':<8} {'four passes µs':>15} {'one pass µs':>12} {'speedup':>8}")
+    for name, prompts in corpora.items():
+        assert all(four_passes(p) == VAGUE_TERM_REWRITER.rewrite(p) for p in prompts)
+        old = _us_per_prompt(four_passes, prompts)
+        new = _us_per_prompt(VAGUE_TERM_REWRITER.rewrite, prompts)
+        print(f"{name:<8} {old:>15.1f} {new:>12.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: N candidate prompts via generate_variants() vs. N optimize() calls.
+
+Each input gets one variant per platform, with and without the clarity
+pass, and two output types. ``optimize()`` repeats validation and analysis
+for every candidate; ``generate_variants()`` does them once. ``optimize()``
+has no output-type or stage options, so its loop only varies the platform
+and measures the cost of N full calls.
+Run with ``python benchmarks/bench_variants.py``.
+"""
+
+import time
+
+from _corpus import make_corpus
+
+from dmps.optimizer import PromptOptimizer
+from dmps.schema import VariantSpec
+
+PROMPTS = 200
+SPECS = [
+    VariantSpec(f"{platform}-{output_type}{suffix}", platform, output_type, stages)
+    for platform in ("claude", "chatgpt", "gemini")
+    for output_type in ("general", "list")
+    for suffix, stages in (("", frozenset()), ("-raw", frozenset({"develop"})))
+]
+
+
+def main() -> None:
+    prompts = make_corpus(PROMPTS, 20, 2000)
+    optimizer = PromptOptimizer()
+
+    start = time.perf_counter()
+    for prompt in prompts:
+        for spec in SPECS:
+            optimizer.optimize(prompt, "conversational", spec.platform)
+    separate = (time.perf_counter() - start) / PROMPTS * 1e3
+
+    start = time.perf_counter()
+    for prompt in prompts:
+        optimizer.generate_variants(prompt, SPECS)
+    shared = (time.perf_counter() - start) / PROMPTS * 1e3
+
+    print(f"{len(SPECS)} variants per prompt")
+    print(f"{'method':<20} {'ms/prompt':>10}")
+    print(f"{'optimize() x N':<20} {separate:>10.2f}")
+    print(f"{'generate_variants()':<20} {shared:>10.2f}")
+    print(f"speedup: {separate / shared:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
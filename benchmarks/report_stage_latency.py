@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Report: per-stage latency of apply_optimization() over a prompt corpus.
+
+Prints the pipeline's stage-latency table, first with every stage enabled
+and then with the Design stage disabled per request. Run with
+``python benchmarks/report_stage_latency.py``.
+"""
+
+from _corpus import make_corpus
+
+from dmps.engine import OptimizationEngine
+
+PROMPTS = 5000
+
+
+def report(engine: OptimizationEngine, title: str) -> None:
+    print(title)
+    print(f"  {'stage':<12} {'runs':>6} {'mean µs':>9} {'p50 µs':>8} {'p99 µs':>8}")
+    for stage, row in engine.pipeline.latency.snapshot().items():
+        print(
+            f"  {stage:<12} {row.count:>6} {row.mean_ns / 1e3:>9.2f} "
+            f"{row.p50_ns / 1e3:>8.2f} {row.p99_ns / 1e3:>8.2f}"
+        )
+
+
+def main() -> None:
+    engine = OptimizationEngine()
+    requests = [engine.extract_intent(p) for p in make_corpus(PROMPTS, 10, 400)]
+
+    for request in requests:
+        engine.apply_optimization(request)
+    report(engine, "all stages")
+
+    engine.pipeline.latency.reset()
+    for request in requests:
+        request.disabled_stages = frozenset({"design"})
+        engine.apply_optimization(request)
+    print()
+    report(engine, "design disabled")
+
+
+if __name__ == "__main__":
+    main()
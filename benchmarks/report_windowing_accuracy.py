@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Accuracy report: windowed classify() vs. full-text classification.
+
+For each windowing strategy, reports agreement with the full-text intent
+on a corpus of long prompts, the worst-case characters scanned, and the
+classification rate. Run with
+``python benchmarks/report_windowing_accuracy.py``.
+"""
+
+import random
+import time
+
+from _corpus import make_prompt, make_topical_prompt
+
+from dmps.intent import IntentClassifier, WindowingStrategy
+
+CORPUS_SIZE = 400
+MIN_LENGTH = 2000
+MAX_LENGTH = 20000
+
+STRATEGIES = {
+    "head 1000": WindowingStrategy(head=1000, tail=0, middle_count=0),
+    "default (600/200/2x100)": WindowingStrategy(),
+    "head+tail 750/250": WindowingStrategy(head=750, tail=250, middle_count=0),
+    "spread 400/200/4x100": WindowingStrategy(head=400, tail=200, middle_count=4),
+    "head-weighted 2x": WindowingStrategy(head_weight=2.0),
+    "wide 2000/1000/4x250": WindowingStrategy(
+        head=2000, tail=1000, middle_count=4, middle_size=250
+    ),
+}
+
+
+def _corpus(topical: bool):
+    rng = random.Random(7)
+    build = make_topical_prompt if topical else make_prompt
+    return [
+        build(rng.randint(MIN_LENGTH, MAX_LENGTH), seed=index)
+        for index in range(CORPUS_SIZE)
+    ]
+
+
+def _timed(classifier, prompts):
+    start = time.perf_counter()
+    intents = [classifier.classify(prompt) for prompt in prompts]
+    return intents, len(prompts) / (time.perf_counter() - start)
+
+
+def _report(title, prompts) -> None:
+    expected, full_rate = _timed(IntentClassifier(), prompts)
+    print(f"\n{title} ({len(prompts)} prompts, {MIN_LENGTH}-{MAX_LENGTH} chars)")
+    print(f"{'strategy':<26} {'max chars':>9} {'agreement':>10} {'prompts/sec':>12}")
+    print(f"{'full text':<26} {MAX_LENGTH:>9} {100.0:>9.1f}% {full_rate:>12,.0f}")
+    for name, strategy in STRATEGIES.items():
+        intents, rate = _timed(IntentClassifier(windowing=strategy), prompts)
+        agreed = sum(a == b for a, b in zip(intents, expected)) / len(prompts)
+        print(f"{name:<26} {strategy.max_chars:>9} {agreed:>9.1%} {rate:>12,.0f}")
+
+
+def main() -> None:
+    _report("Topical prompts", _corpus(topical=True))
+    _report("Mixed-topic prompts", _corpus(topical=False))
+
+
+if __name__ == "__main__":
+    main()
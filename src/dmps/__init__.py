@@ -21,6 +21,7 @@ from .intent import IntentClassifier  # noqa: F401
 from .optimizer import PromptOptimizer  # noqa: F401
 from .repl import DMPSShell  # noqa: F401
 from .schema import OptimizationRequest, OptimizedResult, ValidationResult  # noqa: F401
+from .schema import PromptVariant, VariantSpec  # noqa: F401
 from .techniques import OptimizationTechniques  # noqa: F401
 from .validation import InputValidator  # noqa: F401
 
@@ -36,6 +37,8 @@ __all__ = [
     "OptimizationRequest",
     "OptimizedResult",
     "ValidationResult",
+    "VariantSpec",
+    "PromptVariant",
     "IntentClassifier",
     "OptimizationTechniques",
     "ConversationalFormatter",
@@ -2,8 +2,12 @@
 Performance optimization with caching and lazy loading.
 """
 
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
 from functools import lru_cache
-from typing import Dict, Any, Final
+from typing import Dict, Any, Final, Hashable, NamedTuple, Optional
 
 
 class PerformanceCache:
@@ -18,8 +22,7 @@ class PerformanceCache:
     def cached_intent_classification(prompt_hash: str, prompt: str) -> str:
         """Cache intent classification results"""
         from .intent import IntentClassifier
-        classifier = IntentClassifier()
-        return classifier.classify(prompt)
+        return IntentClassifier.shared().classify(prompt)
     
     @staticmethod
     @lru_cache(maxsize=VALIDATION_CACHE_SIZE)
@@ -34,17 +37,114 @@ class PerformanceCache:
         return str(hash(prompt.strip().lower()))
 
 
+def _clone(value: Any) -> Any:
+    """Copy nested mappings (as dicts) and lists; other values are immutable
+
+    Lazy mappings are resolved, so a stored copy never keeps the inputs of
+    their factory alive outside the memo's byte count.
+    """
+    if isinstance(value, Mapping):
+        return {key: _clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone(item) for item in value]
+    return value
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate bytes held by nested mappings, lists and their contents"""
+    size = sys.getsizeof(value)
+    if isinstance(value, Mapping):
+        size += sum(
+            _estimate_size(key) + _estimate_size(item) for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(item) for item in value)
+    return size
+
+
+class MemoStats(NamedTuple):
+    """Counters for an OptimizationMemo"""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    total_bytes: int  # estimated size of the stored values
+    max_bytes: int
+
+
+class OptimizationMemo:
+    """LRU memo of optimization data, bounded by total estimated bytes.
+
+    Values are copied on the way in and out, so callers can mutate what
+    they get back without corrupting stored entries. A value larger than
+    ``max_bytes`` on its own is not stored.
+    """
+
+    DEFAULT_MAX_BYTES: Final = 16 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("Memo size must be positive")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """A copy of the stored value for ``key``, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _clone(entry[0])
+
+    def put(self, key: Hashable, value: Dict[str, Any]) -> None:
+        """Store a copy of ``value``, evicting least recently used entries"""
+        stored = _clone(value)
+        size = _estimate_size(stored)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (stored, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def stats(self) -> MemoStats:
+        with self._lock:
+            return MemoStats(
+                self.hits,
+                self.misses,
+                self.evictions,
+                len(self._entries),
+                self._bytes,
+                self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+
 # Lazy-loaded singletons for expensive objects
-_intent_classifier = None
 _optimization_engine = None
 
 def get_intent_classifier():
     """Lazy-loaded intent classifier singleton"""
-    global _intent_classifier
-    if _intent_classifier is None:
-        from .intent import IntentClassifier
-        _intent_classifier = IntentClassifier()
-    return _intent_classifier
+    from .intent import IntentClassifier
+    return IntentClassifier.shared()
 
 def get_optimization_engine():
     """Lazy-loaded optimization engine singleton"""
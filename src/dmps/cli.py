@@ -10,6 +10,7 @@ from typing import Optional
 
 from .optimizer import PromptOptimizer
 from .security import SecurityConfig
+from .techniques import PLATFORMS
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -47,7 +48,7 @@ Examples:
     parser.add_argument(
         "--platform",
         "-p",
-        choices=["claude", "chatgpt", "gemini", "generic"],
+        choices=sorted(PLATFORMS.names),
         default="claude",
         help="Target AI platform",
     )
@@ -190,7 +191,7 @@ Just type your prompt to optimize it!
 
             if prompt.lower() == "platform":
                 platform = input("Enter platform: ").strip().lower()
-                if platform in {"claude", "chatgpt", "gemini", "generic"}:
+                if platform in PLATFORMS:
                     print(f"Platform set to: {platform}")
                 else:
                     print("Invalid platform.")
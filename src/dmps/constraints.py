@@ -0,0 +1,79 @@
+"""
+Fused constraint detection for prompt analysis.
+
+One module-level pattern with a named group per cue extracts every
+explicit constraint (word and character limits, length hints, structured
+output formats) and the context cues used for missing-information checks
+in a single pass over the prompt.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Final, List, Optional
+
+from .scanning import ChunkedScanner
+
+# Matched against lowercased text; the lookahead rejects most positions
+# before any alternative is tried
+CONSTRAINT_PATTERN: Final = re.compile(
+    r"\b(?=[\dabcdjlstuxy])(?:"
+    r"(?P<words>\d{1,4})\s*words?"
+    r"|(?P<chars>\d{1,4})\s*characters?"
+    r"|(?P<length>brief|detailed|short|long)"
+    r"|(?P<format>json|yaml|xml)"
+    r"|(?P<context>context|background|use case)"
+    r"|(?P<direction>style|tone|audience)"
+    r")\b"
+)
+_GROUPS: Final = tuple(CONSTRAINT_PATTERN.groupindex)
+
+# Full-length detection in overlapping chunks under a cost budget
+_SCANNER: Final = ChunkedScanner()
+
+
+@dataclass(frozen=True)
+class Constraints:
+    """Constraints and context cues found in a prompt; first mention wins"""
+    word_limit: Optional[int] = None
+    char_limit: Optional[int] = None
+    length: Optional[str] = None  # brief, detailed, short or long
+    output_format: Optional[str] = None  # json, yaml or xml
+    has_context: bool = False  # mentions context, background or a use case
+    has_direction: bool = False  # mentions style, tone or audience
+
+    def describe(self) -> List[str]:
+        """Human-readable constraint list, e.g. ``["500 words", "JSON format"]``"""
+        described = []
+        if self.word_limit is not None:
+            described.append(f"{self.word_limit} words")
+        if self.char_limit is not None:
+            described.append(f"{self.char_limit} characters")
+        if self.length:
+            described.append(self.length)
+        if self.output_format:
+            described.append(f"{self.output_format.upper()} format")
+        return described
+
+
+def detect_constraints(
+    text: str, scanner: ChunkedScanner = _SCANNER
+) -> Constraints:
+    """Extract every constraint cue from ``text`` in one fused pass"""
+    found: Dict[str, str] = {}
+    for match in scanner.finditer(text.lower(), CONSTRAINT_PATTERN):
+        group = match.lastgroup
+        if group is not None and group not in found:
+            found[group] = match[group]
+            if len(found) == len(_GROUPS):
+                break  # every cue has fired
+
+    words, chars = found.get("words"), found.get("chars")
+    length, output_format = found.get("length"), found.get("format")
+    return Constraints(
+        word_limit=int(words) if words else None,
+        char_limit=int(chars) if chars else None,
+        length=length,
+        output_format=output_format,
+        has_context="context" in found,
+        has_direction="direction" in found,
+    )
@@ -3,17 +3,34 @@ Core optimization engine implementing the 4-D methodology.
 """
 
 import re
-from typing import Any, Dict, Final, List
-
-from .intent import IntentClassifier
-from .schema import OptimizationRequest
-from .techniques import OptimizationTechniques
+from typing import (
+    Any,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .cache import OptimizationMemo
+from .constraints import Constraints, detect_constraints
+from .intent import IntentClassifier, SupportsClassify
+from .keywords import scan_keywords
+from .pipeline import StageContext, StagePipeline, materialize
+from .scanning import ChunkedScanner
+from .schema import OptimizationRequest, PromptAnalysis
+from .techniques import PLATFORMS, VAGUE_TERM_REWRITER, OptimizationTechniques
+from .textstats import text_stats
+from .token_tracker import token_tracker
 
 
 class OptimizationEngine:
     """Core engine for prompt optimization using 4-D methodology"""
 
-    # Constants for performance
+    # Detector chunk size; longer prompts are scanned in overlapping chunks
     MAX_REGEX_INPUT: Final = 1000
 
     # Pre-compiled patterns
@@ -23,70 +40,189 @@ class OptimizationEngine:
         "code": re.compile(r"\b(?:code|function|script)\b", re.IGNORECASE),
         "creative": re.compile(r"\b(?:story|narrative|write)\b", re.IGNORECASE),
     }
+    # Context cue each intent expects, and the gap reported without it
+    _MISSING_CONTEXT: Final = {
+        "technical": ("has_context", "Technical context might be helpful"),
+        "creative": ("has_direction", "Creative direction could be specified"),
+    }
 
-    def __init__(self):
-        self.intent_classifier = IntentClassifier()
-        self.techniques = OptimizationTechniques()
+    # Full-length detection in overlapping chunks under a cost budget
+    _SCANNER: Final = ChunkedScanner(chunk_size=MAX_REGEX_INPUT)
 
-    def extract_intent(self, prompt_input: str) -> OptimizationRequest:
-        """Extract intent and create optimization request"""
-        detected_intent = self.intent_classifier.classify(prompt_input)
-
-        # Analyze prompt structure
-        expected_format = self._determine_expected_output_format(prompt_input)
-        user_constraints = self._extract_user_constraints(prompt_input)
-        missing_info = self._identify_missing_info(prompt_input, detected_intent)
+    def __init__(
+        self,
+        intent_classifier: Optional[SupportsClassify] = None,
+        memo: Optional[OptimizationMemo] = None,
+    ):
+        self.intent_classifier = intent_classifier or IntentClassifier.shared()
+        self.techniques = OptimizationTechniques()
+        self.pipeline = StagePipeline.default()
+        # Opt-in: reuse optimization data for repeated identical requests
+        self.memo = memo
+
+    def analyze(self, prompt: str) -> PromptAnalysis:
+        """Derive everything the pipeline needs from a prompt in one pass"""
+        return self._analyze(prompt, self._classify(prompt))
+
+    def analyze_many(self, prompts: Sequence[str]) -> List[PromptAnalysis]:
+        """Analyze a batch of prompts, classifying them in one batched pass"""
+        intents = self._classify_many(prompts)
+        return [
+            self._analyze(prompt, intent) for prompt, intent in zip(prompts, intents)
+        ]
 
-        return OptimizationRequest(
-            raw_input=prompt_input,
-            intent=detected_intent,
-            output_type=expected_format,
-            platform="claude",  # Default, overridden by caller
-            constraints=user_constraints,
-            missing_info=missing_info,
+    def _analyze(self, prompt: str, intent: str) -> PromptAnalysis:
+        constraints = detect_constraints(prompt, self._SCANNER)
+        stats = text_stats(prompt)
+        return PromptAnalysis(
+            text=prompt,
+            intent=intent,
+            output_type=self._determine_expected_output_format(prompt),
+            constraints=constraints.describe(),
+            missing_info=self._identify_missing_info(prompt, intent, constraints),
+            char_count=stats.char_count,
+            word_count=stats.word_count,
+            token_estimate=token_tracker.estimate_tokens(prompt),
+            keyword_hits=scan_keywords(prompt),
+            constraint_details=constraints,
+            stats=stats,
         )
 
-    def apply_optimization(self, request: OptimizationRequest) -> Dict[str, Any]:
-        """Apply 4-D optimization techniques"""
-        optimization_data = {
-            "original_prompt": request.raw_input,
-            "intent": request.intent,
-            "platform": request.platform,
-            "improvements": [],
-            "techniques_applied": [],
-        }
+    def _classify(self, prompt: str) -> str:
+        """Classify once, through the shared cache for the default classifier"""
+        if self.intent_classifier is IntentClassifier.shared():
+            from .cache import PerformanceCache
 
-        # Deconstruct: Analyze prompt components
-        components = self._deconstruct_prompt(request.raw_input)
-        optimization_data["components"] = components
+            return PerformanceCache.cached_intent_classification(
+                PerformanceCache.get_prompt_hash(prompt), prompt
+            )
+        return self.intent_classifier.classify(prompt)
 
-        # Develop: Enhance clarity and specificity
-        developed_prompt = self.techniques.develop_clarity(
-            request.raw_input, request.intent
-        )
-        if developed_prompt != request.raw_input:
-            optimization_data["improvements"].append("Enhanced clarity and specificity")
-            optimization_data["techniques_applied"].append("develop_clarity")
+    def _classify_many(self, prompts: Sequence[str]) -> List[str]:
+        """Batch-classify when the classifier's batch path matches classify()"""
+        classifier = self.intent_classifier
+        if isinstance(classifier, IntentClassifier) and classifier.windowing is None:
+            return classifier.classify_many(prompts).intents
+        return [self._classify(prompt) for prompt in prompts]
 
-        # Design: Structure for target platform
-        designed_prompt = self.techniques.design_structure(
-            developed_prompt, request.platform, request.intent
+    def extract_intent(self, prompt_input: str) -> OptimizationRequest:
+        """Extract intent and create optimization request"""
+        return self._request(self.analyze(prompt_input))
+
+    def _request(
+        self,
+        analysis: PromptAnalysis,
+        platform: str = "claude",  # Default, overridden by caller
+        disabled_stages: FrozenSet[str] = frozenset(),
+    ) -> OptimizationRequest:
+        return OptimizationRequest(
+            raw_input=analysis.text,
+            intent=analysis.intent,
+            output_type=analysis.output_type,
+            platform=platform,
+            constraints=analysis.constraints,
+            missing_info=analysis.missing_info,
+            analysis=analysis,
+            disabled_stages=disabled_stages,
         )
-        if designed_prompt != developed_prompt:
-            optimization_data["improvements"].append("Optimized structure for platform")
-            optimization_data["techniques_applied"].append("design_structure")
 
-        # Deliver: Final formatting and validation
-        final_prompt = self.techniques.deliver_format(
-            designed_prompt, request.output_type
+    def apply_optimization(
+        self, request: OptimizationRequest, lazy: bool = False
+    ) -> Dict[str, Any]:
+        """Apply 4-D optimization techniques through the stage pipeline
+
+        With ``lazy`` the ``"components"`` entry stays a ``LazyMapping`` that
+        only deconstructs the prompt when read; otherwise it is a plain dict.
+        """
+        # Develop, Design and Deliver share the compiled plan for this request
+        plan = self.techniques.plan(
+            request.intent, request.platform, request.output_type
         )
-        if final_prompt != designed_prompt:
-            optimization_data["improvements"].append("Applied final formatting")
-            optimization_data["techniques_applied"].append("deliver_format")
-
-        optimization_data["optimized_prompt"] = final_prompt
-
-        return optimization_data
+        ctx = StageContext(self, request, plan, request.raw_input, {})
+        data = self._run_stages(ctx)
+        return data if lazy else materialize(data)
+
+    def apply_optimization_many(
+        self,
+        prompts: Sequence[str],
+        platform: str = "claude",
+        disabled_stages: Iterable[str] = (),
+        lazy: bool = False,
+    ) -> List[Tuple[str, Dict[str, Any], OptimizationRequest]]:
+        """Optimize a batch of prompts for one platform, in input order
+
+        Returns ``(optimized_prompt, optimization_data, request)`` per prompt,
+        the same values as ``extract_intent``, ``apply_optimization`` and
+        ``assemble_prompt`` give one at a time, ``lazy`` included. Prompts
+        are classified in one batched pass and grouped by compiled plan, and
+        a single stage context is reused across the batch.
+        """
+        disabled = frozenset(disabled_stages)
+        requests = [
+            self._request(analysis, platform, disabled)
+            for analysis in self.analyze_many(prompts)
+        ]
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, request in enumerate(requests):
+            groups.setdefault((request.intent, request.output_type), []).append(index)
+
+        results: List[Any] = [None] * len(requests)
+        ctx: Optional[StageContext] = None
+        for (intent, output_type), indexes in groups.items():
+            plan = self.techniques.plan(intent, platform, output_type)
+            for index in indexes:
+                request = requests[index]
+                if ctx is None:
+                    ctx = StageContext(self, request, plan, request.raw_input, {})
+                else:
+                    ctx.request, ctx.plan, ctx.prompt = request, plan, request.raw_input
+                    ctx.data = {}
+                data = self._run_stages(ctx)
+                if not lazy:
+                    materialize(data)
+                results[index] = (self.assemble_prompt(data, request), data, request)
+        return results
+
+    def _run_stages(self, ctx: StageContext) -> Dict[str, Any]:
+        """Run the pipeline over ``ctx`` and return its optimization data"""
+        request = ctx.request
+        memo = self.memo
+        if memo is not None:
+            # Stage output depends only on these, the pipeline's stages and
+            # the platform templates and vague-term table in force
+            key = (
+                request.raw_input,
+                request.intent,
+                request.platform,
+                request.output_type,
+                request.disabled_stages,
+                request.max_tokens,
+                self.pipeline.names,
+                PLATFORMS.version,
+                VAGUE_TERM_REWRITER.version,
+            )
+            cached = memo.get(key)
+            if cached is not None:
+                return cached
+        ctx.data.update(
+            original_prompt=request.raw_input,
+            intent=request.intent,
+            platform=request.platform,
+            improvements=[],
+            techniques_applied=[],
+            edits=[],
+        )
+        budget = request.max_tokens
+        ctx.max_length = None if budget is None else token_tracker.max_chars(budget)
+        self.pipeline.run(ctx, request.disabled_stages)
+        ctx.data["optimized_prompt"] = ctx.prompt
+        if budget is not None:
+            # False when the prompt alone is over budget; nothing is cut from it
+            estimate = token_tracker.estimate_tokens(ctx.prompt)
+            ctx.data["within_budget"] = estimate <= budget
+        if memo is not None:
+            memo.put(key, ctx.data)
+        return ctx.data
 
     def assemble_prompt(
         self, optimization_data: Dict[str, Any], request: OptimizationRequest
@@ -96,101 +232,48 @@ class OptimizationEngine:
 
     def _determine_expected_output_format(self, user_prompt: str) -> str:
         """Analyze prompt to determine expected output format (list, code, etc.)"""
-        # Truncate long prompts for performance
-        analyzed_prompt = (
-            user_prompt[: self.MAX_REGEX_INPUT]
-            if len(user_prompt) > self.MAX_REGEX_INPUT
-            else user_prompt
-        )
-
-        # Check for specific output format indicators
-        for format_type, detection_pattern in self._OUTPUT_PATTERNS.items():
-            if detection_pattern.search(analyzed_prompt):
-                return format_type
-
-        return "general"
+        # Highest-priority format indicator anywhere in the prompt
+        return self._SCANNER.first(user_prompt, self._OUTPUT_PATTERNS) or "general"
 
     def _extract_user_constraints(self, user_prompt: str) -> List[str]:
         """Extract explicit user constraints (length, format, etc.) from prompt"""
-        found_constraints = []
+        return detect_constraints(user_prompt, self._SCANNER).describe()
 
-        # Limit input for safe regex processing
-        safe_prompt = (
-            user_prompt[: self.MAX_REGEX_INPUT]
-            if len(user_prompt) > self.MAX_REGEX_INPUT
-            else user_prompt
-        )
-
-        # Pre-compiled length patterns for performance
-        length_patterns = [
-            re.compile(r"\b\d{1,4}\s*words?\b", re.IGNORECASE),
-            re.compile(r"\b\d{1,4}\s*characters?\b", re.IGNORECASE),
-            re.compile(r"\bbrief\b", re.IGNORECASE),
-            re.compile(r"\bdetailed\b", re.IGNORECASE),
-            re.compile(r"\bshort\b", re.IGNORECASE),
-            re.compile(r"\blong\b", re.IGNORECASE),
-        ]
-
-        for pattern in length_patterns:
-            try:
-                if pattern.search(safe_prompt):
-                    found_constraints.append("Length constraint found")
-                    break  # Only need to find one
-            except re.error:
-                continue
-
-        # Format constraints
-        try:
-            if re.search(r"\b(?:json|yaml|xml)\b", safe_prompt, re.IGNORECASE):
-                found_constraints.append("Structured format required")
-        except re.error:
-            pass
-
-        return found_constraints
-
-    def _identify_missing_info(self, prompt: str, intent: str) -> List[str]:
-        """Identify potentially missing information with safe regex"""
+    def _identify_missing_info(
+        self, prompt: str, intent: str, constraints: Optional[Constraints] = None
+    ) -> List[str]:
+        """Identify potentially missing information across the whole prompt"""
         missing = []
 
-        # Limit input length
-        if len(prompt) > self.MAX_REGEX_INPUT:
-            prompt = prompt[: self.MAX_REGEX_INPUT]
-
-        prompt_lower = prompt.lower()
-
-        # Check for vague terms (simple string matching)
-        vague_terms = ["something", "anything", "stuff", "things"]
-        if any(term in prompt_lower for term in vague_terms):
+        # Check for vague terms (shared keyword scan)
+        if scan_keywords(prompt).count("vague"):
             missing.append("Vague references need clarification")
 
-        # Check for missing context based on intent (safe regex)
-        try:
-            if intent == "technical" and not re.search(
-                r"\b(?:context|background|use case)\b", prompt, re.IGNORECASE
-            ):
-                missing.append("Technical context might be helpful")
-
-            if intent == "creative" and not re.search(
-                r"\b(?:style|tone|audience)\b", prompt, re.IGNORECASE
-            ):
-                missing.append("Creative direction could be specified")
-        except re.error:
-            pass
+        # Check for missing context based on intent
+        expected = self._MISSING_CONTEXT.get(intent)
+        if expected is not None:
+            if constraints is None:
+                constraints = detect_constraints(prompt, self._SCANNER)
+            cue, gap = expected
+            if not getattr(constraints, cue):
+                missing.append(gap)
 
         return missing
 
-    def _deconstruct_prompt(self, prompt: str) -> Dict[str, Any]:
+    def _deconstruct_prompt(
+        self, prompt: str, analysis: Optional[PromptAnalysis] = None
+    ) -> Dict[str, Any]:
         """Deconstruct prompt into components"""
+        if analysis is not None:
+            word_count, hits = analysis.word_count, analysis.keyword_hits
+        else:
+            word_count, hits = text_stats(prompt).word_count, scan_keywords(prompt)
         return {
             "length": len(prompt),
-            "word_count": len(prompt.split()),
+            "word_count": word_count,
             "has_questions": "?" in prompt,
-            "has_examples": "example" in prompt.lower(),
+            "has_examples": hits.contains("example"),
             "complexity": (
-                "high"
-                if len(prompt.split()) > 50
-                else "medium"
-                if len(prompt.split()) > 20
-                else "low"
+                "high" if word_count > 50 else "medium" if word_count > 20 else "low"
             ),
         }
@@ -3,10 +3,14 @@ Evaluation framework for context engineering effectiveness.
 """
 
 import time
-from typing import Dict, List, Tuple, Final
+from typing import AbstractSet, Dict, List, Optional, Final
 from dataclasses import dataclass
 from enum import Enum
 
+from .keywords import KeywordHits, scan_keywords
+from .schema import PromptAnalysis
+from .textstats import text_stats
+
 
 class QualityMetric(Enum):
     CLARITY = "clarity"
@@ -38,11 +42,13 @@ class ContextEvaluator:
     
     def evaluate_clarity(self, original: str, optimized: str) -> float:
         """Evaluate clarity improvement (0-1 score)"""
+        return self._clarity(scan_keywords(original), scan_keywords(optimized))
+    
+    def _clarity(self, original_hits: KeywordHits,
+                 optimized_hits: KeywordHits) -> float:
         # Simple heuristics for clarity
-        vague_terms = ["something", "anything", "stuff", "things"]
-        
-        original_vague = sum(1 for term in vague_terms if term in original.lower())
-        optimized_vague = sum(1 for term in vague_terms if term in optimized.lower())
+        original_vague = original_hits.count("vague")
+        optimized_vague = optimized_hits.count("vague")
         
         # Clarity improves when vague terms are reduced
         if original_vague == 0:
@@ -53,25 +59,33 @@ class ContextEvaluator:
     
     def evaluate_specificity(self, original: str, optimized: str) -> float:
         """Evaluate specificity improvement (0-1 score)"""
+        return self._specificity(
+            text_stats(original).word_count,
+            text_stats(optimized).word_count,
+            scan_keywords(optimized),
+        )
+    
+    def _specificity(self, original_word_count: int, optimized_word_count: int,
+                     optimized_hits: KeywordHits) -> float:
         # Count specific indicators
-        specific_indicators = ["please", "specific", "detailed", "example", "context"]
-        
-        original_specific = sum(1 for term in specific_indicators if term in original.lower())
-        optimized_specific = sum(1 for term in specific_indicators if term in optimized.lower())
+        optimized_specific = optimized_hits.count("specific")
         
         # Specificity improves when specific terms are added
-        if len(original.split()) == 0:
+        if original_word_count == 0:
             return 0.5
         
-        specificity_ratio = optimized_specific / max(1, len(optimized.split()) / 10)
+        specificity_ratio = optimized_specific / max(1, optimized_word_count / 10)
         return min(1.0, specificity_ratio)
     
     def evaluate_completeness(self, original: str, optimized: str) -> float:
         """Evaluate completeness (0-1 score)"""
+        return self._completeness(
+            text_stats(original).vocabulary, text_stats(optimized).vocabulary
+        )
+    
+    def _completeness(self, original_words: AbstractSet[str],
+                      optimized_words: AbstractSet[str]) -> float:
         # Completeness based on information preservation and enhancement
-        original_words = set(original.lower().split())
-        optimized_words = set(optimized.lower().split())
-        
         # Check information preservation
         preserved_ratio = len(original_words & optimized_words) / max(1, len(original_words))
         
@@ -134,13 +148,30 @@ class ContextEvaluator:
         return recommendations
     
     def evaluate(self, original_prompt: str, optimized_prompt: str, 
-                original_tokens: int, optimized_tokens: int) -> EvaluationResult:
-        """Comprehensive evaluation of context engineering"""
+                 original_tokens: int, optimized_tokens: int,
+                 analysis: Optional[PromptAnalysis] = None) -> EvaluationResult:
+        """Comprehensive evaluation of context engineering
+
+        ``analysis`` of the original prompt supplies its keyword hits and
+        text statistics instead of re-deriving them.
+        """
+        if analysis is None:
+            original_hits = scan_keywords(original_prompt)
+            original_stats = text_stats(original_prompt)
+        else:
+            original_hits = analysis.keyword_hits
+            original_stats = analysis.stats or text_stats(original_prompt)
+        optimized_hits = scan_keywords(optimized_prompt)
+        optimized_stats = text_stats(optimized_prompt)
         
         # Calculate individual metrics
-        clarity_score = self.evaluate_clarity(original_prompt, optimized_prompt)
-        specificity_score = self.evaluate_specificity(original_prompt, optimized_prompt)
-        completeness_score = self.evaluate_completeness(original_prompt, optimized_prompt)
+        clarity_score = self._clarity(original_hits, optimized_hits)
+        specificity_score = self._specificity(
+            original_stats.word_count, optimized_stats.word_count, optimized_hits
+        )
+        completeness_score = self._completeness(
+            original_stats.vocabulary, optimized_stats.vocabulary
+        )
         
         metric_scores = {
             "clarity": clarity_score,
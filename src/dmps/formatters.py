@@ -5,6 +5,7 @@ from typing import Any, Dict, Final
 
 from .profiler import performance_monitor
 from .schema import OptimizationRequest, OptimizedResult
+from .textstats import text_stats
 
 
 class ConversationalFormatter:
@@ -46,13 +47,16 @@ class ConversationalFormatter:
             explanation_sections.extend(suggestion_lines)
 
         formatted_output = "\n".join(explanation_sections)
+        analysis = request.analysis
 
         return OptimizedResult(
             optimized_prompt=formatted_output,
             improvements=optimization_data.get("improvements", []),
             methodology_applied="4-D Conversational",
             metadata={
-                "original_length": len(request.raw_input),
+                "original_length": (
+                    analysis.char_count if analysis else len(request.raw_input)
+                ),
                 "optimized_length": len(optimized_prompt),
                 "intent": request.intent,
                 "platform": request.platform,
@@ -81,8 +85,15 @@ class StructuredFormatter:
     ) -> OptimizedResult:
         """Format optimization result as structured data with performance monitoring."""
 
-        original_words = request.raw_input.split()
-        optimized_words = optimized_prompt.split()
+        analysis = request.analysis
+        if analysis is not None:
+            original_length, original_word_count = (
+                analysis.char_count,
+                analysis.word_count,
+            )
+        else:
+            original_length = len(request.raw_input)
+            original_word_count = text_stats(request.raw_input).word_count
 
         structured_output = {
             "optimization_result": {
@@ -93,16 +104,18 @@ class StructuredFormatter:
                 "improvements_applied": optimization_data.get("improvements", []),
                 "techniques_used": optimization_data.get("techniques_applied", []),
                 "analysis": {
-                    "original_length": len(request.raw_input),
+                    "original_length": original_length,
                     "optimized_length": len(optimized_prompt),
-                    "word_count_original": len(original_words),
-                    "word_count_optimized": len(optimized_words),
+                    "word_count_original": original_word_count,
+                    "word_count_optimized": text_stats(optimized_prompt).word_count,
                     "constraints_identified": request.constraints,
                     "missing_information": request.missing_info,
                 },
                 "metadata": {
                     **self._BASE_STRUCTURE["optimization_result"],
-                    "components_analyzed": optimization_data.get("components", {}),
+                    "components_analyzed": dict(
+                        optimization_data.get("components", {})
+                    ),
                 },
             }
         }
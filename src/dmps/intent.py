@@ -1,90 +1,893 @@
 """Intent classification for prompt optimization."""
 
+import collections.abc
+import os
 import re
-from typing import Final, List
+from array import array
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from .keywords import INTENT_KEYWORDS, KeywordMatcher, scan_keywords
+from .profiler import performance_monitor
+
+
+class CoOccurrenceRule(NamedTuple):
+    """Rule that fires once per line when a trigger precedes a target."""
+
+    triggers: Tuple[str, ...]
+    targets: Tuple[str, ...]
+
+
+IntentRule = Union[Tuple[str, ...], CoOccurrenceRule]
+
+# Intent taxonomy: plain tuples are whole-word keyword alternations counted
+# per non-overlapping occurrence, co-occurrence rules count lines pairing
+# trigger and target.
+_INTENT_RULES: Final[Mapping[str, Tuple[IntentRule, ...]]] = {
+    "creative": (
+        CoOccurrenceRule(
+            ("write", "create", "generate", "compose"),
+            ("story", "poem", "article", "content"),
+        ),
+        ("creative", "imaginative", "artistic"),
+        ("character", "plot", "narrative", "fiction"),
+    ),
+    "technical": (
+        ("code", "program", "function", "algorithm", "debug"),
+        ("technical", "programming", "software", "development"),
+        ("api", "database", "server", "framework"),
+        CoOccurrenceRule(
+            ("explain", "how does", "how to"), ("work", "function", "implement")
+        ),
+    ),
+    "educational": (
+        ("explain", "teach", "learn", "understand", "clarify"),
+        ("what is", "define", "definition", "concept"),
+        ("tutorial", "guide", "instruction", "lesson"),
+        ("example", "demonstrate", "show me"),
+    ),
+    "analytical": (
+        ("analyze", "compare", "evaluate", "assess", "review"),
+        ("pros and cons", "advantages", "disadvantages"),
+        ("data", "statistics", "research", "study"),
+        ("conclusion", "summary", "findings"),
+    ),
+    "conversational": (
+        ("chat", "talk", "discuss", "conversation"),
+        ("opinion", "think", "feel", "believe"),
+        ("casual", "friendly", "informal"),
+    ),
+}
+
+
+def _alternation(phrases: Sequence[str]) -> str:
+    return "|".join(re.escape(phrase) for phrase in phrases)
+
+
+def compile_rule(rule: IntentRule) -> "re.Pattern[str]":
+    """Compile a single intent rule to its standalone regex."""
+    if isinstance(rule, CoOccurrenceRule):
+        source = (
+            rf"\b({_alternation(rule.triggers)})\b"
+            rf".*\b({_alternation(rule.targets)})\b"
+        )
+    else:
+        source = rf"\b({_alternation(rule)})\b"
+    return re.compile(source, re.IGNORECASE)
+
+
+# Roles a matched phrase can play for a rule, paired with the rule index
+_Role = Tuple[int, int]
+_KEYWORD: Final = 0
+_TRIGGER: Final = 1
+_TARGET: Final = 2
+# Word table entry: roles for the word alone, and (tail words, role) phrases
+_WordEntry = Tuple[Tuple[_Role, ...], Tuple[Tuple[Tuple[str, ...], _Role], ...]]
+
+_PHRASE_SHAPE: Final = re.compile(r"\w+(?: \w+)*")
+_NON_WORD: Final = re.compile(r"\W")
+_LEADING_WORD: Final = re.compile(r"^\w+")
+
+
+def _phrase_follows(tokens: List[str], position: int, rest: Tuple[str, ...]) -> bool:
+    """Check that ``rest`` follows the word at ``position``, single-spaced."""
+    if position + 2 * len(rest) >= len(tokens):
+        return False
+    for offset, word in enumerate(rest, 1):
+        if tokens[position + 2 * offset - 1] != " ":
+            return False
+        if tokens[position + 2 * offset] != word:
+            return False
+    return True
 
-class IntentClassifier:
-    """Classifies prompt intent for optimization."""
+
+class _LineState:
+    """Co-occurrence bookkeeping for the line currently being scanned.
+
+    A rule fires once per line when a target starts after the earliest
+    trigger end, which is exactly when ``trigger.*target`` would match.
+    Keyword matches are tracked by end so overlapping phrases of one rule
+    count once, as they would for the rule's regex alternation.
+    """
+
+    __slots__ = ("trigger_end", "fired", "keyword_end")
 
     def __init__(self) -> None:
-        # Pre-compiled patterns for performance
-        self.compiled_patterns = {
-            "creative": [
-                re.compile(
-                    r"\b(write|create|generate|compose)\b.*\b(story|poem|article|content)\b",
-                    re.IGNORECASE,
-                ),
-                re.compile(r"\b(creative|imaginative|artistic)\b", re.IGNORECASE),
-                re.compile(r"\b(character|plot|narrative|fiction)\b", re.IGNORECASE),
-            ],
-            "technical": [
-                re.compile(
-                    r"\b(code|program|function|algorithm|debug)\b", re.IGNORECASE
-                ),
-                re.compile(
-                    r"\b(technical|programming|software|development)\b", re.IGNORECASE
-                ),
-                re.compile(r"\b(api|database|server|framework)\b", re.IGNORECASE),
-                re.compile(
-                    r"\b(explain|how does|how to)\b.*\b(work|function|implement)\b",
-                    re.IGNORECASE,
-                ),
-            ],
-            "educational": [
-                re.compile(
-                    r"\b(explain|teach|learn|understand|clarify)\b", re.IGNORECASE
-                ),
-                re.compile(r"\b(what is|define|definition|concept)\b", re.IGNORECASE),
-                re.compile(r"\b(tutorial|guide|instruction|lesson)\b", re.IGNORECASE),
-                re.compile(r"\b(example|demonstrate|show me)\b", re.IGNORECASE),
-            ],
-            "analytical": [
-                re.compile(
-                    r"\b(analyze|compare|evaluate|assess|review)\b", re.IGNORECASE
-                ),
-                re.compile(
-                    r"\b(pros and cons|advantages|disadvantages)\b", re.IGNORECASE
-                ),
-                re.compile(r"\b(data|statistics|research|study)\b", re.IGNORECASE),
-                re.compile(r"\b(conclusion|summary|findings)\b", re.IGNORECASE),
-            ],
-            "conversational": [
-                re.compile(r"\b(chat|talk|discuss|conversation)\b", re.IGNORECASE),
-                re.compile(r"\b(opinion|think|feel|believe)\b", re.IGNORECASE),
-                re.compile(r"\b(casual|friendly|informal)\b", re.IGNORECASE),
-            ],
+        self.trigger_end: Dict[int, int] = {}
+        self.fired: set = set()
+        self.keyword_end: Dict[int, int] = {}
+
+    def copy(self) -> "_LineState":
+        state = _LineState()
+        state.trigger_end = dict(self.trigger_end)
+        state.fired = set(self.fired)
+        state.keyword_end = dict(self.keyword_end)
+        return state
+
+
+class IntentScanner:
+    """Scores every intent rule in a single pass over the text.
+
+    Rule phrases are compiled into a word table, so each line is tokenized
+    once and every word costs one dict lookup regardless of how many rules
+    use it. Co-occurrence rules are resolved by proximity (earliest trigger
+    end vs. target start) instead of their backtracking ``.*`` regex, so the
+    cost stays linear in the input length.
+    """
+
+    _TOKEN: Final = re.compile(r"\w+|\W+")
+
+    def __init__(self, rules: Mapping[str, Sequence[IntentRule]]) -> None:
+        # word -> (roles for the word alone, multi-word phrases it starts)
+        table: Dict[str, Tuple[List[_Role], List[Tuple[Tuple[str, ...], _Role]]]] = {}
+        flat_rules = [rule for intent_rules in rules.values() for rule in intent_rules]
+        for index, rule in enumerate(flat_rules):
+            if isinstance(rule, CoOccurrenceRule):
+                roles = [(phrase, _TRIGGER) for phrase in rule.triggers]
+                roles += [(phrase, _TARGET) for phrase in rule.targets]
+            else:
+                roles = [(phrase, _KEYWORD) for phrase in rule]
+            for phrase, role in roles:
+                if not _PHRASE_SHAPE.fullmatch(phrase):
+                    raise ValueError(f"Invalid intent phrase: {phrase!r}")
+                first, *rest = phrase.lower().split(" ")
+                entry = table.setdefault(first, ([], []))
+                if rest:
+                    entry[1].append((tuple(rest), (index, role)))
+                else:
+                    entry[0].append((index, role))
+
+        self._setup(
+            rules,
+            {
+                word: (tuple(roles), tuple(phrases))
+                for word, (roles, phrases) in table.items()
+            },
+        )
+
+    def _setup(
+        self,
+        rules: Mapping[str, Sequence[IntentRule]],
+        table: Mapping[str, _WordEntry],
+    ) -> None:
+        self.intents: Tuple[str, ...] = tuple(rules)
+        self.rules: Tuple[IntentRule, ...] = tuple(
+            rule for intent_rules in rules.values() for rule in intent_rules
+        )
+        self.rule_intents: Tuple[int, ...] = tuple(
+            intent_index
+            for intent_index, intent_rules in enumerate(rules.values())
+            for _ in intent_rules
+        )
+        self._table = table
+        # Longest phrase tail, in words; bounds how far a match can extend
+        self.max_phrase_tail = max(
+            (len(rest) for _, phrases in table.values() for rest, _ in phrases),
+            default=0,
+        )
+        # Longest table word; longer tokens can never match (case folding
+        # keeps lengths, see ``_fold``)
+        self.max_word_length = max(
+            (
+                len(word)
+                for first, (_, phrases) in table.items()
+                for word in (first, *(word for rest, _ in phrases for word in rest))
+            ),
+            default=0,
+        )
+        # Words starting several phrases of one keyword rule; only there can
+        # the rule's alternation order decide which phrase matches
+        contested = set()
+        for word, (roles, phrases) in table.items():
+            keyword_rules = [index for index, kind in roles if kind == _KEYWORD]
+            keyword_rules += [
+                index for _, (index, kind) in phrases if kind == _KEYWORD
+            ]
+            if len(keyword_rules) != len(set(keyword_rules)):
+                contested.add(word)
+        self._contested = frozenset(contested)
+        # Compiled on first non-ASCII token, so loading never pays for it
+        self._fold_words: Optional[Dict[str, str]] = None
+        self._fold_pattern: Optional["re.Pattern[str]"] = None
+
+    def to_spec(self) -> Dict[str, Any]:
+        """JSON-serializable compiled form, reloadable with ``from_spec``."""
+        return {"table": self._table}
+
+    @classmethod
+    def from_spec(
+        cls, rules: Mapping[str, Sequence[IntentRule]], spec: Mapping[str, Any]
+    ) -> "IntentScanner":
+        """Rebuild a scanner from ``to_spec`` output without recompiling rules.
+
+        The decoded JSON table is used as is: lists stand in for the tuples
+        of a freshly compiled table, since the scan only iterates and
+        unpacks them.
+        """
+        scanner = cls.__new__(cls)
+        scanner._setup(rules, spec["table"])
+        return scanner
+
+    def _compile_fold(self) -> "re.Pattern[str]":
+        words = set(self._table)
+        words.update(
+            word
+            for _, phrases in self._table.values()
+            for rest, _ in phrases
+            for word in rest
+        )
+        self._fold_words = {f"w{index}": word for index, word in enumerate(words)}
+        self._fold_pattern = re.compile(
+            "|".join(
+                f"(?P<{name}>{re.escape(word)})"
+                for name, word in self._fold_words.items()
+            ),
+            re.IGNORECASE,
+        )
+        return self._fold_pattern
+
+    def _fold(self, token: str) -> str:
+        if token.isascii():
+            return token.lower()
+        # Non-ASCII tokens can still match case-insensitively (e.g. the
+        # Kelvin sign), so they are folded through the regex engine
+        match = (self._fold_pattern or self._compile_fold()).fullmatch(token)
+        if match is None:
+            return token
+        return self._fold_words[match.lastgroup]  # type: ignore[index]
+
+    def scan(self, text: str) -> List[int]:
+        """Return the hit count for every rule, in rule order."""
+        counts = [0] * len(self.rules)
+        for line in text.split("\n"):
+            tokens, first_word = self._words(line)
+            self._scan_words(
+                tokens, range(first_word, len(tokens), 2), counts, _LineState()
+            )
+        return counts
+
+    def _words(self, line: str) -> Tuple[List[str], int]:
+        """Tokenize a line into folded words and separators.
+
+        Tokens alternate between word and separator runs, so the returned
+        offset (0 or 1) is the index of the first word token.
+        """
+        if line.isascii():
+            tokens = self._TOKEN.findall(line.lower())
+        else:
+            tokens = [
+                token if _NON_WORD.match(token) else self._fold(token)
+                for token in self._TOKEN.findall(line)
+            ]
+        first_word = 0 if tokens and not _NON_WORD.match(tokens[0]) else 1
+        return tokens, first_word
+
+    def _scan_words(
+        self,
+        tokens: List[str],
+        positions: range,
+        counts: List[int],
+        line: _LineState,
+        base: int = 0,
+    ) -> None:
+        """Score the word tokens at ``positions``, tracking co-occurrences.
+
+        ``base`` offsets token indices so state carries across re-tokenized
+        fragments of the same line.
+        """
+        table = self._table
+        for position in positions:
+            entry = table.get(tokens[position])
+            if entry is None:
+                continue
+            roles, phrases = entry
+            hits = [(role, position) for role in roles]
+            for rest, role in phrases:
+                if _phrase_follows(tokens, position, rest):
+                    hits.append((role, position + 2 * len(rest)))
+            start = base + position
+            for (rule_index, kind), end in hits:
+                if kind == _KEYWORD:
+                    if start <= line.keyword_end.get(rule_index, -1):
+                        continue
+                    if tokens[position] in self._contested:
+                        end = self._first_listed(rule_index, tokens, position)
+                    line.keyword_end[rule_index] = base + end
+                    counts[rule_index] += 1
+                elif kind == _TRIGGER:
+                    end += base
+                    if end < line.trigger_end.get(rule_index, end + 1):
+                        line.trigger_end[rule_index] = end
+                elif rule_index not in line.fired and (
+                    line.trigger_end.get(rule_index, start) < start
+                ):
+                    line.fired.add(rule_index)
+                    counts[rule_index] += 1
+
+    def _first_listed(self, rule_index: int, tokens: List[str], position: int) -> int:
+        """End of the phrase the rule's alternation picks at ``position``."""
+        words = (phrase.lower().split(" ") for phrase in self.rules[rule_index])
+        return next(
+            position + 2 * len(rest)
+            for first, *rest in words
+            if first == tokens[position]
+            and _phrase_follows(tokens, position, tuple(rest))
+        )
+
+    def score(self, text: str) -> Dict[str, int]:
+        """Return per-intent scores, in taxonomy order."""
+        return self.totals(self.scan(text))
+
+    def totals(self, counts: Sequence[int]) -> Dict[str, int]:
+        """Sum per-rule counts into per-intent scores."""
+        scores = dict.fromkeys(self.intents, 0)
+        for rule_index, count in enumerate(counts):
+            if count:
+                scores[self.intents[self.rule_intents[rule_index]]] += count
+        return scores
+
+
+def rule_to_data(rule: IntentRule) -> Any:
+    """Plain JSON/TOML form of a rule: a phrase list or a trigger/target table."""
+    if isinstance(rule, CoOccurrenceRule):
+        return {"triggers": list(rule.triggers), "targets": list(rule.targets)}
+    return list(rule)
+
+
+def rule_from_data(data: Any) -> IntentRule:
+    """Parse a rule from its ``rule_to_data`` form."""
+    if isinstance(data, Mapping):
+        if set(data) != {"triggers", "targets"}:
+            raise ValueError(f"Invalid co-occurrence rule: {data!r}")
+        return CoOccurrenceRule(
+            _phrases(data["triggers"]), _phrases(data["targets"])
+        )
+    return _phrases(data)
+
+
+def _phrases(data: Any) -> Tuple[str, ...]:
+    if isinstance(data, str) or not isinstance(data, Sequence) or not data:
+        raise ValueError(f"Expected a non-empty list of phrases: {data!r}")
+    if not all(isinstance(phrase, str) for phrase in data):
+        raise ValueError(f"Phrases must be strings: {data!r}")
+    return tuple(data)
+
+
+def _split_intents(
+    intents: Mapping[str, Any]
+) -> Tuple[Dict[str, Tuple[IntentRule, ...]], Dict[str, Tuple[str, ...]]]:
+    """Split ``{intent: {"rules": [...], "keywords": [...]}}`` entries.
+
+    Intents without rules only contribute keywords; they never score.
+    """
+    rules: Dict[str, Tuple[IntentRule, ...]] = {}
+    keywords: Dict[str, Tuple[str, ...]] = {}
+    for intent, entry in intents.items():
+        if not isinstance(entry, Mapping) or set(entry) - {"rules", "keywords"}:
+            raise ValueError(f"Invalid taxonomy entry for intent {intent!r}")
+        if entry.get("rules"):
+            rules[intent] = tuple(rule_from_data(rule) for rule in entry["rules"])
+        if entry.get("keywords"):
+            keywords[intent] = _phrases(entry["keywords"])
+    if not rules:
+        raise ValueError("Taxonomy defines no intent rules")
+    return rules, keywords
+
+
+class _LazyPatterns(collections.abc.Mapping):
+    """Read-only intent -> standalone regexes, compiled on first access."""
+
+    def __init__(self, rules: Mapping[str, Sequence[IntentRule]]) -> None:
+        self._rules = rules
+        self._compiled: Dict[str, Tuple["re.Pattern[str]", ...]] = {}
+
+    def __getitem__(self, intent: str) -> Tuple["re.Pattern[str]", ...]:
+        patterns = self._compiled.get(intent)
+        if patterns is None:
+            patterns = tuple(compile_rule(rule) for rule in self._rules[intent])
+            self._compiled[intent] = patterns
+        return patterns
+
+    def __iter__(self) -> Any:
+        return iter(self._rules)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+
+class PatternBank(NamedTuple):
+    """Immutable compiled form of an intent taxonomy, shared by classifiers.
+
+    ``compiled_patterns`` are the standalone per-rule regexes, kept for
+    reference and compiled on first access; classification only runs the
+    linear-time ``scanner``. ``keywords`` lists the descriptive keywords of
+    each intent.
+    """
+
+    compiled_patterns: Mapping[str, Tuple["re.Pattern[str]", ...]]
+    scanner: IntentScanner
+    keywords: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
+
+    @classmethod
+    def compile(
+        cls,
+        rules: Mapping[str, Sequence[IntentRule]],
+        keywords: Optional[Mapping[str, Sequence[str]]] = None,
+    ) -> "PatternBank":
+        """Compile a taxonomy into standalone patterns and a fused scanner."""
+        return cls._build(rules, IntentScanner(rules), keywords)
+
+    @classmethod
+    def from_intents(cls, intents: Mapping[str, Any]) -> "PatternBank":
+        """Compile ``{intent: {"rules": [...], "keywords": [...]}}`` data."""
+        return cls.compile(*_split_intents(intents))
+
+    @classmethod
+    def from_spec(cls, spec: Mapping[str, Any]) -> "PatternBank":
+        """Rebuild a bank from ``to_spec`` output."""
+        # Specs are written by to_spec from validated rules; skip re-validation
+        rules = {
+            intent: tuple(
+                CoOccurrenceRule(tuple(rule["triggers"]), tuple(rule["targets"]))
+                if isinstance(rule, dict)
+                else tuple(rule)
+                for rule in entry["rules"]
+            )
+            for intent, entry in spec["intents"].items()
+            if entry["rules"]
         }
+        keywords = {
+            intent: entry["keywords"]
+            for intent, entry in spec["intents"].items()
+            if entry["keywords"]
+        }
+        return cls._build(rules, IntentScanner.from_spec(rules, spec), keywords)
+
+    @classmethod
+    def _build(
+        cls,
+        rules: Mapping[str, Sequence[IntentRule]],
+        scanner: IntentScanner,
+        keywords: Optional[Mapping[str, Sequence[str]]],
+    ) -> "PatternBank":
+        frozen = {intent: tuple(intent_rules) for intent, intent_rules in rules.items()}
+        return cls(
+            compiled_patterns=_LazyPatterns(MappingProxyType(frozen)),
+            scanner=scanner,
+            keywords=MappingProxyType(
+                {intent: tuple(terms) for intent, terms in (keywords or {}).items()}
+            ),
+        )
 
+    def to_spec(self) -> Dict[str, Any]:
+        """JSON-serializable taxonomy plus the scanner's compiled word table."""
+        scanner = self.scanner
+        intents: Dict[str, Dict[str, Any]] = {
+            intent: {"rules": [], "keywords": []}
+            for intent in (*scanner.intents, *self.keywords)
+        }
+        for rule, intent_index in zip(scanner.rules, scanner.rule_intents):
+            intents[scanner.intents[intent_index]]["rules"].append(rule_to_data(rule))
+        for intent, terms in self.keywords.items():
+            intents[intent]["keywords"] = list(terms)
+        return {"intents": intents, **scanner.to_spec()}
+
+
+# Compiled once per process; every default classifier shares it
+_DEFAULT_BANK: Final = PatternBank.compile(_INTENT_RULES, INTENT_KEYWORDS)
+
+
+def _best_intent(scores: Mapping[str, float]) -> str:
+    if max(scores.values()) > 0:
+        return max(scores, key=scores.get)  # type: ignore[arg-type]
+    return "general"
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    return _NON_WORD.match(text, index) is None
+
+
+@dataclass(frozen=True)
+class WindowingStrategy:
+    """Bounded-cost view of long prompts: head, tail and sampled middle windows.
+
+    Prompts no longer than ``max_chars`` are scanned in full. Longer prompts
+    are scanned only inside the windows, whose combined length never exceeds
+    ``max_chars``; window edges move inward to word boundaries, so the
+    ceiling holds after snapping. Each window's hits are multiplied by its
+    weight before the per-intent scores are summed.
+    """
+
+    head: int = 600
+    tail: int = 200
+    middle_count: int = 2
+    middle_size: int = 100
+    head_weight: float = 1.0
+    tail_weight: float = 1.0
+    middle_weight: float = 1.0
+
+    def __post_init__(self) -> None:
+        sizes = (self.head, self.tail, self.middle_count, self.middle_size)
+        if min(sizes) < 0:
+            raise ValueError("Window sizes must be non-negative")
+        if self.max_chars == 0:
+            raise ValueError("Windowing strategy must scan at least one character")
+        weights = (self.head_weight, self.tail_weight, self.middle_weight)
+        if min(weights) < 0:
+            raise ValueError("Window weights must be non-negative")
+
+    @property
+    def max_chars(self) -> int:
+        """Hard ceiling on characters scanned per prompt."""
+        return self.head + self.tail + self.middle_count * self.middle_size
+
+    def windows(self, text: str) -> List[Tuple[int, int, float]]:
+        """Return ``(start, end, weight)`` spans of ``text`` to scan."""
+        length = len(text)
+        if length <= self.max_chars:
+            return [(0, length, 1.0)]
+
+        spans = [(0, self.head, self.head_weight)]
+        middle_start, middle_end = self.head, length - self.tail
+        stride = (middle_end - middle_start) / (self.middle_count + 1)
+        for index in range(1, self.middle_count + 1):
+            # Evenly spaced samples keep results deterministic per text
+            start = middle_start + int(stride * index) - self.middle_size // 2
+            spans.append((start, start + self.middle_size, self.middle_weight))
+        spans.append((middle_end, length, self.tail_weight))
+
+        windows = []
+        previous_end = 0
+        for start, end, weight in spans:
+            # Clip overlaps so no character is scanned (or counted) twice
+            start, end = self._snap(text, max(start, previous_end), end)
+            if start < end and weight:
+                windows.append((start, end, weight))
+            previous_end = max(previous_end, end)
+        return windows
+
+    @staticmethod
+    def _snap(text: str, start: int, end: int) -> Tuple[int, int]:
+        """Shrink a span so it neither starts nor ends inside a word."""
+        if 0 < start < end and _is_word_char(text, start - 1):
+            while start < end and _is_word_char(text, start):
+                start += 1
+        if start < end < len(text) and _is_word_char(text, end):
+            while end > start and _is_word_char(text, end - 1):
+                end -= 1
+        return start, end
+
+    def score(self, scanner: "IntentScanner", text: str) -> Dict[str, float]:
+        """Weighted per-intent scores over the windows of ``text``."""
+        counts = [0.0] * len(scanner.rules)
+        for start, end, weight in self.windows(text):
+            for rule_index, count in enumerate(scanner.scan(text[start:end])):
+                if count:
+                    counts[rule_index] += count * weight
+        return scanner.totals(counts)  # type: ignore[return-value]
+
+
+def _load_numpy() -> Any:
+    """Import NumPy lazily; batch scoring falls back to ``array`` without it."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class _ArrayMatrix:
+    """Row-major integer matrix over ``array('l')`` for NumPy-less installs."""
+
+    __slots__ = ("data", "shape")
+
+    def __init__(self, data: "array[int]", shape: Tuple[int, int]) -> None:
+        self.data = data
+        self.shape = shape
+
+    def __getitem__(self, index: Any) -> Any:
+        columns = self.shape[1]
+        if isinstance(index, tuple):
+            row, column = index
+            return self.data[row * columns + column]
+        return self.data[index * columns : (index + 1) * columns]
+
+    def tolist(self) -> List[List[int]]:
+        columns = self.shape[1]
+        return [
+            self.data[row * columns : (row + 1) * columns].tolist()
+            for row in range(self.shape[0])
+        ]
+
+
+@dataclass
+class BatchClassification:
+    """Intents and raw score matrices for a batch of prompts.
+
+    Matrices are NumPy arrays when NumPy is installed, otherwise
+    ``array``-backed matrices supporting ``m[row, column]``, ``m[row]``,
+    ``shape`` and ``tolist()``.
+    """
+
+    intents: List[str]
+    pattern_hits: Any  # prompts x patterns hit counts
+    intent_scores: Any  # prompts x intents summed scores
+    intent_labels: Tuple[str, ...]  # intent_scores column labels
+    pattern_intents: Tuple[str, ...]  # intent owning each pattern_hits column
+
+
+class SupportsClassify(Protocol):
+    """Anything that maps a prompt to an intent label."""
+
+    def classify(self, prompt: str) -> str: ...
+
+
+class IntentClassifier:
+    """Classifies prompt intent for optimization."""
+
+    _shared_instance: Optional["IntentClassifier"] = None
+
+    def __init__(
+        self,
+        bank: Optional[PatternBank] = None,
+        windowing: Optional[WindowingStrategy] = None,
+    ) -> None:
+        # Patterns are compiled once per process and shared, not per instance
+        bank = bank or _DEFAULT_BANK
+        self.compiled_patterns = bank.compiled_patterns
+        self._scanner = bank.scanner
+        self._keywords = bank.keywords
+        # The default keywords go through the shared, memoized keyword scan
+        self._keyword_matcher = (
+            None
+            if bank.keywords is _DEFAULT_BANK.keywords
+            else KeywordMatcher(
+                {f"intent:{intent}": terms for intent, terms in bank.keywords.items()}
+            )
+        )
+        # None scans the full prompt; a strategy bounds classify's cost
+        self.windowing = windowing
+
+    @classmethod
+    def from_taxonomy(
+        cls,
+        path: Union[str, "os.PathLike[str]"],
+        windowing: Optional[WindowingStrategy] = None,
+        **options: Any,
+    ) -> "IntentClassifier":
+        """Build a classifier from a JSON/TOML taxonomy file.
+
+        ``options`` are passed to ``taxonomy.load_pattern_bank`` (e.g.
+        ``cache_dir``).
+        """
+        from .taxonomy import load_pattern_bank
+
+        return cls(load_pattern_bank(path, **options), windowing)
+
+    @classmethod
+    def shared(cls) -> "IntentClassifier":
+        """Get the process-wide classifier for the default taxonomy."""
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+    @performance_monitor(threshold=0.05)
     def classify(self, prompt: str) -> str:
-        """Classify prompt intent using compiled patterns."""
-        from .profiler import performance_monitor
-
-        @performance_monitor(threshold=0.05)
-        def _classify_with_monitoring() -> str:
-            scores = {}
-
-            for intent, patterns in self.compiled_patterns.items():
-                score = 0
-                for pattern in patterns:
-                    score += len(pattern.findall(prompt))
-                scores[intent] = score
-
-            if max(scores.values()) > 0:
-                return max(scores, key=scores.get)
-            return "general"
-
-        return _classify_with_monitoring()
-
-    _KEYWORD_MAP: Final = {
-        "creative": ["story", "creative", "write", "generate", "imaginative"],
-        "technical": ["code", "technical", "program", "debug", "implement"],
-        "educational": ["explain", "teach", "learn", "tutorial", "example"],
-        "analytical": ["analyze", "compare", "evaluate", "data", "research"],
-        "conversational": ["chat", "discuss", "opinion", "casual", "friendly"],
-        "general": ["help", "assist", "provide", "give", "show"],
-    }
+        """Classify prompt intent using a single fused scan."""
+        return _best_intent(self.score(prompt))
+
+    def score(self, prompt: str) -> Mapping[str, float]:
+        """Per-intent scores, windowed when a strategy is configured."""
+        if self.windowing is None:
+            return self._scanner.score(prompt)
+        return self.windowing.score(self._scanner, prompt)
+
+    def stream(self) -> "IntentStream":
+        """Start incremental classification of chunked text."""
+        return IntentStream(self)
+
+    def classify_many(
+        self, prompts: Iterable[str], use_numpy: Optional[bool] = None
+    ) -> BatchClassification:
+        """Classify a batch of prompts through a prompts x patterns hit matrix.
+
+        Ties resolve to the first intent in taxonomy order, exactly like
+        ``classify``. ``use_numpy`` forces (True) or disables (False) the
+        NumPy path; by default it is used when available. Prompts are always
+        scanned in full; ``windowing`` only bounds ``classify``.
+        """
+        scanner = self._scanner
+        rows = [scanner.scan(prompt) for prompt in prompts]
+        numpy = _load_numpy() if use_numpy is not False else None
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is required for use_numpy=True")
+
+        labels = scanner.intents
+        pattern_intents = tuple(labels[index] for index in scanner.rule_intents)
+        if numpy is not None:
+            hits, scores, winners = self._score_numpy(numpy, rows)
+        else:
+            hits, scores, winners = self._score_arrays(rows)
+
+        return BatchClassification(
+            intents=[labels[w] if w >= 0 else "general" for w in winners],
+            pattern_hits=hits,
+            intent_scores=scores,
+            intent_labels=labels,
+            pattern_intents=pattern_intents,
+        )
+
+    def _score_numpy(
+        self, numpy: Any, rows: List[List[int]]
+    ) -> Tuple[Any, Any, List[int]]:
+        scanner = self._scanner
+        rule_count = len(scanner.rules)
+        hits = numpy.array(rows, dtype=numpy.int64).reshape(len(rows), rule_count)
+        membership = numpy.zeros((rule_count, len(scanner.intents)), numpy.int64)
+        membership[numpy.arange(rule_count), list(scanner.rule_intents)] = 1
+        scores = hits @ membership
+        # argmax returns the first maximum, matching max(scores, key=scores.get)
+        winners = scores.argmax(axis=1)
+        winners[scores.max(axis=1) == 0] = -1
+        return hits, scores, winners.tolist()
+
+    def _score_arrays(self, rows: List[List[int]]) -> Tuple[Any, Any, List[int]]:
+        scanner = self._scanner
+        intent_count = len(scanner.intents)
+        hit_data: "array[int]" = array("l")
+        score_data: "array[int]" = array("l")
+        winners = []
+        for row in rows:
+            hit_data.extend(row)
+            scores = [0] * intent_count
+            for rule_index, count in enumerate(row):
+                scores[scanner.rule_intents[rule_index]] += count
+            score_data.extend(scores)
+            best = max(range(intent_count), key=scores.__getitem__)
+            winners.append(best if scores[best] > 0 else -1)
+        return (
+            _ArrayMatrix(hit_data, (len(rows), len(scanner.rules))),
+            _ArrayMatrix(score_data, (len(rows), intent_count)),
+            winners,
+        )
 
     def get_intent_keywords(self, intent: str) -> List[str]:
         """Get keywords associated with an intent."""
-        return self._KEYWORD_MAP.get(intent, self._KEYWORD_MAP["general"])
+        keywords = self._keywords
+        return list(keywords.get(intent, keywords.get("general", ())))
+
+    def get_matched_keywords(self, prompt: str) -> Dict[str, List[str]]:
+        """Get the keywords of each intent that occur in a prompt."""
+        if self._keyword_matcher is None:
+            hits = scan_keywords(prompt)
+        else:
+            hits = self._keyword_matcher.scan(prompt)
+        matched = {
+            intent: hits.terms(f"intent:{intent}") for intent in self._keywords
+        }
+        return {intent: terms for intent, terms in matched.items() if terms}
+
+
+class IntentStream:
+    """Incremental intent classification for text that arrives in chunks.
+
+    Scores match classifying the concatenated text in one call. Between
+    feeds only the unfinished tail of the current line (a word or phrase
+    that the next chunk may extend) is kept; everything before it has been
+    scored exactly once. An unfinished word longer than any table word
+    cannot match, so it is dropped and the rest of it skipped as it arrives;
+    a trailing separator run is kept at two characters at most.
+    """
+
+    def __init__(self, classifier: Optional[IntentClassifier] = None) -> None:
+        self._scanner = (classifier or IntentClassifier.shared())._scanner
+        self._counts = [0] * len(self._scanner.rules)
+        self._line = _LineState()
+        self._tail = ""
+        self._base = 0  # token index of the tail within the current line
+        self._overlong = False  # inside a word too long to match
+
+    def feed(self, chunk: str) -> None:
+        """Score a chunk of text."""
+        if self._overlong:
+            chunk = _LEADING_WORD.sub("", chunk, count=1)
+            if not chunk:
+                return
+            self._overlong = False
+        *lines, fragment = (self._tail + chunk).split("\n")
+        for line in lines:
+            self._scan_fragment(line, self._counts, self._line, final=True)
+            self._line = _LineState()
+            self._base = 0
+        self._tail = self._scan_fragment(fragment, self._counts, self._line)
+
+    def scores(self) -> Dict[str, int]:
+        """Per-intent scores for all text fed so far."""
+        counts = list(self._counts)
+        self._scan_fragment(self._tail, counts, self._line.copy(), final=True)
+        return self._scanner.totals(counts)
+
+    def result(self) -> str:
+        """Intent for all text fed so far."""
+        return _best_intent(self.scores())
+
+    def _scan_fragment(
+        self,
+        text: str,
+        counts: List[int],
+        line: _LineState,
+        final: bool = False,
+    ) -> str:
+        """Score the settled words of ``text`` and return its unsettled tail.
+
+        A word is settled once every phrase starting at it is complete and
+        followed by at least one more token, so later chunks cannot change it.
+        """
+        scanner = self._scanner
+        tokens, first_word = scanner._words(text)
+        # No word or phrase can include an overlong last word, so every
+        # token up to it is settled
+        overlong = (
+            not final
+            and len(tokens) > first_word
+            and len(tokens[-1]) > scanner.max_word_length
+            and not _NON_WORD.match(tokens[-1])
+        )
+        stop = len(tokens)
+        if not (final or overlong):
+            stop -= 1 + 2 * scanner.max_phrase_tail
+        scanner._scan_words(
+            tokens, range(first_word, stop, 2), counts, line, self._base
+        )
+        if final:
+            return ""
+        if overlong:
+            self._base += len(tokens)
+            self._overlong = True
+            return ""
+
+        settled = first_word if stop <= first_word else stop + (stop - first_word) % 2
+        if settled >= len(tokens):
+            settled = len(tokens)
+        raw = tokens if text.isascii() else scanner._TOKEN.findall(text)
+        self._base += settled
+        tail = text[sum(map(len, raw[:settled])) :]
+        if settled < len(raw) and len(raw[-1]) > 2 and _NON_WORD.match(raw[-1]):
+            # Only a single space joins a phrase, so any longer separator
+            # run scores the same as two spaces
+            tail = tail[: -len(raw[-1])] + "  "
+        return tail
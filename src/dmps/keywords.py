@@ -0,0 +1,109 @@
+"""
+Shared keyword matching for intent, engine and evaluation checks.
+"""
+
+from functools import lru_cache
+from typing import Dict, Final, List, Mapping, Optional, Sequence, Tuple
+
+from .textstats import text_stats
+
+# Substring keyword lists, grouped by the check that consumes them
+VAGUE_TERMS: Final = ("something", "anything", "stuff", "things")
+SPECIFIC_INDICATORS: Final = ("please", "specific", "detailed", "example", "context")
+
+INTENT_KEYWORDS: Final = {
+    "creative": ["story", "creative", "write", "generate", "imaginative"],
+    "technical": ["code", "technical", "program", "debug", "implement"],
+    "educational": ["explain", "teach", "learn", "tutorial", "example"],
+    "analytical": ["analyze", "compare", "evaluate", "data", "research"],
+    "conversational": ["chat", "discuss", "opinion", "casual", "friendly"],
+    "general": ["help", "assist", "provide", "give", "show"],
+}
+
+
+class KeywordMatcher:
+    """Matches every registered keyword group against lowercased text.
+
+    Terms shared between groups are searched once per text. Searches use
+    ``str.find`` rather than a Python-level automaton: for a few dozen terms
+    the C substring search is an order of magnitude faster per character.
+    """
+
+    def __init__(self, groups: Mapping[str, Sequence[str]]) -> None:
+        self.groups: Dict[str, Tuple[str, ...]] = {
+            name: tuple(term.lower() for term in terms)
+            for name, terms in groups.items()
+        }
+        self.terms: Tuple[str, ...] = tuple(
+            dict.fromkeys(term for terms in self.groups.values() for term in terms)
+        )
+
+    def scan(self, text: str, lowered: Optional[str] = None) -> "KeywordHits":
+        """Create the hit set for ``text``; groups are searched on demand.
+
+        ``lowered`` is ``text.lower()`` when the caller already has it.
+        """
+        return KeywordHits(self, text, lowered)
+
+
+class KeywordHits:
+    """Keyword hits for one text, with first-occurrence offsets."""
+
+    __slots__ = ("_matcher", "lowered", "_offsets")
+
+    def __init__(
+        self, matcher: KeywordMatcher, text: str, lowered: Optional[str] = None
+    ) -> None:
+        self._matcher = matcher
+        self.lowered = text.lower() if lowered is None else lowered
+        self._offsets: Dict[str, int] = {}
+
+    def offset(self, term: str) -> int:
+        """First offset of ``term`` in the lowercased text, or -1."""
+        found = self._offsets.get(term)
+        if found is None:
+            found = self._offsets[term] = self.lowered.find(term)
+        return found
+
+    def contains(self, term: str, limit: Optional[int] = None) -> bool:
+        """Check whether ``term`` occurs, ending within ``limit`` chars if given."""
+        found = self.offset(term)
+        if found < 0:
+            return False
+        return limit is None or found + len(term) <= limit
+
+    def terms(self, group: str, limit: Optional[int] = None) -> List[str]:
+        """Terms of ``group`` present in the text, in group order."""
+        return [
+            term for term in self._matcher.groups[group] if self.contains(term, limit)
+        ]
+
+    def count(self, group: str, limit: Optional[int] = None) -> int:
+        """Number of distinct ``group`` terms present in the text."""
+        return len(self.terms(group, limit))
+
+    def offsets(self, group: str) -> Dict[str, int]:
+        """First offsets of the ``group`` terms present in the text."""
+        return {
+            term: self.offset(term)
+            for term in self._matcher.groups[group]
+            if self.offset(term) >= 0
+        }
+
+
+KEYWORD_GROUPS: Final = {
+    "vague": VAGUE_TERMS,
+    "specific": SPECIFIC_INDICATORS,
+    **{f"intent:{intent}": terms for intent, terms in INTENT_KEYWORDS.items()},
+}
+
+# Built once at import and shared by every caller
+keyword_matcher = KeywordMatcher(KEYWORD_GROUPS)
+
+SCAN_CACHE_SIZE: Final = 256
+
+
+@lru_cache(maxsize=SCAN_CACHE_SIZE)
+def scan_keywords(text: str) -> KeywordHits:
+    """Shared, memoized keyword hits so each text is lowercased and searched once."""
+    return keyword_matcher.scan(text, text_stats(text).lowered)
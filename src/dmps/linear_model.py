@@ -0,0 +1,370 @@
+"""
+Hashed-feature linear intent model with memory-mapped weights.
+
+An optional learned alternative to the rule taxonomy in ``intent.py``.
+Word and bigram features are hashed into a fixed number of buckets, and
+each bucket holds one float32 weight per intent. Weights are stored in a
+compact binary file and memory-mapped at load, so worker processes that
+load the same file share a single copy through the page cache.
+
+Train from a labeled JSONL corpus (one ``{"prompt": ..., "intent": ...}``
+object per line)::
+
+    python -m dmps.linear_model corpus.jsonl -o intent_weights.bin
+"""
+
+import argparse
+import json
+import mmap
+import random
+import re
+import struct
+import sys
+import zlib
+from array import array
+from itertools import chain, repeat
+from operator import itemgetter
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .profiler import performance_monitor
+
+MAGIC: Final = b"DMPSLIM1"
+# magic, buckets, label count, label block size (little-endian)
+_HEADER: Final = struct.Struct("<8sIII")
+DEFAULT_BUCKETS: Final = 1 << 16
+
+# Only this many leading characters are featurized, which bounds the cost
+# of a prediction regardless of prompt length
+FEATURE_WINDOW: Final = 384
+# Cached per-intent weight tuples per model and feature kind
+WEIGHT_CACHE_SIZE: Final = 1 << 14
+
+_TOKEN: Final = re.compile(r"\w+")
+_CUT_WORD: Final = re.compile(r"\w\w")
+# Maps every ASCII non-word byte to a space, so ``split()`` yields exactly
+# the ``\w+`` runs of ASCII text
+_ASCII_SEPARATORS: Final = bytes(
+    code if chr(code).isalnum() or chr(code) == "_" else ord(" ")
+    for code in range(128)
+) + b" " * 128
+
+
+def _tokens(prompt: str) -> List[bytes]:
+    """Lowercased, UTF-8 encoded words of the first ``FEATURE_WINDOW`` chars.
+
+    A word cut by the window edge is left out.
+    """
+    text = prompt[:FEATURE_WINDOW].lower()
+    if text.isascii():
+        tokens = text.encode().translate(_ASCII_SEPARATORS).split()
+    else:
+        tokens = [token.encode() for token in _TOKEN.findall(text)]
+    if tokens and _CUT_WORD.match(prompt, FEATURE_WINDOW - 1):
+        tokens.pop()
+    return tokens
+
+
+def _unigram_hashes(token: bytes) -> Tuple[int, ...]:
+    return (zlib.crc32(token),)
+
+
+def _pair_hashes(pair: Tuple[bytes, bytes]) -> Tuple[int, ...]:
+    """The second word's unigram hash and the pair's bigram hash"""
+    first, second = pair
+    unigram = zlib.crc32(second)
+    return unigram, zlib.crc32(second, zlib.crc32(b" ", zlib.crc32(first)))
+
+
+def _features(prompt: str, mask: int) -> List[int]:
+    """Hashed unigram and bigram bucket indices for ``prompt``.
+
+    A bigram hash continues the CRC of its first word through a space and
+    the second word, so each token is hashed only once.
+    """
+    tokens = _tokens(prompt)
+    unigrams = list(map(zlib.crc32, tokens))
+    spaced = map(zlib.crc32, repeat(b" "), unigrams)
+    bigrams = map(zlib.crc32, tokens[1:], spaced)
+    return [value & mask for value in chain(unigrams, bigrams)]
+
+
+class _WeightCache(dict):
+    """Per-intent summed weights of a key's features, read on first use
+
+    Keys are tokens or token pairs; ``hash_key`` gives the feature hashes
+    a key stands for. The cache is cleared when full, so it stays bounded
+    however much new vocabulary arrives.
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Any],
+        mask: int,
+        hash_key: Callable[[Any], Tuple[int, ...]],
+    ) -> None:
+        super().__init__()
+        self._rows = rows
+        self._mask = mask
+        self._hash_key = hash_key
+
+    def __missing__(self, key: Any) -> Tuple[float, ...]:
+        if len(self) >= WEIGHT_CACHE_SIZE:
+            self.clear()
+        buckets = [value & self._mask for value in self._hash_key(key)]
+        weights = self[key] = tuple(
+            sum(row[bucket] for bucket in buckets) for row in self._rows
+        )
+        return weights
+
+
+def _row_scores(
+    bias: Sequence[float], rows: Sequence[Any], features: List[int]
+) -> List[float]:
+    """Bias plus the summed feature weights of each intent row."""
+    if len(features) < 2:
+        # itemgetter returns a bare value for one index and needs at least one
+        return [
+            value + sum(row[bucket] for bucket in features)
+            for value, row in zip(bias, rows)
+        ]
+    pick = itemgetter(*features)
+    return [value + sum(pick(row)) for value, row in zip(bias, rows)]
+
+
+class LinearIntentModel:
+    """Linear intent classifier over hashed word and bigram features.
+
+    ``weights`` is laid out intent-major (``intent * buckets + bucket``)
+    and may be an ``array('f')`` or a float32 ``memoryview`` over a
+    memory-mapped file. Inference looks up the first word, then each
+    following word together with its bigram, in bounded caches of
+    per-intent weight tuples, hashing and reading the rows only on a miss,
+    and sums the tuples column-wise. Training sums rows with one
+    ``itemgetter`` per intent instead.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        weights: Union["array[float]", memoryview],
+        bias: Sequence[float],
+        buckets: int,
+    ) -> None:
+        if not labels:
+            raise ValueError("Model needs at least one label")
+        if buckets <= 0 or buckets & (buckets - 1):
+            raise ValueError("Bucket count must be a power of two")
+        if len(weights) != buckets * len(labels) or len(bias) != len(labels):
+            raise ValueError("Weight shape does not match labels and buckets")
+        self.labels: Tuple[str, ...] = tuple(labels)
+        self.buckets = buckets
+        self.weights = weights
+        self.bias = list(bias)
+        self._mask = buckets - 1
+        view = memoryview(weights)
+        self._rows = [
+            view[index * buckets : (index + 1) * buckets]
+            for index in range(len(labels))
+        ]
+        self._mmap: Optional[mmap.mmap] = None
+        self._unigrams = _WeightCache(self._rows, self._mask, _unigram_hashes)
+        # A word after the first scores its unigram and the bigram it ends
+        self._pairs = _WeightCache(self._rows, self._mask, _pair_hashes)
+
+    @classmethod
+    def zeros(
+        cls, labels: Sequence[str], buckets: int = DEFAULT_BUCKETS
+    ) -> "LinearIntentModel":
+        """Create an untrained model with all-zero weights."""
+        weights = array("f", bytes(4 * buckets * len(labels)))
+        return cls(labels, weights, [0.0] * len(labels), buckets)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LinearIntentModel":
+        """Memory-map a weight file written by ``save``."""
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            labels, buckets, offset = cls._read_header(mapped)
+        except Exception:
+            mapped.close()
+            raise
+        # The header is fully validated, so no view outlives a failed load
+        count = len(labels)
+        floats: Union["array[float]", memoryview]
+        if sys.byteorder == "little":
+            floats = memoryview(mapped)[offset:].cast("f")
+        else:  # pragma: no cover - big-endian hosts get a private copy
+            floats = array("f")
+            floats.frombytes(mapped[offset:])
+            floats.byteswap()
+        model = cls(labels, floats[count:], floats[:count].tolist(), buckets)
+        model._mmap = mapped
+        return model
+
+    @staticmethod
+    def _read_header(data: Any) -> Tuple[Tuple[str, ...], int, int]:
+        if len(data) < _HEADER.size:
+            raise ValueError("Weight file is truncated")
+        magic, buckets, count, label_size = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a DMPS linear intent model file")
+        start = _HEADER.size
+        labels = tuple(bytes(data[start : start + label_size]).decode().split("\n"))
+        if len(labels) != count:
+            raise ValueError("Weight file label block is corrupt")
+        if buckets <= 0 or buckets & (buckets - 1):
+            raise ValueError("Weight file bucket count is not a power of two")
+        # Weights start 4-byte aligned after the label block
+        offset = (start + label_size + 3) & ~3
+        if len(data) != offset + 4 * count * (buckets + 1):
+            raise ValueError("Weight file size does not match its header")
+        return labels, buckets, offset
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the model as a header followed by float32 bias and weights."""
+        label_block = "\n".join(self.labels).encode()
+        header = _HEADER.pack(MAGIC, self.buckets, len(self.labels), len(label_block))
+        padding = b"\0" * (-(len(header) + len(label_block)) % 4)
+        floats = array("f", self.bias)
+        floats.extend(array("f", self.weights))
+        if sys.byteorder != "little":  # pragma: no cover
+            floats.byteswap()
+        with open(path, "wb") as handle:
+            handle.write(header + label_block + padding)
+            floats.tofile(handle)
+
+    def close(self) -> None:
+        """Release the memory map backing a loaded model."""
+        self._unigrams.clear()
+        self._pairs.clear()
+        if self._mmap is not None:
+            for row in self._rows:
+                row.release()
+            self.weights.release()  # type: ignore[union-attr]
+            self._mmap.close()
+            self._mmap = None
+
+    def scores(self, prompt: str) -> Dict[str, float]:
+        """Raw per-intent scores for ``prompt``."""
+        tokens = _tokens(prompt)
+        if not tokens:
+            return dict(zip(self.labels, self.bias))
+        weights = chain(
+            (self._unigrams[tokens[0]],),
+            map(self._pairs.__getitem__, zip(tokens, tokens[1:])),
+        )
+        columns = zip(*weights)  # one column of feature weights per intent
+        return {
+            label: value + sum(column)
+            for label, value, column in zip(self.labels, self.bias, columns)
+        }
+
+    @performance_monitor(threshold=0.05)
+    def classify(self, prompt: str) -> str:
+        """Classify prompt intent; same signature as ``IntentClassifier``."""
+        scores = self.scores(prompt)
+        return max(scores, key=scores.get)  # type: ignore[arg-type]
+
+
+def train_model(
+    examples: Iterable[Tuple[str, str]],
+    buckets: int = DEFAULT_BUCKETS,
+    epochs: int = 5,
+    seed: int = 0,
+) -> LinearIntentModel:
+    """Train an averaged perceptron on ``(prompt, intent)`` pairs."""
+    samples = list(examples)
+    if not samples:
+        raise ValueError("Training corpus is empty")
+    labels = sorted({intent for _, intent in samples})
+    label_index = {label: index for index, label in enumerate(labels)}
+    count = len(labels)
+    model = LinearIntentModel.zeros(labels, buckets)
+    weights, bias, rows = model.weights, model.bias, model._rows
+    encoded = [
+        (_features(prompt, model._mask), label_index[intent])
+        for prompt, intent in samples
+    ]
+    # Averaging via timestamped accumulators (Daume's trick)
+    totals = array("d", bytes(8 * len(weights)))
+    bias_totals = [0.0] * count
+    step = 1
+    rng = random.Random(seed)
+    for _ in range(epochs):
+        rng.shuffle(encoded)
+        for features, gold in encoded:
+            scores = _row_scores(bias, rows, features)
+            guess = max(range(count), key=scores.__getitem__)
+            if guess != gold:
+                for label, sign in ((gold, 1.0), (guess, -1.0)):
+                    bias[label] += sign
+                    bias_totals[label] += sign * step
+                    base = label * buckets
+                    for bucket in features:
+                        weights[base + bucket] += sign
+                        totals[base + bucket] += sign * step
+            step += 1
+
+    for index, total in enumerate(totals):
+        if total:
+            weights[index] -= total / step
+    model.bias = [value - total / step for value, total in zip(bias, bias_totals)]
+    return model
+
+
+def read_corpus(path: Union[str, Path]) -> List[Tuple[str, str]]:
+    """Read ``(prompt, intent)`` pairs from a JSONL file."""
+    examples = []
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                examples.append((str(record["prompt"]), str(record["intent"])))
+            except (KeyError, TypeError):
+                raise ValueError(
+                    f"{path}:{line_number}: expected 'prompt' and 'intent' keys"
+                ) from None
+    return examples
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Train a model from a labeled JSONL corpus and write its weight file."""
+    parser = argparse.ArgumentParser(
+        prog="python -m dmps.linear_model",
+        description="Train a hashed-feature linear intent model",
+    )
+    parser.add_argument("corpus", help="JSONL file of {prompt, intent} records")
+    parser.add_argument("-o", "--output", default="intent_weights.bin")
+    parser.add_argument("--buckets", type=int, default=DEFAULT_BUCKETS)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    examples = read_corpus(args.corpus)
+    model = train_model(examples, args.buckets, args.epochs, args.seed)
+    model.save(args.output)
+    correct = sum(model.classify(prompt) == intent for prompt, intent in examples)
+    print(
+        f"Trained on {len(examples)} examples, {len(model.labels)} intents; "
+        f"training accuracy {correct / len(examples):.1%}; wrote {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
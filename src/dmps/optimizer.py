@@ -2,13 +2,16 @@
 Main orchestrator for prompt optimization.
 """
 
+import dataclasses
 import json
+import time
 import uuid
-from typing import Final, Literal, Tuple
+from typing import Final, Iterable, List, Literal, Optional, Tuple
 
 from .evaluation import context_evaluator
 from .formatters import ConversationalFormatter, StructuredFormatter
-from .schema import OptimizedResult, ValidationResult
+from .schema import OptimizedResult, PromptVariant, ValidationResult, VariantSpec
+from .techniques import PLATFORMS
 from .token_tracker import token_tracker
 from .validation import InputValidator
 
@@ -44,33 +47,46 @@ class PromptOptimizer:
         return self._validator
 
     def optimize(
-        self, prompt_input: str, mode: str = "conversational", platform: str = "claude"
+        self,
+        prompt_input: str,
+        mode: str = "conversational",
+        platform: str = "claude",
+        max_tokens: Optional[int] = None,
     ) -> Tuple[OptimizedResult, ValidationResult]:
-        """Main optimization entry point with token tracking and evaluation"""
+        """Main optimization entry point with token tracking and evaluation
+
+        ``max_tokens`` caps the estimated tokens of the optimized prompt:
+        technique additions that would exceed it are left out. The prompt
+        itself is never cut; if it alone is over budget a warning says so.
+        """
 
-        # Start token tracking
         operation_id = str(uuid.uuid4())[:8]
-        trace_context = token_tracker.start_trace(operation_id, prompt_input)
+        start_time = time.time()
 
         validation = self.validator.validate_input(prompt_input, mode)
+        if validation.is_valid and max_tokens is not None and max_tokens < 1:
+            validation.is_valid = False
+            validation.errors.append("Token budget must be at least 1")
         if not validation.is_valid:
             return self._create_error_result(validation.errors, mode), validation
 
         try:
             sanitized_input = validation.sanitized_input or ""
-            # Use cached intent classification for performance
-            from .cache import PerformanceCache
-
-            prompt_hash = PerformanceCache.get_prompt_hash(sanitized_input)
-            cached_intent = PerformanceCache.cached_intent_classification(
-                prompt_hash, sanitized_input
-            )
-
+            # Analyze once (one intent classification); every stage reads it
             request = self.engine.extract_intent(sanitized_input)
-            request.intent = cached_intent  # Use cached result
             request.platform = platform
+            request.max_tokens = max_tokens
+            analysis = request.analysis
+
+            # Start token tracking from the analysis' estimate
+            trace_context = token_tracker.start_trace(
+                operation_id,
+                sanitized_input,
+                original_tokens=analysis.token_estimate if analysis else None,
+                start_time=start_time,
+            )
 
-            optimization_data = self.engine.apply_optimization(request)
+            optimization_data = self.engine.apply_optimization(request, lazy=True)
             optimized_prompt = self.engine.assemble_prompt(optimization_data, request)
 
             formatter = self._FORMATTERS[mode]
@@ -84,10 +100,11 @@ class PromptOptimizer:
 
             # Evaluate context engineering effectiveness
             evaluation = context_evaluator.evaluate(
-                prompt_input,
+                sanitized_input,
                 optimized_prompt,
                 trace_context["original_tokens"],
-                token_tracker.estimate_tokens(optimized_prompt),
+                trace.metrics.input_tokens,
+                analysis=analysis,
             )
 
             # Add tracking metadata to result
@@ -108,6 +125,11 @@ class PromptOptimizer:
                 }
             )
 
+            if not optimization_data.get("within_budget", True):
+                validation.warnings.append(
+                    "Prompt exceeds the token budget even without additions"
+                )
+
             # Add evaluation warnings if degradation detected
             if evaluation.degradation_detected:
                 validation.warnings.append(
@@ -169,6 +191,55 @@ class PromptOptimizer:
                 sanitized_input=validation.sanitized_input,
             )
 
+    def generate_variants(
+        self, prompt_input: str, variant_specs: Iterable[VariantSpec]
+    ) -> Tuple[List[PromptVariant], ValidationResult]:
+        """Generate one candidate prompt per spec, e.g. for A/B testing
+
+        Validation and analysis run once; each variant only runs the
+        technique stages for its platform, output type and enabled stages.
+        Invalid input gives no variants; an unknown platform or stage name,
+        or a token budget below 1, raises ValueError before any variant is
+        built.
+        """
+        specs = list(variant_specs)
+        engine = self.engine
+        for spec in specs:
+            if spec.platform not in PLATFORMS:
+                raise ValueError(f"Invalid platform: {spec.platform}")
+            if spec.max_tokens is not None and spec.max_tokens < 1:
+                raise ValueError("Token budget must be at least 1")
+            unknown = spec.disabled_stages.difference(engine.pipeline.names)
+            if unknown:
+                raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+        validation = self.validator.validate_input(prompt_input)
+        if not validation.is_valid:
+            return [], validation
+
+        base = engine.extract_intent(validation.sanitized_input or "")
+        variants = []
+        for spec in specs:
+            request = dataclasses.replace(
+                base,
+                platform=spec.platform,
+                output_type=spec.output_type or base.output_type,
+                disabled_stages=frozenset(spec.disabled_stages),
+                max_tokens=spec.max_tokens,
+            )
+            data = engine.apply_optimization(request, lazy=True)
+            optimized_prompt = engine.assemble_prompt(data, request)
+            variants.append(
+                PromptVariant(
+                    spec=spec,
+                    optimized_prompt=optimized_prompt,
+                    token_estimate=token_tracker.estimate_tokens(optimized_prompt),
+                    improvements=data.get("improvements", []),
+                    techniques_applied=data.get("techniques_applied", []),
+                )
+            )
+        return variants, validation
+
     def _create_error_result(self, errors: list, mode: str) -> OptimizedResult:
         """Create error result for validation failures"""
         error_message = "Optimization failed:\n" + "\n".join(
@@ -0,0 +1,174 @@
+"""
+Process-pool sharded optimization for CPU-bound bulk jobs.
+
+The pipeline is pure-Python CPU work, so threads serialize on the GIL.
+``ParallelOptimizer`` fans prompts out over a ``ProcessPoolExecutor`` whose
+workers each build one ``OptimizationEngine`` at start-up. Prompts travel in
+chunks, sized so pickling is amortized over many prompts, and each chunk
+runs through ``apply_optimization_many``. Results come back in input order
+with failures reported per prompt.
+"""
+
+import dataclasses
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from .engine import OptimizationEngine
+from .schema import OptimizationRequest
+
+# The engine each worker process builds once, in _init_worker
+_worker_engine: Optional[OptimizationEngine] = None
+
+
+class OptimizationOutcome(NamedTuple):
+    """Result for one prompt; ``error`` is set instead when it failed"""
+    prompt: str
+    optimized_prompt: Optional[str] = None
+    optimization_data: Optional[Dict[str, Any]] = None
+    request: Optional[OptimizationRequest] = None  # without its analysis
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _init_worker(engine_factory: Callable[[], OptimizationEngine]) -> None:
+    """Build and warm the worker's engine before any work arrives"""
+    global _worker_engine
+    _worker_engine = engine_factory()
+    _worker_engine.apply_optimization_many(["Warm up the engine, then explain it."])
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _optimize_chunk(
+    prompts: List[str], platform: str, disabled: FrozenSet[str]
+) -> List[OptimizationOutcome]:
+    """Optimize one chunk, falling back to per-prompt runs if any prompt fails"""
+    engine = _worker_engine
+    if engine is None:  # pragma: no cover - initializer always runs first
+        raise RuntimeError("Worker engine is not initialized")
+    try:
+        return [
+            _outcome(prompt, result)
+            for prompt, result in zip(
+                prompts, engine.apply_optimization_many(prompts, platform, disabled)
+            )
+        ]
+    except Exception:
+        pass
+
+    outcomes = []
+    for prompt in prompts:
+        try:
+            (result,) = engine.apply_optimization_many([prompt], platform, disabled)
+        except Exception as error:
+            outcomes.append(OptimizationOutcome(prompt, error=error))
+        else:
+            outcomes.append(_outcome(prompt, result))
+    return outcomes
+
+
+def _outcome(prompt: str, result: Any) -> OptimizationOutcome:
+    optimized, data, request = result
+    # The analysis holds per-process caches; it is not worth pickling back
+    return OptimizationOutcome(
+        prompt, optimized, data, dataclasses.replace(request, analysis=None)
+    )
+
+
+class ParallelOptimizer:
+    """Optimizes prompt batches across pre-warmed worker processes.
+
+    ``engine_factory`` builds each worker's engine and must be picklable
+    (a module-level callable) when workers are spawned rather than forked.
+    ``chunk_size`` prompts are sent per task; by default batches are split
+    into about ``CHUNKS_PER_WORKER`` chunks per worker, within
+    ``MIN_CHUNK_SIZE`` and ``MAX_CHUNK_SIZE``.
+    """
+
+    CHUNKS_PER_WORKER: Final = 4
+    MIN_CHUNK_SIZE: Final = 16
+    MAX_CHUNK_SIZE: Final = 1024
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        engine_factory: Callable[[], OptimizationEngine] = OptimizationEngine,
+        prewarm: bool = True,
+        mp_context: Any = None,
+    ) -> None:
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(engine_factory,),
+        )
+        if prewarm:
+            self.warm()
+
+    def warm(self) -> None:
+        """Start the worker processes so engines are built before real work"""
+        pings = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        for ping in pings:
+            ping.result()
+
+    def _chunk_size_for(self, count: int) -> int:
+        if self.chunk_size is not None:
+            return self.chunk_size
+        per_chunk = -(-count // (self.max_workers * self.CHUNKS_PER_WORKER))
+        return max(self.MIN_CHUNK_SIZE, min(self.MAX_CHUNK_SIZE, per_chunk))
+
+    def optimize_many(
+        self,
+        prompts: Sequence[str],
+        platform: str = "claude",
+        disabled_stages: Iterable[str] = (),
+    ) -> List[OptimizationOutcome]:
+        """Optimize ``prompts`` for ``platform``; one outcome per prompt, in order"""
+        prompts = list(prompts)
+        disabled = frozenset(disabled_stages)
+        size = self._chunk_size_for(len(prompts))
+        chunks = [prompts[i : i + size] for i in range(0, len(prompts), size)]
+        futures: List[Future] = [
+            self._executor.submit(_optimize_chunk, chunk, platform, disabled)
+            for chunk in chunks
+        ]
+
+        outcomes: List[OptimizationOutcome] = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                outcomes.extend(future.result())
+            except Exception as error:  # the worker itself failed
+                outcomes.extend(OptimizationOutcome(p, error=error) for p in chunk)
+        return outcomes
+
+    def close(self) -> None:
+        """Shut the worker processes down"""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ParallelOptimizer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,323 @@
+"""
+Pluggable stage pipeline for the 4-D engine.
+
+``OptimizationEngine.apply_optimization`` runs its Deconstruct, Develop,
+Design and Deliver steps as stages registered on a ``StagePipeline``. Stages
+are objects with a ``name`` and a ``run(ctx)`` method; they can be added,
+removed or reordered on the pipeline, and skipped for a single request via
+``OptimizationRequest.disabled_stages``. Each stage run is timed with
+``perf_counter_ns`` into the pipeline's ``StageLatencyTable``. Rewrite
+stages record the edit script of each step that changed the prompt under
+the ``"edits"`` key of the optimization data, after dropping any additions
+that would take the prompt past the context's character budget.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import partial
+from time import perf_counter_ns
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Tuple,
+)
+
+from .schema import OptimizationRequest
+from .techniques import fit_edits
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .engine import OptimizationEngine
+    from .techniques import Edit, OptimizationPlan, Rewrite
+
+
+@dataclass
+class StageContext:
+    """State shared by the stages of one ``apply_optimization`` call"""
+    engine: "OptimizationEngine"
+    request: OptimizationRequest
+    plan: "OptimizationPlan"
+    prompt: str  # current prompt text, rewritten by each stage
+    data: Dict[str, Any]  # the optimization data being built
+    max_length: Optional[int] = None  # character budget from request.max_tokens
+
+
+class Stage(Protocol):
+    """A pipeline stage; ``run`` reads and updates the shared context"""
+
+    name: str
+
+    def run(self, ctx: StageContext) -> None: ...
+
+
+class LazyMapping(Mapping):
+    """Read-only mapping built by ``factory`` on first access
+
+    Pickles as the plain dict it resolves to; ``materialize`` swaps it for
+    that dict before the data leaves the engine, e.g. to be JSON-encoded.
+    """
+
+    __slots__ = ("_factory", "_data")
+
+    def __init__(self, factory: Callable[[], Dict[str, Any]]) -> None:
+        self._factory: Optional[Callable[[], Dict[str, Any]]] = factory
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def resolved(self) -> bool:
+        """Whether the contents have been computed yet"""
+        return self._data is not None
+
+    def _resolve(self) -> Dict[str, Any]:
+        if self._data is None:
+            assert self._factory is not None
+            self._data, self._factory = self._factory(), None
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._resolve()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._resolve())
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return dict, (self._resolve(),)
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"{type(self).__name__}(<unresolved>)"
+        return f"{type(self).__name__}({self._data!r})"
+
+
+def materialize(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace ``data``'s lazy values with the plain dicts they resolve to"""
+    for key, value in data.items():
+        if isinstance(value, LazyMapping):
+            data[key] = dict(value)
+    return data
+
+
+class DeconstructStage:
+    """Deconstruct: analyze prompt components, on first access
+
+    Only the structured output reads the components, so conversational
+    requests never pay for them.
+    """
+
+    name = "deconstruct"
+
+    def run(self, ctx: StageContext) -> None:
+        ctx.data["components"] = LazyMapping(
+            partial(
+                ctx.engine._deconstruct_prompt,
+                ctx.request.raw_input,
+                ctx.request.analysis,
+            )
+        )
+
+
+class StageEdits(NamedTuple):
+    """The edit script one rewrite stage applied to the prompt"""
+    technique: str
+    edits: Tuple["Edit", ...]  # offsets into the stage's input text
+
+
+class _RewriteStage(ABC):
+    """Applies one plan step and records it when its edit script is non-empty"""
+
+    name = ""
+    technique = ""
+    improvement = ""
+
+    @abstractmethod
+    def rewrite(self, plan: "OptimizationPlan", prompt: str) -> "Rewrite":
+        """Edit script of this stage's plan step applied to ``prompt``"""
+
+    def run(self, ctx: StageContext) -> None:
+        rewrite = self.rewrite(ctx.plan, ctx.prompt)
+        if ctx.max_length is not None and rewrite.changed:
+            rewrite = fit_edits(ctx.prompt, rewrite, ctx.max_length)
+        if rewrite.changed:
+            data = ctx.data
+            data["improvements"].append(self.improvement)
+            data["techniques_applied"].append(self.technique)
+            data["edits"].append(StageEdits(self.technique, rewrite.edits))
+            ctx.prompt = rewrite.text
+
+
+class DevelopStage(_RewriteStage):
+    """Develop: enhance clarity and specificity"""
+
+    name = "develop"
+    technique = "develop_clarity"
+    improvement = "Enhanced clarity and specificity"
+
+    def rewrite(self, plan: "OptimizationPlan", prompt: str) -> "Rewrite":
+        return plan.develop_edits(prompt)
+
+
+class DesignStage(_RewriteStage):
+    """Design: structure for the target platform"""
+
+    name = "design"
+    technique = "design_structure"
+    improvement = "Optimized structure for platform"
+
+    def rewrite(self, plan: "OptimizationPlan", prompt: str) -> "Rewrite":
+        return plan.design_edits(prompt)
+
+
+class DeliverStage(_RewriteStage):
+    """Deliver: final formatting and validation"""
+
+    name = "deliver"
+    technique = "deliver_format"
+    improvement = "Applied final formatting"
+
+    def rewrite(self, plan: "OptimizationPlan", prompt: str) -> "Rewrite":
+        return plan.deliver_edits(prompt)
+
+
+class StageLatency(NamedTuple):
+    """Latency summary for one stage, in nanoseconds"""
+    count: int  # runs since the last reset
+    mean_ns: float  # over the retained samples
+    p50_ns: int
+    p99_ns: int
+    max_ns: int
+
+
+def _percentile(ordered: List[int], percent: int) -> int:
+    """Nearest-rank percentile of a sorted, non-empty sample list"""
+    rank = -(-len(ordered) * percent // 100)  # ceiling division
+    return ordered[max(rank, 1) - 1]
+
+
+class StageLatencyTable:
+    """Per-stage run times, keeping the most recent ``window`` samples each"""
+
+    def __init__(self, window: int = 1024) -> None:
+        if window <= 0:
+            raise ValueError("Latency window must be positive")
+        self.window = window
+        self._samples: Dict[str, Deque[int]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, stage: str, elapsed_ns: int) -> None:
+        """Add one run time for ``stage``"""
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self.window)
+            self._counts[stage] = 0
+        samples.append(elapsed_ns)
+        self._counts[stage] += 1
+
+    def snapshot(self) -> Dict[str, StageLatency]:
+        """Summaries for every stage that has run"""
+        table = {}
+        for stage, samples in list(self._samples.items()):
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            table[stage] = StageLatency(
+                count=self._counts[stage],
+                mean_ns=sum(ordered) / len(ordered),
+                p50_ns=_percentile(ordered, 50),
+                p99_ns=_percentile(ordered, 99),
+                max_ns=ordered[-1],
+            )
+        return table
+
+    def reset(self) -> None:
+        """Forget all recorded samples"""
+        self._samples.clear()
+        self._counts.clear()
+
+
+class StagePipeline:
+    """Ordered stage registry with per-stage timing"""
+
+    def __init__(
+        self, stages: Iterable[Stage] = (), latency_window: int = 1024
+    ) -> None:
+        self._stages: List[Stage] = []
+        self.latency = StageLatencyTable(latency_window)
+        for stage in stages:
+            self.register(stage)
+
+    @classmethod
+    def default(cls) -> "StagePipeline":
+        """The Deconstruct, Develop, Design, Deliver pipeline"""
+        return cls([DeconstructStage(), DevelopStage(), DesignStage(), DeliverStage()])
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Stage names in run order"""
+        return tuple(stage.name for stage in self._stages)
+
+    def get(self, name: str) -> Stage:
+        """The registered stage called ``name``"""
+        return self._stages[self._index(name)]
+
+    def _index(self, name: str) -> int:
+        try:
+            return self.names.index(name)
+        except ValueError:
+            raise KeyError(f"Unknown stage: {name}") from None
+
+    def register(
+        self,
+        stage: Stage,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> None:
+        """Add ``stage`` at the end, or before/after a named stage"""
+        if stage.name in self.names:
+            raise ValueError(f"Stage already registered: {stage.name}")
+        if before is not None and after is not None:
+            raise ValueError("Pass at most one of 'before' and 'after'")
+        if before is not None:
+            index = self._index(before)
+        elif after is not None:
+            index = self._index(after) + 1
+        else:
+            index = len(self._stages)
+        self._stages.insert(index, stage)
+
+    def remove(self, name: str) -> Stage:
+        """Unregister and return the stage called ``name``"""
+        return self._stages.pop(self._index(name))
+
+    def reorder(self, names: Iterable[str]) -> None:
+        """Set the run order; ``names`` must list every registered stage"""
+        order = list(names)
+        if sorted(order) != sorted(self.names):
+            raise ValueError(
+                f"Stage order must name each of {', '.join(self.names)} once"
+            )
+        self._stages = [self.get(name) for name in order]
+
+    def run(self, ctx: StageContext, disabled: Iterable[str] = ()) -> StageContext:
+        """Run every enabled stage in order, timing each one"""
+        skipped = frozenset(disabled)
+        record = self.latency.record
+        for stage in self._stages:
+            if stage.name in skipped:
+                continue
+            start = perf_counter_ns()
+            stage.run(ctx)
+            record(stage.name, perf_counter_ns() - start)
+        return ctx
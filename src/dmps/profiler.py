@@ -3,15 +3,45 @@ Performance profiling and monitoring utilities.
 """
 
 import time
+from fractions import Fraction
 from functools import wraps
+from itertools import count
 from typing import Callable, Any
 
+# Time _sample_ratio[0] calls in every _sample_ratio[1]; 0 disables timing
+_sample_rate = 1.0
+_sample_ratio = (1, 1)
+
+
+def set_sampling_rate(rate: float) -> None:
+    """Set the fraction (0-1) of monitored calls that are timed"""
+    global _sample_rate, _sample_ratio
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError(f"Sampling rate must be between 0 and 1, got {rate}")
+    ratio = Fraction(rate).limit_denominator(1 << 20)
+    _sample_rate = rate
+    _sample_ratio = (ratio.numerator, ratio.denominator)
+
+
+def get_sampling_rate() -> float:
+    """Get the fraction of monitored calls that are timed"""
+    return _sample_rate
+
 
 def performance_monitor(threshold: float = 0.1):
-    """Decorator to monitor function performance"""
+    """Decorator to monitor function performance, honoring the sampling rate"""
     def decorator(func: Callable) -> Callable:
+        calls = count()
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
+            timed, period = _sample_ratio
+            if timed != period:
+                # Call n is timed when floor(n * rate) steps up, so exactly
+                # ``timed`` of every ``period`` calls are timed
+                n = next(calls)
+                if (n + 1) * timed // period == n * timed // period:
+                    return func(*args, **kwargs)
             start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
@@ -35,6 +35,13 @@ class AccessControl:
         """Check if role has specific permission"""
         return permission in cls.ROLE_PERMISSIONS.get(role, set())
     
+    @classmethod
+    def validate_platform_access(cls, role: Role, platform: str) -> bool:
+        """Check that a role may optimize prompts for a target platform"""
+        from .techniques import PLATFORMS
+
+        return role in cls.ROLE_PERMISSIONS and platform in PLATFORMS
+
     @classmethod
     def is_command_allowed(cls, command: str) -> bool:
         """Check if command is in whitelist"""
@@ -11,6 +11,7 @@ from typing import Any, Dict, Final
 from .optimizer import PromptOptimizer
 from .rbac import AccessControl, Role
 from .security import SecurityConfig
+from .techniques import PLATFORMS
 
 
 class DMPSShell:
@@ -18,7 +19,6 @@ class DMPSShell:
 
     # Valid settings for validation
     _VALID_MODES: Final = frozenset({"conversational", "structured"})
-    _VALID_PLATFORMS: Final = frozenset({"claude", "chatgpt", "gemini", "generic"})
 
     def __init__(self):
         self.optimizer = PromptOptimizer()
@@ -269,7 +269,7 @@ Examples:
         if setting_name == "mode" and new_value in self._VALID_MODES:
             self.settings["mode"] = new_value
             print(f"✅ Updated mode to: {new_value}")
-        elif setting_name == "platform" and new_value in self._VALID_PLATFORMS:
+        elif setting_name == "platform" and new_value in PLATFORMS:
             self.settings["platform"] = new_value
             print(f"✅ Updated platform to: {new_value}")
         elif setting_name == "show_metadata" and new_value.lower() in ["true", "false"]:
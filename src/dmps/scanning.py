@@ -0,0 +1,90 @@
+"""
+Chunked regex detection over full-length prompts.
+
+The engine's format, constraint and missing-information checks used to
+look at a fixed-size prefix only. ``ChunkedScanner`` covers the whole text
+in overlapping windows instead, under a total-cost budget, and stops as
+soon as the caller has what it needs.
+"""
+
+from typing import Final, Iterator, List, Mapping, Match, Pattern, Tuple
+
+
+class ChunkedScanner:
+    """Runs named detector patterns over text in overlapping windows.
+
+    Each window searches ``[start, start + chunk_size + overlap)`` but only
+    accepts matches that start before ``start + chunk_size``; the next
+    window begins there. Any match no longer than ``overlap`` characters is
+    therefore found exactly as a whole-text search would find it, and
+    patterns see the real text around each window, so ``\\b`` and
+    lookbehinds are unaffected by window edges.
+
+    ``budget`` caps the total characters searched per call, summed over
+    the detectors still pending in each window; text past the budget is
+    treated as containing no further matches.
+    """
+
+    DEFAULT_CHUNK_SIZE: Final = 1000
+    DEFAULT_OVERLAP: Final = 64
+    DEFAULT_BUDGET: Final = 250_000
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        budget: int = DEFAULT_BUDGET,
+    ) -> None:
+        if chunk_size <= 0 or overlap < 0 or budget <= 0:
+            raise ValueError("Chunk size and budget must be positive")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.budget = budget
+
+    def windows(self, length: int) -> Iterator[Tuple[int, int, int]]:
+        """``(start, accept_end, search_end)`` windows covering ``length`` chars"""
+        for start in range(0, max(length, 1), self.chunk_size):
+            accept_end = min(start + self.chunk_size, length)
+            yield start, accept_end, min(accept_end + self.overlap, length)
+
+    def first(self, text: str, detectors: Mapping[str, Pattern[str]]) -> str:
+        """The first detector, in mapping order, that matches; "" if none
+
+        A match drops that detector and every later one, so the scan ends
+        once the highest-priority remaining detector has fired.
+        """
+        pending: List[Tuple[str, Pattern[str]]] = list(detectors.items())
+        best = ""
+        remaining = self.budget
+        for start, accept_end, search_end in self.windows(len(text)):
+            for index, (name, pattern) in enumerate(pending):
+                remaining -= search_end - start
+                if remaining < 0:
+                    return best
+                match = pattern.search(text, start, search_end)
+                if match is not None and match.start() < accept_end:
+                    best = name
+                    del pending[index:]
+                    break
+            if not pending:
+                break
+        return best
+
+    def finditer(self, text: str, pattern: Pattern[str]) -> Iterator[Match[str]]:
+        """Non-overlapping matches of ``pattern`` in order, within the budget
+
+        Yields the same matches as ``pattern.finditer(text)`` for matches up
+        to ``overlap`` characters long; stop iterating to end the scan early.
+        """
+        remaining = self.budget
+        resume = 0
+        for start, accept_end, search_end in self.windows(len(text)):
+            start = max(start, resume)
+            remaining -= search_end - start
+            if remaining < 0:
+                return
+            for match in pattern.finditer(text, start, search_end):
+                if match.start() >= accept_end:
+                    break
+                resume = match.end()
+                yield match
@@ -3,7 +3,23 @@ Core data structures for the Dual-Mode Prompt System (DMPS).
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Literal
+from typing import List, Dict, Any, FrozenSet, Optional, Literal
+
+
+@dataclass
+class PromptAnalysis:
+    """Everything derived from an input prompt, computed once per request"""
+    text: str
+    intent: str
+    output_type: str
+    constraints: List[str]
+    missing_info: List[str]
+    char_count: int
+    word_count: int
+    token_estimate: int
+    keyword_hits: Any  # keywords.KeywordHits for text
+    constraint_details: Any = None  # constraints.Constraints for text
+    stats: Any = None  # textstats.TextStats for text
 
 
 @dataclass
@@ -15,6 +31,9 @@ class OptimizationRequest:
     platform: str
     constraints: List[str]
     missing_info: List[str]
+    analysis: Optional[PromptAnalysis] = None
+    disabled_stages: FrozenSet[str] = frozenset()  # pipeline stages to skip
+    max_tokens: Optional[int] = None  # token budget for the optimized prompt
 
 
 @dataclass
@@ -34,3 +53,23 @@ class ValidationResult:
     errors: List[str]
     warnings: List[str]
     sanitized_input: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class VariantSpec:
+    """One candidate prompt for PromptOptimizer.generate_variants"""
+    name: str
+    platform: str = "claude"
+    output_type: Optional[str] = None  # None keeps the detected output type
+    disabled_stages: FrozenSet[str] = frozenset()  # e.g. {"develop"}: no clarity
+    max_tokens: Optional[int] = None
+
+
+@dataclass
+class PromptVariant:
+    """A generated candidate and its token estimate"""
+    spec: VariantSpec
+    optimized_prompt: str
+    token_estimate: int
+    improvements: List[str]
+    techniques_applied: List[str]
@@ -0,0 +1,140 @@
+"""
+Intent taxonomies loaded from JSON or TOML files.
+
+A taxonomy maps each intent to its scoring rules and descriptive keywords::
+
+    [intents.creative]
+    keywords = ["story", "write"]
+    rules = [
+        ["creative", "imaginative"],
+        {triggers = ["write", "compose"], targets = ["story", "poem"]},
+    ]
+
+Plain lists are whole-word phrase alternations counted per occurrence;
+``{triggers, targets}`` tables count lines where a trigger precedes a
+target. Intents with only keywords never score. The JSON form has the same
+shape under a top-level ``"intents"`` object.
+
+The compiled taxonomy is cached on disk as JSON, keyed by the SHA-256 of the
+file, so later processes skip parsing and compiling it. Standalone rule
+regexes are compiled lazily in either case.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Final, Mapping, Optional, Union
+
+from .intent import PatternBank
+
+SPEC_VERSION: Final = 1
+CACHE_DIR_ENV: Final = "DMPS_CACHE_DIR"
+
+# Banks already loaded in this process, by file digest
+_loaded_banks: Dict[str, PatternBank] = {}
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def default_cache_dir() -> Path:
+    """``$DMPS_CACHE_DIR``, else ``$XDG_CACHE_HOME/dmps``, else ``~/.cache/dmps``."""
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "dmps"
+
+
+def _load_toml() -> Any:
+    try:
+        import tomllib  # Python 3.11+
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore[no-redef]
+        except ImportError:
+            raise ImportError(
+                "TOML taxonomies require Python 3.11+ or the 'tomli' package"
+            ) from None
+    return tomllib
+
+
+def parse_taxonomy(data: bytes, suffix: str) -> Mapping[str, Any]:
+    """Parse raw taxonomy file contents; ``suffix`` selects JSON or TOML."""
+    if suffix == ".json":
+        document = json.loads(data)
+    elif suffix == ".toml":
+        document = _load_toml().loads(data.decode("utf-8"))
+    else:
+        raise ValueError(f"Unsupported taxonomy format: {suffix!r}")
+    if not isinstance(document, Mapping) or not isinstance(
+        document.get("intents"), Mapping
+    ):
+        raise ValueError("Taxonomy must define an 'intents' table")
+    return document
+
+
+def compile_taxonomy(document: Mapping[str, Any]) -> PatternBank:
+    """Compile a parsed taxonomy into a pattern bank."""
+    return PatternBank.from_intents(document["intents"])
+
+
+def load_pattern_bank(
+    path: PathLike,
+    cache_dir: Optional[PathLike] = None,
+    use_cache: bool = True,
+) -> PatternBank:
+    """Load a taxonomy file as a shared, compiled pattern bank.
+
+    Banks are reused within the process and, unless ``use_cache`` is false,
+    cached on disk under ``cache_dir`` (default ``default_cache_dir()``).
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    bank = _loaded_banks.get(digest)
+    if bank is not None:
+        return bank
+
+    cache_file = None
+    if use_cache:
+        directory = Path(cache_dir) if cache_dir else default_cache_dir()
+        cache_file = directory / "taxonomy" / f"{digest}.json"
+        bank = _read_cache(cache_file)
+    if bank is None:
+        bank = compile_taxonomy(parse_taxonomy(data, path.suffix.lower()))
+        if cache_file is not None:
+            _write_cache(cache_file, bank)
+    _loaded_banks[digest] = bank
+    return bank
+
+
+def _read_cache(cache_file: Path) -> Optional[PatternBank]:
+    """Load a cached bank; missing, stale or corrupt entries return None."""
+    try:
+        with open(cache_file, encoding="utf-8") as handle:
+            spec = json.load(handle)
+        if spec.get("version") != SPEC_VERSION:
+            return None
+        return PatternBank.from_spec(spec)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_cache(cache_file: Path, bank: PatternBank) -> None:
+    """Atomically write a bank's spec; the cache is best-effort."""
+    temporary = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_file.parent, suffix=".tmp", delete=False
+        ) as handle:
+            temporary = handle.name
+            json.dump({"version": SPEC_VERSION, **bank.to_spec()}, handle)
+        os.replace(temporary, cache_file)
+    except OSError:
+        if temporary is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(temporary)
@@ -3,136 +3,488 @@
 """
 
 import re
-from typing import Final
+import threading
+from typing import (
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Match,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+from .rbac import AccessControl, Role
+from .textstats import text_stats
+
+
+# Compiled patterns for performance
+_CONTEXT_KEYWORDS: Final = re.compile(r"context|background|requirements", re.IGNORECASE)
+_FORMAT_KEYWORDS: Final = re.compile(r"format|structure|organize", re.IGNORECASE)
+# Inner whitespace runs that collapsing to one space would change
+_WHITESPACE_FIXES: Final = re.compile(r"[^\S ]\s*| \s+")
+_SENTENCE_ENDINGS: Final = (".", "!", "?")
+_DETAIL_REQUEST: Final = " Please provide detailed information."
+
+
+class Edit(NamedTuple):
+    """Replace ``text[start:end]`` with ``replacement``; start == end inserts"""
+    start: int
+    end: int
+    replacement: str
+
+
+class Rewrite(NamedTuple):
+    """A step's output text and the edit script that produced it.
+
+    Offsets refer to the step's input; edits are ordered and never overlap,
+    so ``apply_edits(input, edits) == text``. Steps only emit edits that
+    change the text, so an empty script means the step was a no-op.
+    """
+    text: str
+    edits: Tuple[Edit, ...] = ()
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.edits)
+
+
+def apply_edits(text: str, edits: Iterable[Edit]) -> str:
+    """Apply an ordered, non-overlapping edit script in one join"""
+    parts = []
+    position = 0
+    for start, end, replacement in edits:
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def fit_edits(source: str, rewrite: Rewrite, max_length: int) -> Rewrite:
+    """Drop growing edits from ``rewrite`` until its text fits ``max_length``
+
+    Edits that shorten the text are always kept; growing edits are kept in
+    script order while they fit. Runs in one pass over the script plus one
+    join; if even the shortest result is too long, it is returned as is.
+    """
+    if len(rewrite.text) <= max_length:
+        return rewrite
+    length = len(source) + sum(
+        min(0, len(replacement) - (end - start))
+        for start, end, replacement in rewrite.edits
+    )
+    kept = []
+    for edit in rewrite.edits:
+        growth = len(edit.replacement) - (edit.end - edit.start)
+        if growth > 0:
+            if length + growth > max_length:
+                continue
+            length += growth
+        kept.append(edit)
+    if len(kept) == len(rewrite.edits):
+        return rewrite
+    return Rewrite(apply_edits(source, kept), tuple(kept)) if kept else Rewrite(source)
+
+
+class VagueTermRewriter:
+    """Replaces vague terms with specific wording in one regex pass.
+
+    Terms match case-insensitively as whole words. The alternation is
+    compiled on first use after the table changes, never per call.
+    """
+
+    DEFAULT_REPLACEMENTS: Final = {
+        "something": "a specific item",
+        "anything": "any relevant information",
+        "stuff": "relevant details",
+        "things": "specific elements",
+    }
+
+    def __init__(self, replacements: Optional[Mapping[str, str]] = None) -> None:
+        self._lock = threading.Lock()
+        self._table: Dict[str, str] = {}
+        # (alternation, replacement per term group); None until next use
+        self._compiled: Optional[Tuple[Pattern[str], Tuple[str, ...]]] = None
+        self._version = 0
+        self.update(
+            self.DEFAULT_REPLACEMENTS if replacements is None else replacements
+        )
+
+    @property
+    def replacements(self) -> Dict[str, str]:
+        """A copy of the term -> replacement table"""
+        return dict(self._table)
+
+    @property
+    def version(self) -> int:
+        """Bumped by every change to the table"""
+        return self._version
+
+    def register(self, term: str, replacement: str) -> None:
+        """Add or change the replacement for one term"""
+        self.update({term: replacement})
+
+    def unregister(self, term: str) -> None:
+        """Stop replacing ``term``"""
+        with self._lock:
+            table = dict(self._table)
+            if table.pop(term.lower(), None) is not None:
+                self._table, self._compiled = table, None
+                self._version += 1
+
+    def update(self, replacements: Mapping[str, str]) -> None:
+        """Add or change several replacements at once"""
+        with self._lock:
+            table = dict(self._table)
+            for term, replacement in replacements.items():
+                if not term.strip():
+                    raise ValueError("Vague term must not be empty")
+                table[term.lower()] = replacement
+            self._table, self._compiled = table, None
+            self._version += 1
+
+    def _compile(self) -> Tuple[Pattern[str], Tuple[str, ...]]:
+        with self._lock:
+            if self._compiled is None:
+                # Longest first, so a term never loses to one of its prefixes
+                terms = sorted(self._table, key=len, reverse=True)
+                # One group per term: the matched group picks the replacement,
+                # since a case variant the regex accepts may not lower() to
+                # the term (e.g. the long s in "ſtuff"). An empty table gets
+                # a pattern that never matches
+                alternation = (
+                    "|".join(f"({re.escape(term)})" for term in terms) or "(?!)"
+                )
+                # Reject most positions on their first character
+                initials = "".join(sorted({re.escape(term[0]) for term in terms}))
+                lookahead = f"(?=[{initials}])" if initials else ""
+                self._compiled = (
+                    re.compile(
+                        rf"(?<!\w){lookahead}(?:{alternation})(?!\w)", re.IGNORECASE
+                    ),
+                    tuple(self._table[term] for term in terms),
+                )
+            return self._compiled
+
+    def rewrite(self, prompt: str) -> str:
+        """``prompt`` with every vague term replaced"""
+        pattern, replacements = self._compiled or self._compile()
+
+        def replace(match: Match[str]) -> str:
+            return replacements[match.lastindex - 1]  # type: ignore[operator]
+
+        return pattern.sub(replace, prompt)
+
+    def rewrite_edits(self, prompt: str) -> Rewrite:
+        """The rewrite plus one edit per term whose replacement differs"""
+        pattern, replacements = self._compiled or self._compile()
+        edits: List[Edit] = []
+
+        def replace(match: Match[str]) -> str:
+            replacement = replacements[match.lastindex - 1]  # type: ignore[operator]
+            if replacement != match[0]:
+                edits.append(Edit(match.start(), match.end(), replacement))
+            return replacement
+
+        text = pattern.sub(replace, prompt)
+        return Rewrite(text, tuple(edits)) if edits else Rewrite(prompt)
+
+
+# Shared by every plan; register terms here to extend the Develop step
+VAGUE_TERM_REWRITER: Final = VagueTermRewriter()
+
+
+ACTION_PLACEHOLDER: Final = "{action}"
+_PLATFORM_NAME: Final = re.compile(r"[a-z0-9][a-z0-9_-]*")
+
+
+class PlatformTemplate(NamedTuple):
+    """A platform's structure, split around the action when registered"""
+
+    prefix: str  # platform prefix + structure text before the action
+    infix: str  # structure text after the action
+    suffix: str  # platform closing sentence, with its leading space
+
+    @classmethod
+    def compile(
+        cls, structure: str, prefix: str = "", suffix: str = ""
+    ) -> "PlatformTemplate":
+        """Split ``structure`` at its ``{action}`` placeholder
+
+        A structure without the placeholder is followed by the action.
+        """
+        if structure.count(ACTION_PLACEHOLDER) > 1:
+            raise ValueError("Platform structure may contain one {action}")
+        head, found, tail = structure.partition(ACTION_PLACEHOLDER)
+        if not found and head:
+            head += " "
+        return cls(prefix + head, tail, " " + suffix if suffix else "")
+
+    def apply(self, action: str) -> str:
+        return self.prefix + action + self.infix + self.suffix
+
+
+class PlatformRegistry:
+    """Platform names mapped to templates compiled at registration"""
+
+    def __init__(self) -> None:
+        self._templates: Dict[str, PlatformTemplate] = {}
+        self._version = 0
+
+    def register(
+        self,
+        name: str,
+        structure: str = ACTION_PLACEHOLDER,
+        prefix: str = "",
+        suffix: str = "",
+    ) -> PlatformTemplate:
+        """Add or replace a platform; names are lowercase identifiers"""
+        if not _PLATFORM_NAME.fullmatch(name):
+            raise ValueError(f"Invalid platform name: {name!r}")
+        template = self._templates[name] = PlatformTemplate.compile(
+            structure, prefix, suffix
+        )
+        self._version += 1
+        return template
+
+    def unregister(self, name: str) -> None:
+        """Remove a platform"""
+        self.get(name)
+        del self._templates[name]
+        self._version += 1
+
+    def get(self, name: str) -> PlatformTemplate:
+        """The compiled template for ``name``"""
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise ValueError(f"Invalid platform: {name}") from None
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        return frozenset(self._templates)
+
+    @property
+    def version(self) -> int:
+        """Bumped by every register and unregister"""
+        return self._version
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._templates
+
+
+class OptimizationPlan(NamedTuple):
+    """Precompiled develop/design/deliver steps for one request shape.
+
+    Every branch that depends only on intent, platform and output type is
+    resolved when the plan is compiled and its strings are pre-rendered, so
+    applying a plan only runs the checks that depend on the prompt text.
+    """
+
+    key: Tuple[str, str, str]  # (intent, platform, output_type)
+    add_context: bool  # technical prompts without context get "Context: "
+    template: PlatformTemplate
+    polite: bool  # technical prompts get "Please " framing
+    format_suffix: str  # " " + output-type format instruction
+
+    def develop(self, prompt: str) -> str:
+        """Step 1: Develop clarity by removing vague terms and adding context"""
+        return self.develop_edits(prompt).text
+
+    def develop_edits(self, prompt: str) -> Rewrite:
+        """Step 1 as an edit script over ``prompt``"""
+        text, edits = VAGUE_TERM_REWRITER.rewrite_edits(prompt)
+        if self.add_context and not _CONTEXT_KEYWORDS.search(prompt):
+            text = "Context: " + text
+            edits = (Edit(0, 0, "Context: "),) + edits
+        # Encourage detail for short prompts
+        if text_stats(text).word_count < 10:
+            text += _DETAIL_REQUEST
+            edits += (Edit(len(prompt), len(prompt), _DETAIL_REQUEST),)
+        return Rewrite(text, edits)
+
+    def design(self, prompt: str) -> str:
+        """Step 2: Design structure for the plan's platform"""
+        return self.design_edits(prompt).text
+
+    def design_edits(self, prompt: str) -> Rewrite:
+        """Step 2 as an edit script; restructuring replaces the whole prompt"""
+        text = prompt
+        # Apply platform-specific structure for simple prompts
+        stats = text_stats(prompt)
+        if stats.word_count < 15:
+            text = self.template.apply(stats.lowered.strip())
+        if self.polite and not text.startswith(("Please", "Can you", "How")):
+            text = "Please " + text.lower()
+        elif text == prompt:
+            return Rewrite(prompt)
+        return Rewrite(text, (Edit(0, len(prompt), text),))
+
+    def deliver(self, prompt: str) -> str:
+        """Step 3: Deliver final formatting for the plan's output type"""
+        return self.deliver_edits(prompt).text
+
+    def deliver_edits(self, prompt: str) -> Rewrite:
+        """Step 3 as an edit script: whitespace fixes, then closing text"""
+        closing = "" if _FORMAT_KEYWORDS.search(prompt) else self.format_suffix
+        if not (closing or prompt).endswith(_SENTENCE_ENDINGS):
+            # A full stop after trailing whitespace keeps one space before it
+            closing += " ." if not closing and prompt[-1:].isspace() else "."
+
+        # Strip both ends and collapse inner whitespace runs to one space
+        length = len(prompt)
+        start = length - len(prompt.lstrip()) if prompt[:1].isspace() else 0
+        end = len(prompt.rstrip()) if prompt[-1:].isspace() else length
+        edits = [Edit(0, start, "")] if start else []
+        edits.extend(
+            Edit(*match.span(), " ")
+            for match in _WHITESPACE_FIXES.finditer(prompt, start, end)
+        )
+        if start < end < length:
+            edits.append(Edit(end, length, ""))
+        if closing:
+            if start >= end:
+                closing = closing.lstrip()  # nothing but whitespace before it
+            edits.append(Edit(length, length, closing))
+        if not edits:
+            return Rewrite(prompt)
+        return Rewrite(apply_edits(prompt, edits), tuple(edits))
+
+    def run(self, prompt: str) -> Tuple[str, str, str]:
+        """Apply all three steps, returning each step's output"""
+        developed = self.develop(prompt)
+        designed = self.design(developed)
+        return developed, designed, self.deliver(designed)
 
 
 class OptimizationTechniques:
     """4-D methodology implementation: Deconstruct, Develop, Design, Deliver"""
 
-    # Supported platforms and techniques
+    # Built-in platforms and supported techniques; PLATFORMS holds every
+    # registered platform, including ones added with register_platform()
     ALLOWED_PLATFORMS: Final = frozenset({"claude", "chatgpt", "gemini", "generic"})
     ALLOWED_TECHNIQUES: Final = frozenset(
         {"develop_clarity", "design_structure", "deliver_format"}
     )
 
-    # Compiled patterns for performance
-    _CONTEXT_KEYWORDS = re.compile(r"context|background|requirements", re.IGNORECASE)
-    _FORMAT_KEYWORDS = re.compile(r"format|structure|organize", re.IGNORECASE)
-    _WHITESPACE_CLEANER = re.compile(r"\s+")
-
-    def develop_clarity(self, prompt: str, intent: str) -> str:
-        """Step 1: Develop clarity by removing vague terms and adding context"""
-        enhanced_prompt = prompt
+    PLATFORM_TEMPLATES: Final = {
+        "claude": {
+            "prefix": "Human: ",
+            "structure": "Please {action}. Be thorough and accurate.",
+            "suffix": "",
+        },
+        "chatgpt": {
+            "prefix": "",
+            "structure": "Act as an expert. {action}",
+            "suffix": "Provide a comprehensive response.",
+        },
+        "gemini": {
+            "prefix": "",
+            "structure": "{action}",
+            "suffix": "Be precise and helpful.",
+        },
+        "generic": {"prefix": "", "structure": "{action}", "suffix": ""},
+    }
+
+    # Output type specific formatting
+    FORMAT_INSTRUCTIONS: Final = {
+        "list": "Please format your response as a numbered or bulleted list.",
+        "explanation": "Please provide a clear, step-by-step explanation.",
+        "code": "Please provide code examples with comments and explanations.",
+        "creative": "Please be creative and engaging in your response.",
+        "general": "Please provide a comprehensive and well-structured response.",
+    }
+
+    # Compiled plans, shared by all instances; a few dozen combinations at most
+    _plans: Dict[Tuple[str, str, str], OptimizationPlan] = {}
+    # Authorization results per (role, platform)
+    _access: Dict[Tuple[Role, str], bool] = {}
+
+    @classmethod
+    def register_platform(
+        cls,
+        name: str,
+        structure: str = ACTION_PLACEHOLDER,
+        prefix: str = "",
+        suffix: str = "",
+    ) -> PlatformTemplate:
+        """Add or replace a target platform for every engine
+
+        ``structure`` may contain one ``{action}`` placeholder for the
+        prompt; ``prefix`` and ``suffix`` go before and after it.
+        """
+        template = PLATFORMS.register(name, structure, prefix, suffix)
+        cls._forget_platform(name)
+        return template
+
+    @classmethod
+    def unregister_platform(cls, name: str) -> None:
+        """Stop accepting ``name`` as a target platform"""
+        PLATFORMS.unregister(name)
+        cls._forget_platform(name)
+
+    @classmethod
+    def _forget_platform(cls, name: str) -> None:
+        """Drop plans and access decisions made for the old definition"""
+        for key in [key for key in cls._plans if key[1] == name]:
+            cls._plans.pop(key, None)
+        for key in [key for key in cls._access if key[1] == name]:
+            cls._access.pop(key, None)
+
+    @classmethod
+    def authorize(cls, platform: str, role: Role = Role.USER) -> None:
+        """Raise PermissionError unless ``role`` may target ``platform``"""
+        key = (role, platform)
+        allowed = cls._access.get(key)
+        if allowed is None:
+            allowed = cls._access[key] = AccessControl.validate_platform_access(
+                role, platform
+            )
+        if not allowed:
+            raise PermissionError(f"Access denied for platform: {platform}")
 
-        # Add technical context if missing
-        if intent == "technical" and not self._CONTEXT_KEYWORDS.search(enhanced_prompt):
-            enhanced_prompt = f"Context: {enhanced_prompt}"
+    def plan(self, intent: str, platform: str, output_type: str) -> OptimizationPlan:
+        """Get the compiled plan for a request shape, compiling it once"""
+        key = (intent, platform, output_type)
+        compiled = self._plans.get(key)
+        if compiled is None:
+            compiled = self._plans[key] = self._compile_plan(key)
+        return compiled
 
-        # Replace vague terms with specific alternatives
-        vague_term_replacements = [
-            (re.compile(r"\bsomething\b", re.IGNORECASE), "a specific item"),
-            (re.compile(r"\banything\b", re.IGNORECASE), "any relevant information"),
-            (re.compile(r"\bstuff\b", re.IGNORECASE), "relevant details"),
-            (re.compile(r"\bthings\b", re.IGNORECASE), "specific elements"),
-        ]
+    def _compile_plan(self, key: Tuple[str, str, str]) -> OptimizationPlan:
+        intent, platform, output_type = key
 
-        for vague_pattern, specific_replacement in vague_term_replacements:
-            enhanced_prompt = vague_pattern.sub(specific_replacement, enhanced_prompt)
+        # Strict platform validation with authorization check
+        template = PLATFORMS.get(platform)
+        self.authorize(platform)
 
-        # Encourage detail for short prompts
-        if len(enhanced_prompt.split()) < 10:
-            enhanced_prompt += " Please provide detailed information."
+        format_instruction = self.FORMAT_INSTRUCTIONS.get(
+            output_type, self.FORMAT_INSTRUCTIONS["general"]
+        )
+        return OptimizationPlan(
+            key=key,
+            add_context=intent == "technical",
+            template=template,
+            polite=intent == "technical",
+            format_suffix=" " + format_instruction,
+        )
 
-        return enhanced_prompt
+    def develop_clarity(self, prompt: str, intent: str) -> str:
+        """Step 1: Develop clarity by removing vague terms and adding context"""
+        return self.plan(intent, "generic", "general").develop(prompt)
 
     def design_structure(self, prompt: str, platform: str, intent: str) -> str:
         """Step 2: Design structure optimized for target AI platform"""
-        from .rbac import AccessControl, Role
-
-        # Strict platform validation with authorization check
-        if platform not in self.ALLOWED_PLATFORMS:
-            raise ValueError(f"Invalid platform: {platform}")
-
-        # Authorization check for platform access
-        if not AccessControl.validate_platform_access(Role.USER, platform):
-            raise PermissionError(f"Access denied for platform: {platform}")
-
-        structured_prompt = prompt
-
-        platform_templates = {
-            "claude": {
-                "prefix": "Human: ",
-                "structure": "Please {action}. Be thorough and accurate.",
-                "suffix": "",
-            },
-            "chatgpt": {
-                "prefix": "",
-                "structure": "Act as an expert. {action}",
-                "suffix": "Provide a comprehensive response.",
-            },
-            "gemini": {
-                "prefix": "",
-                "structure": "{action}",
-                "suffix": "Be precise and helpful.",
-            },
-            "generic": {"prefix": "", "structure": "{action}", "suffix": ""},
-        }
-
-        template = platform_templates[platform]
-
-        # Apply platform-specific structure for simple prompts
-        word_count = len(structured_prompt.split())
-        if word_count < 15:
-            user_action = structured_prompt.lower().strip()
-
-            # Apply structure template
-            if template["structure"] and "{action}" in template["structure"]:
-                structured_prompt = template["structure"].format(action=user_action)
-
-            # Add prefix and suffix
-            if template["prefix"]:
-                structured_prompt = template["prefix"] + structured_prompt
-
-            if template["suffix"]:
-                structured_prompt += " " + template["suffix"]
-
-        # Add polite framing for technical requests
-        if intent == "technical" and not structured_prompt.startswith(
-            ("Please", "Can you", "How")
-        ):
-            structured_prompt = f"Please {structured_prompt.lower()}"
-
-        return structured_prompt
+        return self.plan(intent, platform, "general").design(prompt)
 
     def deliver_format(self, prompt: str, output_type: str) -> str:
         """Step 3: Deliver final formatting based on expected output type"""
-        formatted_prompt = prompt
-
-        # Output type specific formatting
-        format_instructions = {
-            "list": "Please format your response as a numbered or bulleted list.",
-            "explanation": "Please provide a clear, step-by-step explanation.",
-            "code": "Please provide code examples with comments and explanations.",
-            "creative": "Please be creative and engaging in your response.",
-            "general": "Please provide a comprehensive and well-structured response.",
-        }
-
-        format_instruction = format_instructions.get(
-            output_type, format_instructions["general"]
-        )
-
-        # Add format guidance if not already specified
-        if not self._FORMAT_KEYWORDS.search(formatted_prompt):
-            formatted_prompt += f" {format_instruction}"
-
-        # Ensure proper sentence ending
-        if not formatted_prompt.endswith((".", "!", "?")):
-            formatted_prompt += "."
-
-        # Clean whitespace
-        formatted_prompt = self._WHITESPACE_CLEANER.sub(" ", formatted_prompt).strip()
-
-        return formatted_prompt
+        return self.plan("general", "generic", output_type).deliver(prompt)
 
     def get_technique_description(self, technique: str) -> str:
         """Get description of optimization technique with validation"""
@@ -146,3 +498,14 @@ class OptimizationTechniques:
         }
 
         return descriptions[technique]
+
+
+def _builtin_platforms() -> PlatformRegistry:
+    registry = PlatformRegistry()
+    for name, template in OptimizationTechniques.PLATFORM_TEMPLATES.items():
+        registry.register(name, **template)
+    return registry
+
+
+# Every target platform, compiled once at load; extend with register_platform()
+PLATFORMS: Final = _builtin_platforms()
@@ -0,0 +1,68 @@
+"""
+Tokenize-once word statistics shared across the pipeline.
+
+Each version of a prompt (original, developed, designed, final) is split
+and lowercased by several consumers: the engine, the technique plans, the
+formatters and the evaluator. ``text_stats`` memoizes one ``TextStats`` per
+string, and each statistic is computed on first use.
+"""
+
+from functools import lru_cache
+from typing import FrozenSet, Final, List, Optional
+
+
+class TextStats:
+    """Lazily computed tokens, lowercase form and counts for one string"""
+
+    __slots__ = ("text", "_words", "_lowered", "_lower_words", "_vocabulary")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._words: Optional[List[str]] = None
+        self._lowered: Optional[str] = None
+        self._lower_words: Optional[List[str]] = None
+        self._vocabulary: Optional[FrozenSet[str]] = None
+
+    @property
+    def char_count(self) -> int:
+        return len(self.text)
+
+    @property
+    def words(self) -> List[str]:
+        """Whitespace-separated tokens, as ``str.split()`` returns them"""
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def lowered(self) -> str:
+        if self._lowered is None:
+            self._lowered = self.text.lower()
+        return self._lowered
+
+    @property
+    def lower_words(self) -> List[str]:
+        """Tokens of the lowercased text"""
+        if self._lower_words is None:
+            self._lower_words = self.lowered.split()
+        return self._lower_words
+
+    @property
+    def vocabulary(self) -> FrozenSet[str]:
+        """Distinct lowercased tokens"""
+        if self._vocabulary is None:
+            self._vocabulary = frozenset(self.lower_words)
+        return self._vocabulary
+
+
+STATS_CACHE_SIZE: Final = 256
+
+
+@lru_cache(maxsize=STATS_CACHE_SIZE)
+def text_stats(text: str) -> TextStats:
+    """Shared, memoized statistics so each string is tokenized once."""
+    return TextStats(text)
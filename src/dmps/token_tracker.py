@@ -41,6 +41,7 @@ class TokenTracker:
         "chatgpt": {"input": 0.0015, "output": 0.002},
         "gemini": {"input": 0.00125, "output": 0.00375}
     }
+    CHARS_PER_TOKEN: Final = 4
     
     def __init__(self):
         self.traces: List[ContextTrace] = []
@@ -49,20 +50,32 @@ class TokenTracker:
     
     def estimate_tokens(self, text: str) -> int:
         """Estimate token count (rough approximation: 4 chars = 1 token)"""
-        return max(1, len(text) // 4)
+        return max(1, len(text) // self.CHARS_PER_TOKEN)
+
+    def max_chars(self, max_tokens: int) -> int:
+        """Length of the longest text whose estimate fits ``max_tokens``"""
+        return (max_tokens + 1) * self.CHARS_PER_TOKEN - 1
     
     def calculate_cost(self, input_tokens: int, output_tokens: int, platform: str) -> float:
         """Calculate estimated cost for token usage"""
         costs = self.TOKEN_COSTS.get(platform, self.TOKEN_COSTS["chatgpt"])
         return (input_tokens * costs["input"] + output_tokens * costs["output"]) / 1000
     
-    def start_trace(self, operation_id: str, original_prompt: str) -> Dict:
-        """Start tracing a context engineering operation"""
+    def start_trace(self, operation_id: str, original_prompt: str,
+                    original_tokens: Optional[int] = None,
+                    start_time: Optional[float] = None) -> Dict:
+        """Start tracing a context engineering operation
+
+        ``original_tokens`` reuses an estimate already made for the prompt;
+        ``start_time`` backdates the trace to when the operation began.
+        """
+        if original_tokens is None:
+            original_tokens = self.estimate_tokens(original_prompt)
         return {
             "operation_id": operation_id,
             "original_prompt": original_prompt,
-            "start_time": time.time(),
-            "original_tokens": self.estimate_tokens(original_prompt)
+            "start_time": time.time() if start_time is None else start_time,
+            "original_tokens": original_tokens
         }
     
     def complete_trace(self, trace_context: Dict, optimized_prompt: str, 
@@ -0,0 +1,91 @@
+"""
+Tests for fused constraint detection.
+"""
+
+import pytest
+from dmps.constraints import CONSTRAINT_PATTERN, Constraints, detect_constraints
+from dmps.engine import OptimizationEngine
+from dmps.scanning import ChunkedScanner
+
+
+class TestDetectConstraints:
+    """One pass extracts structured constraints and context cues"""
+
+    def test_structured_values(self):
+        """Limits are parsed as numbers and formats normalized"""
+        constraints = detect_constraints(
+            "Give a BRIEF answer in Json, under 150 words and 900 characters"
+        )
+        assert constraints == Constraints(
+            word_limit=150, char_limit=900, length="brief", output_format="json"
+        )
+        assert constraints.describe() == [
+            "150 words",
+            "900 characters",
+            "brief",
+            "JSON format",
+        ]
+
+    def test_first_mention_wins(self):
+        """Repeated cues keep their first value"""
+        constraints = detect_constraints("Use 1 word, then 300 words, as xml or yaml")
+        assert constraints.word_limit == 1
+        assert constraints.output_format == "xml"
+
+    @pytest.mark.parametrize(
+        "prompt, context, direction",
+        [
+            ("Fix this bug", False, False),
+            ("Background: the service restarts", True, False),
+            ("Our use case is batch imports", True, False),
+            ("Write for a young audience", False, True),
+            ("Keep the tone light, given the context", True, True),
+        ],
+    )
+    def test_context_cues(self, prompt, context, direction):
+        """Context and creative-direction cues come from the same pass"""
+        constraints = detect_constraints(prompt)
+        assert (constraints.has_context, constraints.has_direction) == (
+            context,
+            direction,
+        )
+
+    def test_whole_words_only(self):
+        """Cues inside longer words do not count"""
+        assert detect_constraints("briefly summarize the jsonl and longer") == (
+            Constraints()
+        )
+
+    def test_stops_once_every_cue_fired(self):
+        """The scan ends after every group has matched"""
+        prompt = "brief 5 words 9 characters json context tone " + "x " * 5000
+        scanner = ChunkedScanner(chunk_size=100, budget=200)
+        assert detect_constraints(prompt, scanner).has_direction
+
+    def test_chunked_matches_whole_text(self):
+        """Chunked matching agrees with a whole-text finditer"""
+        prompt = ("pad " * 30 + "200 words json tone ") * 20
+        scanner = ChunkedScanner(chunk_size=37, overlap=24)
+        assert [m.span() for m in scanner.finditer(prompt, CONSTRAINT_PATTERN)] == [
+            m.span() for m in CONSTRAINT_PATTERN.finditer(prompt)
+        ]
+
+
+class TestEngineConstraints:
+    """The engine reports structured constraints and gaps from one detector"""
+
+    def test_extract_user_constraints(self):
+        engine = OptimizationEngine()
+        assert engine._extract_user_constraints("Write 500 words about AI") == [
+            "500 words"
+        ]
+
+    def test_missing_info_uses_detected_cues(self):
+        engine = OptimizationEngine()
+        analysis = engine.analyze("Debug this function, background: it leaks")
+        assert analysis.intent == "technical"
+        assert analysis.constraint_details.has_context
+        assert "Technical context might be helpful" not in analysis.missing_info
+        assert engine._identify_missing_info("Debug this function", "technical") == [
+            "Technical context might be helpful"
+        ]
@@ -92,4 +92,143 @@ class TestOptimizationEngine:
         assert isinstance(data, dict)
         assert isinstance(request, OptimizationRequest)
         assert len(optimized) > 0
-        assert request.intent in ["educational", "general"]
\ No newline at end of file
+        assert request.intent in ["educational", "general"]
+
+
+class CountingClassifier:
+    """Classifier stub that records every classify() call"""
+
+    def __init__(self, intent="technical"):
+        self.intent = intent
+        self.calls = []
+
+    def classify(self, prompt):
+        self.calls.append(prompt)
+        return self.intent
+
+
+class TestPromptAnalysis:
+    """Each request is analyzed once and every stage reads the analysis"""
+
+    def test_analysis_fields(self):
+        """analyze() collects intent, format, constraints and text stats"""
+        engine = OptimizationEngine()
+        prompt = "Write a brief story about something, for example a robot"
+        analysis = engine.analyze(prompt)
+
+        assert analysis.text == prompt
+        assert analysis.intent == "creative"
+        assert analysis.output_type == "creative"
+        assert analysis.constraints == ["brief"]
+        assert analysis.constraint_details.length == "brief"
+        assert "Vague references need clarification" in analysis.missing_info
+        assert analysis.char_count == len(prompt)
+        assert analysis.word_count == 10
+        assert analysis.token_estimate == len(prompt) // 4
+        assert analysis.keyword_hits.contains("example")
+
+    def test_request_carries_analysis(self):
+        """extract_intent() builds the request from one analysis"""
+        engine = OptimizationEngine()
+        request = engine.extract_intent("Debug this code")
+        assert request.analysis is not None
+        assert request.intent == request.analysis.intent
+        assert request.missing_info == request.analysis.missing_info
+
+    def test_optimize_classifies_once(self):
+        """PromptOptimizer.optimize runs the classifier exactly once"""
+        from dmps.optimizer import PromptOptimizer
+
+        classifier = CountingClassifier()
+        optimizer = PromptOptimizer()
+        optimizer._engine = OptimizationEngine(intent_classifier=classifier)
+
+        result, validation = optimizer.optimize("Fix the login handler", "structured")
+
+        assert validation.is_valid
+        assert classifier.calls == ["Fix the login handler"]
+        assert '"intent_detected": "technical"' in result.optimized_prompt
+
+    def test_formatters_read_analysis(self):
+        """Formatters report the analysis' counts for the original prompt"""
+        import json
+
+        from dmps.formatters import ConversationalFormatter, StructuredFormatter
+
+        engine = OptimizationEngine()
+        request = engine.extract_intent("Explain closures in detail")
+        request.analysis.char_count, request.analysis.word_count = 99, 7
+        data = engine.apply_optimization(request)
+        prompt = data["optimized_prompt"]
+
+        conversational = ConversationalFormatter().format(data, request, prompt)
+        assert conversational.metadata["original_length"] == 99
+        structured = StructuredFormatter().format(data, request, prompt)
+        analysis = json.loads(structured.optimized_prompt)["optimization_result"][
+            "analysis"
+        ]
+        assert analysis["original_length"] == 99
+        assert analysis["word_count_original"] == 7
+        assert data["components"]["word_count"] == 7
+
+    def test_evaluator_matches_with_and_without_analysis(self):
+        """Evaluating from the analysis gives the same scores"""
+        from dmps.evaluation import ContextEvaluator
+
+        engine = OptimizationEngine()
+        original = "Tell me something about stuff and things"
+        optimized = "Please give a specific, detailed example of the topic."
+        analysis = engine.analyze(original)
+        plain = ContextEvaluator().evaluate(original, optimized, 10, 14)
+        shared = ContextEvaluator().evaluate(
+            original, optimized, 10, 14, analysis=analysis
+        )
+        assert shared == plain
+
+
+class TestBatchOptimization:
+    """apply_optimization_many matches the per-prompt calls, in order"""
+
+    PROMPTS = [
+        "Write a short story about a robot",
+        "Debug this Python function",
+        "Give me a list of stuff to pack",
+        "Explain closures",
+        "Debug this Python function",
+        "",
+    ]
+
+    def test_matches_per_prompt_calls(self):
+        """Prompts, data and requests equal the one-at-a-time results"""
+        engine = OptimizationEngine()
+        batch = engine.apply_optimization_many(self.PROMPTS, platform="gemini")
+        assert len(batch) == len(self.PROMPTS)
+        for prompt, (optimized, data, request) in zip(self.PROMPTS, batch):
+            single = engine.extract_intent(prompt)
+            single.platform = "gemini"
+            expected = engine.apply_optimization(single)
+            assert request.raw_input == prompt
+            assert (request.intent, request.output_type) == (
+                single.intent,
+                single.output_type,
+            )
+            assert data == expected
+            assert optimized == engine.assemble_prompt(expected, single)
+
+    def test_disabled_stages_and_custom_classifier(self):
+        """Options apply to every prompt; other classifiers run per prompt"""
+        classifier = CountingClassifier()
+        engine = OptimizationEngine(intent_classifier=classifier)
+        batch = engine.apply_optimization_many(
+            self.PROMPTS[:3], disabled_stages=["design"]
+        )
+        assert classifier.calls == self.PROMPTS[:3]
+        for _, data, request in batch:
+            assert request.disabled_stages == frozenset({"design"})
+            assert "design_structure" not in data["techniques_applied"]
+
+    def test_empty_batch_and_invalid_platform(self):
+        engine = OptimizationEngine()
+        assert engine.apply_optimization_many([]) == []
+        with pytest.raises(ValueError):
+            engine.apply_optimization_many(["Explain closures"], platform="nope")
@@ -83,4 +83,367 @@ class TestGapAnalyzer:
         text = "Write a 500-word professional blog post for developers about Python list comprehensions in bullet format"
         gaps = GapAnalyzer.identify_gaps(text, "technical")
         # Should have fewer gaps due to specificity
-        assert len(gaps) < 4
\ No newline at end of file
+        assert len(gaps) < 4
+
+
+class TestIntentScanner:
+    """Fused scanner must score exactly like one findall per pattern"""
+
+    PROMPTS = [
+        "Write a creative story about a robot",
+        "Explain how does the database server work\nand write a poem",
+        "programming programs program database data-driven data",
+        "What is the definition of a closure? Show me an example.",
+        "Compare the pros and cons, pros  and cons, and the advantages",
+        "story then write\nwrite then STORY write story",
+        "Let's chat casually, I think the tone is friendly",
+        "The Kelvin sign Kode and long s ſtory still match",
+        "",
+    ]
+
+    def setup_method(self):
+        self.classifier = IntentClassifier()
+
+    def _legacy_scores(self, prompt):
+        return {
+            intent: sum(len(pattern.findall(prompt)) for pattern in patterns)
+            for intent, patterns in self.classifier.compiled_patterns.items()
+        }
+
+    def test_scores_match_per_pattern_findall(self):
+        """Fused scores equal the original per-pattern counts"""
+        for prompt in self.PROMPTS:
+            assert self.classifier._scanner.score(prompt) == self._legacy_scores(
+                prompt
+            ), prompt
+
+    def test_shared_phrase_credits_every_rule(self):
+        """A word used by several rules is counted for each of them"""
+        scores = self.classifier._scanner.score("explain how it should function")
+        assert scores["technical"] == 2  # keyword + co-occurrence line
+        assert scores["educational"] == 1
+
+    def test_overlapping_phrases_count_like_alternation(self):
+        """Overlapping phrases of one rule count once, first-listed first"""
+        from dmps.intent import IntentStream, PatternBank, compile_rule
+
+        rules = {
+            "place": (("york", "new york"),),
+            "city": (("new", "new york", "york"),),
+            "trip": (("new york city", "new", "york city", "york"),),
+        }
+        classifier = IntentClassifier(PatternBank.compile(rules))
+        for prompt in (
+            "visit new york",
+            "new york york city new new york",
+            "New York City, NEW  york city\nnew york",
+        ):
+            expected = {
+                intent: sum(len(compile_rule(rule).findall(prompt)) for rule in group)
+                for intent, group in rules.items()
+            }
+            assert classifier._scanner.score(prompt) == expected, prompt
+            stream = IntentStream(classifier)
+            for char in prompt:
+                stream.feed(char)
+            assert stream.scores() == expected, prompt
+
+    def test_classify_uses_fused_scores(self):
+        """classify picks the top-scoring intent or falls back to general"""
+        prompt = "Debug this Python code function"
+        assert self.classifier.classify(prompt) == "technical"
+        assert self.classifier.classify("Hello there") == "general"
+
+    def test_rejects_malformed_phrases(self):
+        """Phrases must be words separated by single spaces"""
+        from dmps.intent import IntentScanner
+
+        with pytest.raises(ValueError):
+            IntentScanner({"custom": (("c++",),)})
+
+
+class TestIntentKeywords:
+    """Intent keyword lookups backed by the shared keyword matcher"""
+
+    def test_matched_keywords(self):
+        """Only intents with keywords present are reported"""
+        classifier = IntentClassifier()
+        matched = classifier.get_matched_keywords("Please explain this code example")
+        assert matched == {
+            "technical": ["code"],
+            "educational": ["explain", "example"],
+        }
+
+
+class TestClassifyMany:
+    """Batch classification must agree with classify() prompt by prompt"""
+
+    PROMPTS = [
+        "Write a creative story about a robot",
+        "Debug this Python code function",
+        "explain the data",  # educational/analytical tie
+        "Hello there",
+        "",
+    ]
+
+    def setup_method(self):
+        self.classifier = IntentClassifier()
+
+    def test_array_fallback_matches_classify(self):
+        """The array path returns classify()'s intents and raw matrices"""
+        result = self.classifier.classify_many(self.PROMPTS, use_numpy=False)
+        assert result.intents == [self.classifier.classify(p) for p in self.PROMPTS]
+        assert result.intents[2] == "educational"
+        assert result.pattern_hits.shape == (5, len(result.pattern_intents))
+        assert result.intent_scores.shape == (5, len(result.intent_labels))
+        assert result.intent_scores[0, 0] == 2
+        assert list(result.intent_scores[3]) == [0] * len(result.intent_labels)
+
+    def test_numpy_matches_array_fallback(self):
+        """NumPy and array paths produce identical intents and scores"""
+        pytest.importorskip("numpy")
+        fast = self.classifier.classify_many(self.PROMPTS, use_numpy=True)
+        slow = self.classifier.classify_many(self.PROMPTS, use_numpy=False)
+        assert fast.intents == slow.intents
+        assert fast.pattern_hits.tolist() == slow.pattern_hits.tolist()
+        assert fast.intent_scores.tolist() == slow.intent_scores.tolist()
+
+    def test_empty_batch(self):
+        """An empty batch yields no intents"""
+        result = self.classifier.classify_many([], use_numpy=False)
+        assert result.intents == []
+        assert result.intent_scores.tolist() == []
+
+
+class TestSharedPatternBank:
+    """Compiled patterns are built once per process and shared"""
+
+    def test_instances_share_compiled_patterns(self):
+        """New instances reuse the same compiled bank"""
+        first, second = IntentClassifier(), IntentClassifier()
+        assert first.compiled_patterns is second.compiled_patterns
+        assert first._scanner is second._scanner
+
+    def test_bank_is_immutable(self):
+        """The shared bank cannot be modified through an instance"""
+        classifier = IntentClassifier()
+        with pytest.raises(TypeError):
+            classifier.compiled_patterns["creative"] = ()
+
+    def test_shared_accessor(self):
+        """shared() returns one process-wide classifier used by the cache"""
+        from dmps.cache import get_intent_classifier
+        from dmps.engine import OptimizationEngine
+
+        shared = IntentClassifier.shared()
+        assert IntentClassifier.shared() is shared
+        assert get_intent_classifier() is shared
+        assert OptimizationEngine().intent_classifier is shared
+
+
+class TestIntentStream:
+    """Streaming classification must match classifying the joined text"""
+
+    TEXT = (
+        "Please write, in a calm voice, a short poem\n"
+        "Compare the pros and cons of each database\n"
+        "how does the scheduler work"
+    )
+
+    def _feed(self, text, size):
+        stream = IntentClassifier().stream()
+        for start in range(0, len(text), size):
+            stream.feed(text[start : start + size])
+        return stream
+
+    def test_chunked_scores_match_full_scan(self):
+        """Any chunk size yields the scores of a single scan"""
+        expected = IntentClassifier()._scanner.score(self.TEXT)
+        for size in (1, 2, 3, 7, 64):
+            assert self._feed(self.TEXT, size).scores() == expected, size
+
+    def test_phrase_split_across_chunks(self):
+        """Multi-word phrases split mid-word still count"""
+        stream = IntentClassifier().stream()
+        for chunk in ("the pr", "os an", "d co", "ns"):
+            stream.feed(chunk)
+        assert stream.scores()["analytical"] == 1
+
+    def test_cooccurrence_across_chunks(self):
+        """A trigger and target in different chunks of one line fire once"""
+        stream = IntentClassifier().stream()
+        stream.feed("Write me ")
+        assert stream.scores()["creative"] == 0
+        stream.feed("a story, then a poem")
+        assert stream.scores()["creative"] == 1
+
+    def test_cooccurrence_does_not_span_lines(self):
+        """A newline between trigger and target prevents a match"""
+        stream = IntentClassifier().stream()
+        stream.feed("write\n")
+        stream.feed("story")
+        assert stream.scores()["creative"] == 0
+
+    def test_result_available_at_any_time(self):
+        """result() reflects text fed so far, including an unfinished word"""
+        stream = IntentClassifier().stream()
+        assert stream.result() == "general"
+        stream.feed("debug this co")
+        assert stream.result() == "technical"
+        stream.feed("de")
+        assert stream.scores()["technical"] == 2
+
+    def test_long_token_stream_keeps_tail_bounded(self):
+        """An unbroken word or separator run is not re-scanned on every feed"""
+        for run in ("a" * 10, " " * 10):
+            stream = IntentClassifier().stream()
+            stream.feed("write")
+            for _ in range(2000):
+                stream.feed(run)
+                assert len(stream._tail) <= len("write  ")
+            stream.feed(" a poem")
+            text = "write" + run * 2000 + " a poem"
+            expected = IntentClassifier()._scanner.score(text)
+            assert stream.scores() == expected
+
+
+class TestAdversarialInputs:
+    """Worst-case classify time stays bounded and linear in input length"""
+
+    # Lines packed with co-occurrence triggers used to make the ``.*`` rules
+    # backtrack quadratically (hundreds of ms at 10,000 characters)
+    GENERATORS = {
+        "triggers_only": lambda n: ("write " * n)[:n],
+        "target_then_triggers": lambda n: ("story " + "write " * n)[:n],
+        "phrase_triggers": lambda n: ("work " + "how to " * n)[:n],
+        "explain_flood": lambda n: ("function " + "explain " * n)[:n],
+    }
+
+    def _best_time(self, classifier, prompt, rounds=3):
+        import time
+
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            classifier.classify(prompt)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def test_max_length_inputs_are_fast(self):
+        """MAX_INPUT_LENGTH adversarial prompts classify well under 100ms"""
+        from dmps.security import SecurityConfig
+
+        classifier = IntentClassifier()
+        for name, make in self.GENERATORS.items():
+            prompt = make(SecurityConfig.MAX_INPUT_LENGTH)
+            assert self._best_time(classifier, prompt) < 0.1, name
+
+    def test_cost_scales_linearly(self):
+        """Quadrupling the input far less than 16x's the time"""
+        classifier = IntentClassifier()
+        for name, make in self.GENERATORS.items():
+            small = self._best_time(classifier, make(10000))
+            large = self._best_time(classifier, make(40000))
+            assert large < small * 8 + 0.005, name
+
+    def test_adversarial_scores_match_regex_semantics(self):
+        """Proximity matching agrees with the reference regexes"""
+        classifier = IntentClassifier()
+        for make in self.GENERATORS.values():
+            prompt = make(600)
+            expected = {
+                intent: sum(len(p.findall(prompt)) for p in patterns)
+                for intent, patterns in classifier.compiled_patterns.items()
+            }
+            assert classifier._scanner.score(prompt) == expected
+
+
+class TestWindowedClassification:
+    """Windowing bounds classify's cost on long prompts"""
+
+    FILLER = "Lorem ipsum dolor sit amet. " * 200
+
+    def test_default_scans_full_text(self):
+        """Without a strategy, hits anywhere in the prompt count"""
+        prompt = self.FILLER + "debug the code" + self.FILLER
+        assert IntentClassifier().windowing is None
+        assert IntentClassifier().classify(prompt) == "technical"
+
+    def test_short_prompts_are_scanned_in_full(self):
+        """Prompts within the ceiling get exactly the full-text scores"""
+        from dmps.intent import WindowingStrategy
+
+        classifier = IntentClassifier(windowing=WindowingStrategy())
+        prompt = "Write a story about a robot and explain the algorithm"
+        assert classifier.score(prompt) == IntentClassifier().score(prompt)
+
+    def test_windows_respect_cost_ceiling(self):
+        """Scanned spans never exceed max_chars and never overlap"""
+        from dmps.intent import WindowingStrategy
+
+        strategy = WindowingStrategy(head=50, tail=30, middle_count=3, middle_size=20)
+        for length in (150, 151, 200, 1000, 5000):
+            text = ("word " * length)[:length]
+            windows = strategy.windows(text)
+            assert sum(end - start for start, end, _ in windows) <= 140
+            assert all(a[1] <= b[0] for a, b in zip(windows, windows[1:]))
+
+    def test_windows_snap_to_word_boundaries(self):
+        """Window edges never split a word"""
+        from dmps.intent import WindowingStrategy
+
+        strategy = WindowingStrategy(head=7, tail=7, middle_count=1, middle_size=7)
+        text = "alpha beta gamma delta epsilon zeta eta theta"
+        windows = strategy.windows(text)
+        assert len(windows) == 3
+        for start, end, _ in windows:
+            for edge in (start, end):
+                if 0 < edge < len(text):
+                    assert not (text[edge - 1].isalnum() and text[edge].isalnum())
+
+    def test_hits_outside_windows_are_ignored(self):
+        """Only head, tail and sampled middle windows are scanned"""
+        from dmps.intent import WindowingStrategy
+
+        strategy = WindowingStrategy(head=100, tail=100, middle_count=0)
+        classifier = IntentClassifier(windowing=strategy)
+        hidden = self.FILLER + "debug the code" + self.FILLER
+        assert classifier.classify(hidden) == "general"
+        assert classifier.classify("debug the code " + self.FILLER) == "technical"
+        assert classifier.classify(self.FILLER + " debug the code") == "technical"
+
+    def test_weights_scale_window_scores(self):
+        """A heavier tail outweighs an equal head hit count"""
+        from dmps.intent import WindowingStrategy
+
+        prompt = "chat with me " + self.FILLER + " debug the code"
+        even = WindowingStrategy(head=100, tail=100, middle_count=0)
+        tail_heavy = WindowingStrategy(
+            head=100, tail=100, middle_count=0, tail_weight=3.0
+        )
+        assert IntentClassifier(windowing=even).classify(prompt) == "technical"
+        scores = IntentClassifier(windowing=tail_heavy).score(prompt)
+        assert scores["technical"] == 6.0
+        assert scores["conversational"] == 1.0
+
+    def test_invalid_strategies_raise(self):
+        """Negative sizes or weights and empty windows are rejected"""
+        from dmps.intent import WindowingStrategy
+
+        with pytest.raises(ValueError):
+            WindowingStrategy(head=-1)
+        with pytest.raises(ValueError):
+            WindowingStrategy(head=0, tail=0, middle_count=0)
+        with pytest.raises(ValueError):
+            WindowingStrategy(middle_weight=-0.5)
+
+    def test_engine_accepts_windowed_classifier(self):
+        """The engine can be configured with a bounded-cost classifier"""
+        from dmps.engine import OptimizationEngine
+        from dmps.intent import WindowingStrategy
+
+        classifier = IntentClassifier(windowing=WindowingStrategy())
+        engine = OptimizationEngine(intent_classifier=classifier)
+        assert engine.intent_classifier is classifier
+        request = engine.extract_intent("debug the code " + self.FILLER)
+        assert request.intent == "technical"
@@ -0,0 +1,62 @@
+"""
+Tests for the shared keyword matcher.
+"""
+
+import pytest
+from dmps.keywords import (
+    KEYWORD_GROUPS,
+    KeywordMatcher,
+    keyword_matcher,
+    scan_keywords,
+)
+
+
+class TestKeywordMatcher:
+    """Shared keyword hits must agree with plain substring checks"""
+
+    TEXTS = [
+        "Tell me Something about STUFF and things",
+        "Please give a detailed, specific example with context",
+        "somethings overlap: something + things",
+        "Nothing vague here",
+        "",
+    ]
+
+    def test_counts_match_substring_checks(self):
+        """count() equals the old `term in text.lower()` loops"""
+        for text in self.TEXTS:
+            hits = keyword_matcher.scan(text)
+            for group, terms in KEYWORD_GROUPS.items():
+                expected = sum(1 for term in terms if term in text.lower())
+                assert hits.count(group) == expected, (group, text)
+
+    def test_limit_matches_truncated_text(self):
+        """limit= behaves like scanning the first N characters"""
+        text = "x" * 995 + " stuff and something"
+        hits = keyword_matcher.scan(text)
+        assert hits.count("vague", limit=1000) == 0
+        assert hits.count("vague", limit=1001) == 1
+        assert hits.count("vague") == 2
+
+    def test_offsets_are_first_occurrences(self):
+        """offsets() reports where each present term first appears"""
+        hits = keyword_matcher.scan("stuff, more stuff, things")
+        assert hits.offsets("vague") == {"stuff": 0, "things": 19}
+
+    def test_scan_is_shared_between_callers(self):
+        """The same text returns the same memoized hit object"""
+        text = "A shared prompt about something"
+        assert scan_keywords(text) is scan_keywords(text)
+
+    def test_shared_terms_are_searched_once(self):
+        """A term registered in several groups is only looked up once"""
+        matcher = KeywordMatcher({"a": ["example"], "b": ["Example", "demo"]})
+        assert matcher.terms == ("example", "demo")
+        hits = matcher.scan("An EXAMPLE")
+        assert hits.terms("a") == ["example"]
+        assert hits.terms("b") == ["example"]
+
+    def test_unknown_group_raises(self):
+        """Unregistered groups are a programming error"""
+        with pytest.raises(KeyError):
+            scan_keywords("text").count("missing")
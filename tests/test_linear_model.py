@@ -0,0 +1,171 @@
+"""
+Tests for the hashed-feature linear intent model.
+"""
+
+import json
+
+import pytest
+from dmps.linear_model import (
+    FEATURE_WINDOW,
+    LinearIntentModel,
+    _features,
+    _row_scores,
+    main,
+    read_corpus,
+    train_model,
+)
+
+EXAMPLES = [
+    ("Write a short story about a dragon", "creative"),
+    ("Compose a poem about the sea", "creative"),
+    ("Generate a fiction plot with a twist", "creative"),
+    ("Debug this Python function for me", "technical"),
+    ("Fix the server code that crashes", "technical"),
+    ("Optimize the database query algorithm", "technical"),
+    ("Compare the pros and cons of both options", "analytical"),
+    ("Analyze the research data and summarize", "analytical"),
+    ("Evaluate the statistics in this study", "analytical"),
+]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return train_model(EXAMPLES, buckets=1 << 10, epochs=10)
+
+
+class TestFeatures:
+    """Hashed features are stable and bounded"""
+
+    def test_features_are_deterministic(self):
+        """Hashes do not depend on the process hash seed"""
+        assert _features("Debug the code", 1023) == _features("debug THE code", 1023)
+
+    def test_unigrams_and_bigrams(self):
+        """n words produce n unigram and n - 1 bigram buckets"""
+        assert len(_features("one two three", (1 << 16) - 1)) == 5
+        assert _features("", 1023) == []
+
+    def test_ascii_tokens_match_word_regex(self):
+        """The translate-and-split fast path finds exactly the \\w+ runs"""
+        import re
+
+        from dmps.linear_model import _tokens
+
+        text = "Hello, wor_ld! 3.14 x-y\ttab\x00nul ~end"
+        assert _tokens(text) == re.findall(rb"\w+", text.lower().encode())
+
+    def test_buckets_within_mask(self):
+        """Every bucket index fits the model"""
+        assert all(0 <= b < 64 for b in _features("a b c d e f g h i j k", 63))
+
+    def test_window_bounds_features(self):
+        """Only whole words in the leading window are featurized"""
+        words = "w" * (FEATURE_WINDOW - 2) + " "
+        head = words + "z"  # "z" is the last character in the window
+        assert len(head) == FEATURE_WINDOW
+        assert _features(head + " debug" * 1000, 1023) == _features(head, 1023)
+        # The window edge falls inside "zy", so it is dropped
+        assert _features(head + "y more", 1023) == _features(words, 1023)
+
+
+class TestLinearIntentModel:
+    """Training, inference and the weight file format"""
+
+    def test_cached_scores_match_row_sums(self, model, monkeypatch):
+        """Cached weight tuples score like summing the hashed rows directly"""
+        import dmps.linear_model as linear_model
+
+        monkeypatch.setattr(linear_model, "WEIGHT_CACHE_SIZE", 4)
+        prompts = [p for p, _ in EXAMPLES] + ["", "x", "Ünïcode Straße, café_au lait!"]
+        for prompt in prompts:
+            expected = _row_scores(
+                model.bias, model._rows, _features(prompt, model._mask)
+            )
+            assert list(model.scores(prompt).values()) == pytest.approx(expected)
+        assert len(model._pairs) <= 4
+
+    def test_learns_training_corpus(self, model):
+        """The trained model separates its training examples"""
+        for prompt, intent in EXAMPLES:
+            assert model.classify(prompt) == intent
+
+    def test_classify_signature_matches_classifier(self, model):
+        """classify() returns one of the trained labels for any text"""
+        assert model.classify("") in model.labels
+        assert model.classify("x") in model.labels
+        assert set(model.scores("story")) == set(model.labels)
+
+    def test_save_and_memory_mapped_load(self, model, tmp_path):
+        """A loaded model scores exactly like the in-memory one"""
+        path = tmp_path / "weights.bin"
+        model.save(path)
+        assert path.stat().st_size % 4 == 0
+        loaded = LinearIntentModel.load(path)
+        try:
+            assert loaded.labels == model.labels
+            assert isinstance(loaded.weights, memoryview)
+            assert loaded.weights.readonly
+            for prompt, _ in EXAMPLES:
+                assert loaded.scores(prompt) == pytest.approx(model.scores(prompt))
+        finally:
+            loaded.close()
+
+    def test_rejects_bad_files(self, model, tmp_path):
+        """Foreign or truncated files raise ValueError"""
+        foreign = tmp_path / "foreign.bin"
+        foreign.write_bytes(b"NOTAMODEL" * 10)
+        with pytest.raises(ValueError):
+            LinearIntentModel.load(foreign)
+
+        truncated = tmp_path / "truncated.bin"
+        model.save(truncated)
+        truncated.write_bytes(truncated.read_bytes()[:-4])
+        with pytest.raises(ValueError):
+            LinearIntentModel.load(truncated)
+
+    def test_rejects_bad_shapes(self):
+        """Bucket counts must be powers of two and match the weights"""
+        with pytest.raises(ValueError):
+            LinearIntentModel.zeros(["a"], buckets=1000)
+        with pytest.raises(ValueError):
+            train_model([])
+
+    def test_plugs_into_engine(self, model):
+        """The engine accepts the model in place of the rule classifier"""
+        from dmps.engine import OptimizationEngine
+
+        engine = OptimizationEngine(intent_classifier=model)
+        request = engine.extract_intent("Compose a poem about the sea")
+        assert request.intent == "creative"
+
+
+class TestTrainingScript:
+    """Training from a labeled JSONL corpus"""
+
+    def test_main_writes_loadable_weights(self, tmp_path, capsys):
+        """The CLI trains from JSONL and writes a loadable weight file"""
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text(
+            "\n".join(
+                json.dumps({"prompt": prompt, "intent": intent})
+                for prompt, intent in EXAMPLES
+            )
+            + "\n\n"
+        )
+        output = tmp_path / "weights.bin"
+        assert main([str(corpus), "-o", str(output), "--buckets", "1024"]) == 0
+        assert "training accuracy" in capsys.readouterr().out
+
+        loaded = LinearIntentModel.load(output)
+        try:
+            assert loaded.buckets == 1024
+            assert loaded.classify("Debug this Python function for me") == "technical"
+        finally:
+            loaded.close()
+
+    def test_read_corpus_reports_bad_records(self, tmp_path):
+        """Records without prompt/intent keys name the offending line"""
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text('{"prompt": "hi", "intent": "general"}\n{"text": "x"}\n')
+        with pytest.raises(ValueError, match=":2:"):
+            read_corpus(corpus)
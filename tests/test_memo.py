@@ -0,0 +1,168 @@
+"""
+Tests for the optimization memo.
+"""
+
+import pytest
+from dmps.cache import OptimizationMemo, _estimate_size
+from dmps.engine import OptimizationEngine
+from dmps.techniques import VAGUE_TERM_REWRITER, OptimizationTechniques
+
+
+def make_request(engine, prompt, platform="claude"):
+    request = engine.extract_intent(prompt)
+    request.platform = platform
+    return request
+
+
+class TestOptimizationMemo:
+    """Bounded, counted, copy-safe storage"""
+
+    def test_hits_misses_and_copies(self):
+        """Stored values are copied in and out"""
+        memo = OptimizationMemo()
+        value = {"improvements": ["a"], "components": {"length": 1}}
+        assert memo.get("key") is None
+        memo.put("key", value)
+        value["improvements"].append("mutated after put")
+
+        first = memo.get("key")
+        first["components"]["length"] = 99
+        assert memo.get("key") == {"improvements": ["a"], "components": {"length": 1}}
+        stats = memo.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (2, 1, 1)
+
+    def test_bounded_by_bytes(self):
+        """Least recently used entries are evicted past max_bytes"""
+        value = {"optimized_prompt": "x" * 100}
+        size = _estimate_size(value)
+        memo = OptimizationMemo(max_bytes=size * 2)
+        memo.put("a", value)
+        memo.put("b", value)
+        memo.get("a")
+        memo.put("c", value)
+        assert memo.get("b") is None
+        assert memo.get("a") == memo.get("c") == value
+        stats = memo.stats()
+        assert stats.evictions == 1
+        assert stats.total_bytes == size * 2 <= stats.max_bytes
+
+    def test_oversized_values_not_stored(self):
+        memo = OptimizationMemo(max_bytes=64)
+        memo.put("big", {"optimized_prompt": "x" * 1000})
+        assert memo.stats().entries == 0
+        with pytest.raises(ValueError):
+            OptimizationMemo(max_bytes=0)
+
+    def test_clear_resets(self):
+        memo = OptimizationMemo()
+        memo.put("a", {})
+        memo.get("a")
+        memo.clear()
+        assert memo.stats()[:5] == (0, 0, 0, 0, 0)
+
+
+class TestEngineMemo:
+    """The engine reuses optimization data for identical requests"""
+
+    def test_opt_in(self):
+        """Engines do not memoize unless given a memo"""
+        assert OptimizationEngine().memo is None
+
+    def test_identical_requests_hit(self):
+        """Repeats are served from the memo with equal, independent data"""
+        memo = OptimizationMemo()
+        engine = OptimizationEngine(memo=memo)
+        first = engine.apply_optimization(make_request(engine, "Explain closures"))
+        first["improvements"].clear()
+        second = engine.apply_optimization(make_request(engine, "Explain closures"))
+        assert second == OptimizationEngine().apply_optimization(
+            make_request(engine, "Explain closures")
+        )
+        assert (memo.stats().hits, memo.stats().misses) == (1, 1)
+
+    def test_key_covers_request_shape(self):
+        """Platform, disabled stages and the stage order change the key"""
+        memo = OptimizationMemo()
+        engine = OptimizationEngine(memo=memo)
+        engine.apply_optimization(make_request(engine, "Explain closures"))
+        engine.apply_optimization(make_request(engine, "Explain closures", "gemini"))
+        request = make_request(engine, "Explain closures")
+        request.disabled_stages = frozenset({"design"})
+        assert "design_structure" not in engine.apply_optimization(request)[
+            "techniques_applied"
+        ]
+        engine.pipeline.reorder(["develop", "deconstruct", "design", "deliver"])
+        engine.apply_optimization(make_request(engine, "Explain closures"))
+        assert (memo.stats().hits, memo.stats().misses) == (0, 4)
+
+    def test_reregistered_platform_misses(self):
+        """Replacing a platform template invalidates memoized output"""
+        engine = OptimizationEngine(memo=OptimizationMemo())
+        before = engine.apply_optimization(
+            make_request(engine, "Explain closures", "gemini")
+        )["optimized_prompt"]
+        assert before.endswith("Be precise and helpful.")
+        try:
+            OptimizationTechniques.register_platform("gemini", suffix="Be brief.")
+            after = engine.apply_optimization(
+                make_request(engine, "Explain closures", "gemini")
+            )["optimized_prompt"]
+            assert after.endswith("Be brief.")
+        finally:
+            OptimizationTechniques.register_platform(
+                "gemini", **OptimizationTechniques.PLATFORM_TEMPLATES["gemini"]
+            )
+        assert engine.apply_optimization(
+            make_request(engine, "Explain closures", "gemini")
+        )["optimized_prompt"] == before
+
+    def test_vague_term_change_misses(self):
+        """Registering or dropping a vague term invalidates memoized output"""
+        engine = OptimizationEngine(memo=OptimizationMemo())
+        prompt = "Pick whatever suits the long build"
+        before = engine.apply_optimization(make_request(engine, prompt))
+        assert "whatever" in before["optimized_prompt"]
+        try:
+            VAGUE_TERM_REWRITER.register("whatever", "the chosen option")
+            after = engine.apply_optimization(make_request(engine, prompt))
+            assert "the chosen option" in after["optimized_prompt"]
+        finally:
+            VAGUE_TERM_REWRITER.unregister("whatever")
+        again = engine.apply_optimization(make_request(engine, prompt))
+        assert again["optimized_prompt"] == before["optimized_prompt"]
+
+    def test_lazy_requests_stay_within_max_bytes(self):
+        """Entries from lazy requests hold no more than the memo counts"""
+        import gc
+        import tracemalloc
+
+        from dmps.keywords import scan_keywords
+        from dmps.textstats import text_stats
+
+        def retained(memo, first):
+            engine = OptimizationEngine(memo=memo)
+            engine.apply_optimization(make_request(engine, "Warm up"), lazy=True)
+            gc.collect()
+            tracemalloc.start()
+            for index in range(first, first + 150):
+                prompt = f"Explain topic {index} " + "with background detail " * 80
+                engine.apply_optimization(make_request(engine, prompt), lazy=True)
+            # Only the memo may keep anything alive past this point
+            text_stats.cache_clear()
+            scan_keywords.cache_clear()
+            gc.collect()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size
+
+        max_bytes = 256 * 1024
+        memo = OptimizationMemo(max_bytes=max_bytes)
+        extra = retained(memo, 0) - retained(None, 1000)
+        assert memo.stats().evictions > 0
+        assert extra <= max_bytes
+
+    def test_batch_uses_memo(self):
+        memo = OptimizationMemo()
+        engine = OptimizationEngine(memo=memo)
+        engine.apply_optimization_many(["Write a poem"] * 5)
+        assert (memo.stats().hits, memo.stats().misses) == (4, 1)
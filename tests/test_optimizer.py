@@ -4,7 +4,7 @@ Tests for the PromptOptimizer class.
 
 import pytest
 from dmps.optimizer import PromptOptimizer
-from dmps.schema import OptimizedResult, ValidationResult
+from dmps.schema import OptimizedResult, ValidationResult, VariantSpec
 
 
 class TestPromptOptimizer:
@@ -84,4 +84,113 @@ class TestPromptOptimizer:
         # This would require mocking internal components to force an error
         # For now, just test that the optimizer handles normal cases
         result, validation = self.optimizer.optimize("Normal prompt")
-        assert validation.is_valid
\ No newline at end of file
+        assert validation.is_valid
+
+
+class TestGenerateVariants:
+    """Variants share one validation and analysis"""
+
+    PROMPT = "Tell me about stuff and give me some ideas for a weekend trip"
+
+    def setup_method(self):
+        from dmps.engine import OptimizationEngine
+
+        self.optimizer = PromptOptimizer()
+        self.optimizer._engine = OptimizationEngine()
+
+    def test_variants_match_single_runs(self):
+        """Each variant equals a separate run with the same settings"""
+        engine = self.optimizer.engine
+        specs = [
+            VariantSpec("claude"),
+            VariantSpec("chatgpt-list", platform="chatgpt", output_type="list"),
+            VariantSpec("no-clarity", disabled_stages=frozenset({"develop"})),
+        ]
+        variants, validation = self.optimizer.generate_variants(self.PROMPT, specs)
+        assert validation.is_valid
+        assert [variant.spec for variant in variants] == specs
+        for variant, spec in zip(variants, specs):
+            request = engine.extract_intent(self.PROMPT)
+            request.platform = spec.platform
+            request.output_type = spec.output_type or request.output_type
+            request.disabled_stages = spec.disabled_stages
+            data = engine.apply_optimization(request)
+            assert variant.optimized_prompt == data["optimized_prompt"]
+            assert variant.techniques_applied == data["techniques_applied"]
+            assert variant.token_estimate == max(1, len(variant.optimized_prompt) // 4)
+        assert "develop_clarity" not in variants[2].techniques_applied
+
+    def test_analysis_runs_once(self, monkeypatch):
+        """The prompt is analyzed once however many variants are built"""
+        engine = self.optimizer.engine
+        calls = []
+        analyze = engine.analyze
+        monkeypatch.setattr(
+            engine, "analyze", lambda prompt: calls.append(prompt) or analyze(prompt)
+        )
+        specs = [VariantSpec(platform) for platform in ("claude", "gemini", "generic")]
+        variants, _ = self.optimizer.generate_variants(self.PROMPT, specs)
+        assert len(variants) == 3 and len(calls) == 1
+
+    def test_invalid_specs_and_input(self):
+        """Bad specs raise up front; invalid input yields no variants"""
+        with pytest.raises(ValueError):
+            self.optimizer.generate_variants(self.PROMPT, [VariantSpec("x", "bard")])
+        with pytest.raises(ValueError):
+            self.optimizer.generate_variants(
+                self.PROMPT, [VariantSpec("x", disabled_stages=frozenset({"dev"}))]
+            )
+        variants, validation = self.optimizer.generate_variants("", [VariantSpec("a")])
+        assert variants == [] and not validation.is_valid
+
+
+class TestTokenBudget:
+    """max_tokens leaves out technique additions that do not fit"""
+
+    PROMPT = "Explain how a hash map works with something about stuff in it"
+
+    def setup_method(self):
+        from dmps.engine import OptimizationEngine
+
+        self.optimizer = PromptOptimizer()
+        self.optimizer._engine = OptimizationEngine()
+
+    def _optimized(self, max_tokens):
+        engine = self.optimizer.engine
+        request = engine.extract_intent(self.PROMPT)
+        request.max_tokens = max_tokens
+        return engine.apply_optimization(request)
+
+    def test_budget_is_respected(self):
+        """Every budget the prompt itself fits in is met"""
+        from dmps.token_tracker import token_tracker
+
+        unbounded = self._optimized(None)["optimized_prompt"]
+        floor = token_tracker.estimate_tokens(self.PROMPT)
+        for max_tokens in range(floor, token_tracker.estimate_tokens(unbounded) + 2):
+            data = self._optimized(max_tokens)
+            assert data["within_budget"]
+            assert token_tracker.estimate_tokens(data["optimized_prompt"]) <= max_tokens
+        assert self._optimized(1000)["optimized_prompt"] == unbounded
+
+    def test_partial_additions(self):
+        """Additions that fit are kept in order; the rest are dropped"""
+        data = self._optimized(16)
+        assert data["optimized_prompt"] == (
+            "Explain how a hash map works with a specific item about stuff in it"
+        )
+        assert data["techniques_applied"] == ["develop_clarity"]
+
+    def test_prompt_over_budget(self):
+        """The prompt is never cut; optimize() warns instead"""
+        data = self._optimized(5)
+        assert data["optimized_prompt"] == self.PROMPT and not data["within_budget"]
+        _, validation = self.optimizer.optimize(self.PROMPT, max_tokens=5)
+        assert "Prompt exceeds the token budget even without additions" in (
+            validation.warnings
+        )
+
+    def test_invalid_budget(self):
+        """A budget below one token is a validation error"""
+        result, validation = self.optimizer.optimize(self.PROMPT, max_tokens=0)
+        assert not validation.is_valid and result.metadata["error"]
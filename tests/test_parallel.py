@@ -0,0 +1,70 @@
+"""
+Tests for the process-pool optimizer.
+"""
+
+import pytest
+from dmps.engine import OptimizationEngine
+from dmps.parallel import OptimizationOutcome, ParallelOptimizer
+
+
+class FailingEngine(OptimizationEngine):
+    """Engine that fails on prompts mentioning 'boom'"""
+
+    def _analyze(self, prompt, intent):
+        if "boom" in prompt:
+            raise ValueError(f"cannot analyze {prompt!r}")
+        return super()._analyze(prompt, intent)
+
+
+PROMPTS = [f"Explain topic {index} with something concrete" for index in range(40)]
+
+
+@pytest.fixture(scope="module")
+def optimizer():
+    with ParallelOptimizer(max_workers=2, chunk_size=7) as pool:
+        yield pool
+
+
+class TestParallelOptimizer:
+    """Sharded results match the single-process engine"""
+
+    def test_results_in_order(self, optimizer):
+        """Outcomes line up with the inputs and the in-process batch"""
+        outcomes = optimizer.optimize_many(PROMPTS, platform="chatgpt")
+        expected = OptimizationEngine().apply_optimization_many(PROMPTS, "chatgpt")
+        assert [outcome.prompt for outcome in outcomes] == PROMPTS
+        assert all(outcome.ok for outcome in outcomes)
+        for outcome, (optimized, data, request) in zip(outcomes, expected):
+            assert outcome.optimized_prompt == optimized
+            assert outcome.optimization_data == data
+            assert outcome.request.intent == request.intent
+            assert outcome.request.analysis is None
+
+    def test_empty_batch(self, optimizer):
+        assert optimizer.optimize_many([]) == []
+
+    def test_errors_are_per_item(self):
+        """A failing prompt is reported without failing its chunk"""
+        prompts = ["Explain closures", "boom goes the prompt", "Write a poem"]
+        with ParallelOptimizer(
+            max_workers=1, engine_factory=FailingEngine, prewarm=False
+        ) as pool:
+            outcomes = pool.optimize_many(prompts)
+        assert [outcome.ok for outcome in outcomes] == [True, False, True]
+        assert isinstance(outcomes[1].error, ValueError)
+        assert outcomes[1] == OptimizationOutcome(prompts[1], error=outcomes[1].error)
+
+    def test_invalid_platform_reported(self, optimizer):
+        """Request errors come back as outcomes, not raised"""
+        outcomes = optimizer.optimize_many(["Explain closures"], platform="nope")
+        assert isinstance(outcomes[0].error, ValueError)
+
+    def test_chunk_sizing(self):
+        """Default chunks spread a batch over the workers within bounds"""
+        pool = ParallelOptimizer.__new__(ParallelOptimizer)
+        pool.max_workers, pool.chunk_size = 8, None
+        assert pool._chunk_size_for(10) == ParallelOptimizer.MIN_CHUNK_SIZE
+        assert pool._chunk_size_for(3200) == 100
+        assert pool._chunk_size_for(10**7) == ParallelOptimizer.MAX_CHUNK_SIZE
+        with pytest.raises(ValueError):
+            ParallelOptimizer(chunk_size=0)
@@ -0,0 +1,242 @@
+"""
+Tests for the engine's stage pipeline.
+"""
+
+import json
+import pickle
+
+import pytest
+from dmps.engine import OptimizationEngine
+from dmps.optimizer import PromptOptimizer
+from dmps.pipeline import (
+    LazyMapping,
+    StageContext,
+    StageEdits,
+    StageLatencyTable,
+    StagePipeline,
+    _percentile,
+)
+
+PROMPT = "Tell me about stuff and give me some ideas for a weekend trip"
+
+
+class UpperStage:
+    """Stage that upper-cases the prompt"""
+
+    name = "upper"
+
+    def run(self, ctx: StageContext) -> None:
+        ctx.prompt = ctx.prompt.upper()
+        ctx.data["techniques_applied"].append("upper")
+
+
+class TestStagePipeline:
+    """Stages run in registry order and can be rearranged"""
+
+    def setup_method(self):
+        self.engine = OptimizationEngine()
+        self.request = self.engine.extract_intent(PROMPT)
+
+    def test_default_matches_plan(self):
+        """The default pipeline gives the compiled plan's output"""
+        data = self.engine.apply_optimization(self.request)
+        plan = self.engine.techniques.plan(
+            self.request.intent, self.request.platform, self.request.output_type
+        )
+        assert self.engine.pipeline.names == (
+            "deconstruct",
+            "develop",
+            "design",
+            "deliver",
+        )
+        assert data["optimized_prompt"] == plan.run(self.request.raw_input)[2]
+        assert data["techniques_applied"] == [
+            "develop_clarity",
+            "design_structure",
+            "deliver_format",
+        ]
+        assert "components" in data
+
+    def test_disabled_stages_per_request(self):
+        """Disabled stages are skipped for that request only"""
+        self.request.disabled_stages = frozenset({"design", "deconstruct"})
+        data = self.engine.apply_optimization(self.request)
+        assert data["techniques_applied"] == ["develop_clarity", "deliver_format"]
+        assert "components" not in data
+        assert "Human:" not in data["optimized_prompt"]
+
+        other = self.engine.extract_intent(PROMPT)
+        assert "design_structure" in self.engine.apply_optimization(other)[
+            "techniques_applied"
+        ]
+
+    def test_register_and_reorder(self):
+        """Custom stages slot in by name and the order can be changed"""
+        pipeline = self.engine.pipeline
+        pipeline.register(UpperStage(), after="deliver")
+        assert pipeline.names[-1] == "upper"
+        data = self.engine.apply_optimization(self.request)
+        assert data["optimized_prompt"].isupper()
+
+        pipeline.reorder(["upper", "deconstruct", "develop", "design", "deliver"])
+        assert pipeline.names[0] == "upper"
+        pipeline.remove("upper")
+        assert "upper" not in pipeline.names
+
+    def test_registry_errors(self):
+        """Duplicates, unknown names and partial orders are rejected"""
+        pipeline = StagePipeline.default()
+        with pytest.raises(ValueError):
+            pipeline.register(pipeline.get("develop"))
+        with pytest.raises(KeyError):
+            pipeline.register(UpperStage(), before="missing")
+        with pytest.raises(KeyError):
+            pipeline.remove("missing")
+        with pytest.raises(ValueError):
+            pipeline.reorder(["develop", "design"])
+
+
+class TestEditScripts:
+    """Rewrite stages record edit scripts instead of comparing strings"""
+
+    def setup_method(self):
+        self.engine = OptimizationEngine()
+
+    def test_scripts_replay_to_output(self):
+        """Replaying each stage's script from the original gives the output"""
+        from dmps.techniques import apply_edits
+
+        data = self.engine.apply_optimization(self.engine.extract_intent(PROMPT))
+        assert [entry.technique for entry in data["edits"]] == data[
+            "techniques_applied"
+        ]
+        text = PROMPT
+        for entry in data["edits"]:
+            assert isinstance(entry, StageEdits) and entry.edits
+            text = apply_edits(text, entry.edits)
+        assert text == data["optimized_prompt"]
+
+    def test_unchanged_step_records_nothing(self):
+        """A step with an empty script is not reported as an improvement"""
+        prompt = (
+            "Summarize the following quarterly report for the finance team "
+            "and highlight the main risks, using a clear format."
+        )
+        request = self.engine.extract_intent(prompt)
+        request.platform = "generic"
+        data = self.engine.apply_optimization(request)
+        assert data["techniques_applied"] == []
+        assert data["edits"] == [] and data["optimized_prompt"] == prompt
+
+    def test_rewrite_stage_requires_rewrite(self):
+        """A rewrite stage without a rewrite step cannot be instantiated"""
+        from dmps.pipeline import _RewriteStage
+
+        class NoStep(_RewriteStage):
+            name = "none"
+
+        with pytest.raises(TypeError):
+            NoStep()
+
+
+class TestLazyComponents:
+    """Components are only deconstructed when something reads them"""
+
+    def setup_method(self):
+        self.engine = OptimizationEngine()
+        self.request = self.engine.extract_intent(PROMPT)
+
+    def test_computed_on_first_access(self):
+        """The factory runs once, on the first read"""
+        calls = []
+        lazy = LazyMapping(lambda: calls.append(1) or {"length": 3})
+        assert not lazy.resolved and calls == []
+        assert lazy["length"] == 3
+        assert dict(lazy) == {"length": 3} and lazy == {"length": 3}
+        assert lazy.resolved and calls == [1]
+
+    def test_matches_eager_deconstruct(self):
+        """Resolved components equal the eager deconstruction"""
+        data = self.engine.apply_optimization(self.request, lazy=True)
+        components = data["components"]
+        assert not components.resolved
+        assert components == self.engine._deconstruct_prompt(
+            PROMPT, self.request.analysis
+        )
+
+    def test_pickles_as_dict(self):
+        """Process-pool results carry a plain dict"""
+        data = self.engine.apply_optimization(self.request, lazy=True)
+        restored = pickle.loads(pickle.dumps(data["components"]))
+        assert type(restored) is dict and restored == data["components"]
+
+    def test_public_data_is_json_serializable(self):
+        """Without ``lazy`` the optimization data round-trips through JSON"""
+        data = self.engine.apply_optimization(self.request)
+        assert type(data["components"]) is dict
+        restored = json.loads(json.dumps(data))
+        assert restored["components"] == self.engine._deconstruct_prompt(
+            PROMPT, self.request.analysis
+        )
+        (_, batch_data, _), = self.engine.apply_optimization_many([PROMPT])
+        assert json.loads(json.dumps(batch_data)) == restored
+
+    def test_conversational_skips_deconstruct(self, monkeypatch):
+        """Only the structured output deconstructs the prompt"""
+        calls = []
+        engine = OptimizationEngine()
+        deconstruct = engine._deconstruct_prompt
+
+        def counting(*args):
+            calls.append(1)
+            return deconstruct(*args)
+
+        monkeypatch.setattr(engine, "_deconstruct_prompt", counting)
+        optimizer = PromptOptimizer()
+        optimizer._engine = engine
+
+        optimizer.optimize(PROMPT, "conversational")
+        assert calls == []
+        result, _ = optimizer.optimize(PROMPT, "structured")
+        assert calls == [1]
+        analyzed = json.loads(result.optimized_prompt)["optimization_result"][
+            "metadata"
+        ]["components_analyzed"]
+        assert analyzed["word_count"] == 13
+
+
+class TestStageLatency:
+    """Each stage run lands in the latency table"""
+
+    def test_runs_are_timed(self):
+        """Every enabled stage records one sample per request"""
+        engine = OptimizationEngine()
+        request = engine.extract_intent("Debug code")
+        for _ in range(3):
+            engine.apply_optimization(request)
+        request.disabled_stages = frozenset({"design"})
+        engine.apply_optimization(request)
+
+        table = engine.pipeline.latency.snapshot()
+        assert table["develop"].count == 4
+        assert table["design"].count == 3
+        assert all(row.max_ns >= row.p99_ns >= row.p50_ns > 0 for row in table.values())
+
+    def test_window_and_reset(self):
+        """Only the latest samples are summarized; counts keep totals"""
+        table = StageLatencyTable(window=2)
+        for elapsed in (100, 5, 7):
+            table.record("stage", elapsed)
+        row = table.snapshot()["stage"]
+        assert (row.count, row.max_ns, row.mean_ns) == (3, 7, 6)
+        table.reset()
+        assert table.snapshot() == {}
+        with pytest.raises(ValueError):
+            StageLatencyTable(window=0)
+
+    def test_percentile(self):
+        """Nearest-rank percentiles"""
+        samples = list(range(1, 101))
+        assert _percentile(samples, 50) == 50
+        assert _percentile(samples, 99) == 99
+        assert _percentile([3], 99) == 3
@@ -0,0 +1,62 @@
+"""
+Tests for performance monitoring and sampling.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from dmps import profiler
+from dmps.intent import IntentClassifier
+from dmps.profiler import performance_monitor, set_sampling_rate
+
+
+class TestSamplingRate:
+    """Global sampling rate controls how many monitored calls are timed"""
+
+    def teardown_method(self):
+        set_sampling_rate(1.0)
+
+    def _timed_calls(self, calls):
+        @performance_monitor(threshold=10)
+        def monitored():
+            return "ok"
+
+        with patch.object(profiler.time, "perf_counter", return_value=0.0) as timer:
+            for _ in range(calls):
+                assert monitored() == "ok"
+        return timer.call_count // 2
+
+    def test_default_times_every_call(self):
+        """Rate 1.0 keeps the original always-on behavior"""
+        assert profiler.get_sampling_rate() == 1.0
+        assert self._timed_calls(10) == 10
+
+    def test_zero_rate_makes_no_timer_calls(self):
+        """Rate 0 bypasses the timer entirely"""
+        set_sampling_rate(0)
+        assert self._timed_calls(10) == 0
+
+    def test_partial_rate_samples_calls(self):
+        """Rate 0.25 times one call in four"""
+        set_sampling_rate(0.25)
+        assert self._timed_calls(20) == 5
+
+    def test_invalid_rate_rejected(self):
+        """Rates outside 0-1 are rejected"""
+        with pytest.raises(ValueError):
+            set_sampling_rate(1.5)
+
+    def test_classify_is_monitored_without_per_call_wrapping(self):
+        """classify is decorated once at class level and honors the rate"""
+        classifier = IntentClassifier()
+        assert IntentClassifier.classify.__wrapped__ is not None
+        set_sampling_rate(0)
+        with patch.object(profiler.time, "perf_counter") as timer:
+            assert classifier.classify("Debug this code") == "technical"
+        assert timer.call_count == 0
+
+    def test_observed_fraction_matches_rate(self):
+        """Rates that are not 1/n are honored exactly, not rounded"""
+        for rate in (0.6, 0.7):
+            set_sampling_rate(rate)
+            assert self._timed_calls(100) == round(100 * rate), rate
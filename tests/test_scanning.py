@@ -0,0 +1,92 @@
+"""
+Tests for chunked full-length detection.
+"""
+
+import random
+import re
+
+import pytest
+from dmps.engine import OptimizationEngine
+from dmps.scanning import ChunkedScanner
+
+DETECTORS = {
+    "json": re.compile(r"\bjson\b", re.IGNORECASE),
+    "words": re.compile(r"\b\d{1,4}\s*words?\b", re.IGNORECASE),
+    "brief": re.compile(r"\bbrief\b", re.IGNORECASE),
+}
+FILLER = ("alpha", "beta", "briefly", "xjson", "500", "words", "JSON", "brief")
+
+
+class TestChunkedScanner:
+    """Chunked detection agrees with a whole-text search"""
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_matches_whole_text_search(self, seed):
+        """Windows, overlap and word boundaries give whole-text results"""
+        rng = random.Random(seed)
+        text = " ".join(rng.choice(FILLER) for _ in range(rng.randint(0, 400)))
+        scanner = ChunkedScanner(chunk_size=rng.randint(5, 60), overlap=16)
+        first = next(
+            (name for name, pattern in DETECTORS.items() if pattern.search(text)), ""
+        )
+        assert scanner.first(text, DETECTORS) == first
+        for pattern in DETECTORS.values():
+            spans = [match.span() for match in scanner.finditer(text, pattern)]
+            assert spans == [match.span() for match in pattern.finditer(text)]
+
+    def test_word_cut_at_window_edge(self):
+        """A word split by a window edge is not mistaken for a whole word"""
+        scanner = ChunkedScanner(chunk_size=10, overlap=8)
+        text = "aaaaaaa briefly"
+        assert scanner.first(text, DETECTORS) == ""
+        assert scanner.first(text + " brief", DETECTORS) == "brief"
+
+    def test_stops_once_all_fired(self):
+        """Later windows are not searched once the first detector has fired"""
+        calls = []
+
+        class Recording:
+            def search(self, text, start, end):
+                calls.append(start)
+                return re.compile("x").search(text, start, end)
+
+        scanner = ChunkedScanner(chunk_size=10, overlap=0)
+        assert scanner.first("x" * 100, {"x": Recording()}) == "x"
+        assert calls == [0]
+
+    def test_budget_bounds_cost(self):
+        """Text past the budget is treated as having no matches"""
+        text = "a" * 5000 + " json"
+        json_only = {"json": DETECTORS["json"]}
+        assert ChunkedScanner(budget=10_000).first(text, json_only) == "json"
+        assert ChunkedScanner(budget=3_000).first(text, json_only) == ""
+
+    def test_rejects_bad_sizes(self):
+        with pytest.raises(ValueError):
+            ChunkedScanner(chunk_size=0)
+        with pytest.raises(ValueError):
+            ChunkedScanner(budget=0)
+
+
+class TestFullLengthAnalysis:
+    """The engine sees format and constraints past the first chunk"""
+
+    PADDING = "Consider the following background material carefully. " * 40
+
+    def test_constraints_at_end(self):
+        """A constraint near the end of a long prompt is found"""
+        engine = OptimizationEngine()
+        prompt = self.PADDING + "Answer in JSON, 200 words."
+        assert len(prompt) > engine.MAX_REGEX_INPUT
+        assert engine._extract_user_constraints(prompt) == ["200 words", "JSON format"]
+
+    def test_output_format_and_missing_info_at_end(self):
+        """Format indicators and context terms late in the prompt count"""
+        engine = OptimizationEngine()
+        prompt = self.PADDING.replace("background", "reading") + "Write a story."
+        assert engine._determine_expected_output_format(prompt) == "creative"
+        assert engine._identify_missing_info(prompt, "creative") == [
+            "Creative direction could be specified"
+        ]
+        styled = prompt + " Use a playful tone."
+        assert engine._identify_missing_info(styled, "creative") == []
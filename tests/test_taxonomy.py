@@ -0,0 +1,203 @@
+"""
+Tests for taxonomy files and the compiled taxonomy cache.
+"""
+
+import hashlib
+import json
+
+import pytest
+from dmps import taxonomy
+from dmps.intent import _DEFAULT_BANK, IntentClassifier, PatternBank
+
+TAXONOMY = {
+    "intents": {
+        "cooking": {
+            "keywords": ["recipe", "bake"],
+            "rules": [
+                ["recipe", "bake", "simmer"],
+                {"triggers": ["how to"], "targets": ["cook", "roast"]},
+            ],
+        },
+        "travel": {"rules": [["flight", "hotel", "itinerary"]]},
+        "general": {"keywords": ["help"]},
+    }
+}
+
+TOML = """
+[intents.cooking]
+keywords = ["recipe", "bake"]
+rules = [
+    ["recipe", "bake", "simmer"],
+    {triggers = ["how to"], targets = ["cook", "roast"]},
+]
+
+[intents.travel]
+rules = [["flight", "hotel", "itinerary"]]
+
+[intents.general]
+keywords = ["help"]
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_banks():
+    """Each test starts without process-cached banks"""
+    taxonomy._loaded_banks.clear()
+    yield
+    taxonomy._loaded_banks.clear()
+
+
+@pytest.fixture
+def json_file(tmp_path):
+    path = tmp_path / "intents.json"
+    path.write_text(json.dumps(TAXONOMY))
+    return path
+
+
+class TestTaxonomyFiles:
+    """Taxonomies load from JSON and TOML into a working classifier"""
+
+    def test_json_taxonomy(self, json_file, tmp_path):
+        """Rules score, keyword-only intents never do"""
+        classifier = IntentClassifier.from_taxonomy(json_file, cache_dir=tmp_path)
+        assert classifier.classify("Bake and simmer the recipe") == "cooking"
+        assert classifier.classify("Book a flight and a hotel") == "travel"
+        assert classifier.classify("how to roast peppers") == "cooking"
+        assert classifier.classify("help me") == "general"
+        assert classifier._scanner.intents == ("cooking", "travel")
+
+    def test_taxonomy_keywords(self, json_file, tmp_path):
+        """Keywords come from the taxonomy, falling back to 'general'"""
+        classifier = IntentClassifier.from_taxonomy(json_file, cache_dir=tmp_path)
+        assert classifier.get_intent_keywords("cooking") == ["recipe", "bake"]
+        assert classifier.get_intent_keywords("unknown") == ["help"]
+        assert classifier.get_matched_keywords("Bake it, help!") == {
+            "cooking": ["bake"],
+            "general": ["help"],
+        }
+
+    def test_toml_matches_json(self, json_file, tmp_path):
+        """The TOML form compiles to the same bank as the JSON form"""
+        try:
+            taxonomy._load_toml()
+        except ImportError:
+            pytest.skip("no TOML parser available")
+        toml_file = tmp_path / "intents.toml"
+        toml_file.write_text(TOML)
+        from_toml = taxonomy.load_pattern_bank(toml_file, use_cache=False)
+        from_json = taxonomy.load_pattern_bank(json_file, use_cache=False)
+        assert from_toml.to_spec() == from_json.to_spec()
+
+    @pytest.mark.parametrize(
+        "document",
+        [
+            {},
+            {"intents": []},
+            {"intents": {"x": {"rules": [["bad/phrase"]]}}},
+            {"intents": {"x": {"rules": [{"triggers": ["a"]}]}}},
+            {"intents": {"x": {"rules": ["not a list"]}}},
+            {"intents": {"x": {"unknown": []}}},
+            {"intents": {"x": {"keywords": ["only"]}}},
+        ],
+    )
+    def test_invalid_taxonomies_raise(self, tmp_path, document):
+        """Malformed taxonomies are rejected with ValueError"""
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps(document))
+        with pytest.raises(ValueError):
+            taxonomy.load_pattern_bank(path, use_cache=False)
+
+    def test_unsupported_format(self, tmp_path):
+        """Only .json and .toml files are accepted"""
+        path = tmp_path / "intents.yaml"
+        path.write_text("intents: {}")
+        with pytest.raises(ValueError):
+            taxonomy.load_pattern_bank(path, use_cache=False)
+
+
+class TestTaxonomyCache:
+    """Compiled taxonomies are cached on disk by file hash"""
+
+    def test_cache_keyed_by_file_hash(self, json_file, tmp_path):
+        """The cache entry is named after the file's SHA-256"""
+        taxonomy.load_pattern_bank(json_file, cache_dir=tmp_path / "cache")
+        digest = hashlib.sha256(json_file.read_bytes()).hexdigest()
+        cached = tmp_path / "cache" / "taxonomy" / f"{digest}.json"
+        spec = json.loads(cached.read_text())
+        assert spec["version"] == taxonomy.SPEC_VERSION
+
+    def test_warm_load_skips_parsing(self, json_file, tmp_path, monkeypatch):
+        """A cached taxonomy is rebuilt without parsing or compiling it"""
+        cache = tmp_path / "cache"
+        cold = taxonomy.load_pattern_bank(json_file, cache_dir=cache)
+        taxonomy._loaded_banks.clear()
+
+        def fail(*args):
+            raise AssertionError("taxonomy was re-parsed")
+
+        monkeypatch.setattr(taxonomy, "parse_taxonomy", fail)
+        warm = taxonomy.load_pattern_bank(json_file, cache_dir=cache)
+        assert warm is not cold
+        prompt = "how to cook a recipe, then book a flight"
+        assert warm.scanner.scan(prompt) == cold.scanner.scan(prompt)
+
+    def test_banks_shared_within_process(self, json_file, tmp_path):
+        """Loading the same file twice returns the same bank"""
+        first = taxonomy.load_pattern_bank(json_file, cache_dir=tmp_path)
+        assert taxonomy.load_pattern_bank(json_file, cache_dir=tmp_path) is first
+
+    def test_edited_file_gets_new_entry(self, json_file, tmp_path):
+        """Changing the file changes the cache key"""
+        cache = tmp_path / "cache"
+        taxonomy.load_pattern_bank(json_file, cache_dir=cache)
+        edited = json.loads(json_file.read_text())
+        edited["intents"]["travel"]["rules"].append(["passport"])
+        json_file.write_text(json.dumps(edited))
+        bank = taxonomy.load_pattern_bank(json_file, cache_dir=cache)
+        assert len(list((cache / "taxonomy").iterdir())) == 2
+        assert bank.scanner.score("passport") == {"cooking": 0, "travel": 1}
+
+    def test_corrupt_or_stale_cache_is_rebuilt(self, json_file, tmp_path):
+        """Unreadable or old-version entries are ignored and rewritten"""
+        cache = tmp_path / "cache"
+        digest = hashlib.sha256(json_file.read_bytes()).hexdigest()
+        entry = cache / "taxonomy" / f"{digest}.json"
+        entry.parent.mkdir(parents=True)
+        for content in ("{not json", json.dumps({"version": 0})):
+            entry.write_text(content)
+            taxonomy._loaded_banks.clear()
+            bank = taxonomy.load_pattern_bank(json_file, cache_dir=cache)
+            assert bank.scanner.score("bake")["cooking"] == 1
+            assert json.loads(entry.read_text())["version"] == taxonomy.SPEC_VERSION
+
+    def test_unwritable_cache_is_ignored(self, json_file, tmp_path):
+        """Cache write failures do not fail the load"""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        bank = taxonomy.load_pattern_bank(json_file, cache_dir=blocker)
+        assert bank.scanner.score("hotel")["travel"] == 1
+
+    def test_default_cache_dir_env(self, monkeypatch, tmp_path):
+        """DMPS_CACHE_DIR overrides the default cache location"""
+        monkeypatch.setenv(taxonomy.CACHE_DIR_ENV, str(tmp_path))
+        assert taxonomy.default_cache_dir() == tmp_path
+
+
+class TestPatternBankSpec:
+    """The JSON spec round-trips the built-in taxonomy"""
+
+    def test_default_bank_round_trip(self):
+        """A bank rebuilt from its spec scores identically"""
+        spec = json.loads(json.dumps(_DEFAULT_BANK.to_spec()))
+        bank = PatternBank.from_spec(spec)
+        assert bank.scanner.rules == _DEFAULT_BANK.scanner.rules
+        assert dict(bank.keywords) == dict(_DEFAULT_BANK.keywords)
+        prompt = "Explain how does the API work?\nWrite a story, then analyze data"
+        assert bank.scanner.scan(prompt) == _DEFAULT_BANK.scanner.scan(prompt)
+
+    def test_patterns_compile_lazily(self):
+        """Standalone regexes are compiled only when accessed"""
+        bank = PatternBank.from_intents(TAXONOMY["intents"])
+        assert bank.compiled_patterns._compiled == {}
+        assert bank.compiled_patterns["travel"][0].search("a HOTEL")
+        assert list(bank.compiled_patterns._compiled) == ["travel"]
@@ -3,7 +3,17 @@ Tests for optimization techniques.
 """
 
 import pytest
-from dmps.techniques import OptimizationTechniques
+from dmps.rbac import AccessControl, Role
+from dmps.techniques import (
+    PLATFORMS,
+    VAGUE_TERM_REWRITER,
+    Edit,
+    OptimizationTechniques,
+    PlatformTemplate,
+    VagueTermRewriter,
+    apply_edits,
+    fit_edits,
+)
 from dmps.schema import OptimizationRequest
 
 
@@ -80,4 +90,211 @@ class TestOptimizationTechniques:
     def test_unknown_technique(self):
         """Test handling of unknown technique"""
         result = OptimizationTechniques.apply_technique("unknown_technique", self.sample_request)
-        assert result == ""
\ No newline at end of file
+        assert result == ""
+
+
+class TestOptimizationPlans:
+    """Compiled plans are cached per request shape and match the step methods"""
+
+    def test_plans_are_cached(self):
+        """The same (intent, platform, output_type) reuses one plan"""
+        techniques = OptimizationTechniques()
+        plan = techniques.plan("technical", "claude", "code")
+        assert techniques.plan("technical", "claude", "code") is plan
+        assert techniques.plan("technical", "claude", "list") is not plan
+
+    @pytest.mark.parametrize(
+        "prompt",
+        [
+            "Debug code",
+            "Tell me something about stuff",
+            "Explain the background of the API in a long and detailed way please now",
+            "Format this as a list!",
+        ],
+    )
+    @pytest.mark.parametrize("platform", ["claude", "chatgpt", "gemini", "generic"])
+    def test_plan_matches_step_methods(self, prompt, platform):
+        """plan.run() gives the same three stages as the step methods"""
+        techniques = OptimizationTechniques()
+        developed = techniques.develop_clarity(prompt, "technical")
+        designed = techniques.design_structure(developed, platform, "technical")
+        final = techniques.deliver_format(designed, "code")
+        plan = techniques.plan("technical", platform, "code")
+        assert plan.run(prompt) == (developed, designed, final)
+
+    def test_invalid_platform_not_cached(self):
+        """Unknown platforms raise and leave no plan behind"""
+        techniques = OptimizationTechniques()
+        with pytest.raises(ValueError):
+            techniques.plan("general", "unknown", "general")
+        assert ("general", "unknown", "general") not in techniques._plans
+
+
+class TestVagueTermRewriter:
+    """Vague terms are replaced in one pass from an extensible table"""
+
+    def test_default_replacements(self):
+        """Every default term is replaced, whole words only, any case"""
+        rewritten = VAGUE_TERM_REWRITER.rewrite(
+            "Something about Stuff and THINGS, anything but stuffing"
+        )
+        assert rewritten == (
+            "a specific item about relevant details and specific elements, "
+            "any relevant information but stuffing"
+        )
+
+    def test_register_extends_table(self):
+        """Registered terms apply from the next call on"""
+        rewriter = VagueTermRewriter()
+        rewriter.rewrite("stuff")
+        rewriter.register("Kind of", "specifically")
+        rewriter.register("etc.", "and the remaining items")
+        assert rewriter.rewrite("kind of stuff, etc. ok") == (
+            "specifically relevant details, and the remaining items ok"
+        )
+        assert "kind of" not in VAGUE_TERM_REWRITER.replacements
+
+    def test_unicode_case_variants_are_replaced(self):
+        """Case variants that do not lower() to the term are still replaced"""
+        rewriter = VagueTermRewriter()
+        assert rewriter.rewrite("ſtuff and ſomething") == (
+            "relevant details and a specific item"
+        )
+        assert rewriter.rewrite_edits("ſtuff").text == "relevant details"
+
+    def test_longest_term_wins(self):
+        """A term is not cut short by a shorter term it starts with"""
+        rewriter = VagueTermRewriter({"some": "a few", "some things": "items"})
+        assert rewriter.rewrite("some things and some") == "items and a few"
+
+    def test_empty_table(self):
+        """Without terms the prompt comes back unchanged"""
+        assert VagueTermRewriter({}).rewrite("stuff") == "stuff"
+        with pytest.raises(ValueError):
+            VagueTermRewriter({" ": "x"})
+
+    def test_develop_uses_shared_rewriter(self):
+        """The Develop step picks up terms registered on the shared table"""
+        plan = OptimizationTechniques().plan("general", "generic", "general")
+        try:
+            VAGUE_TERM_REWRITER.register("whatever", "the chosen option")
+            assert plan.develop("Pick whatever works for the long build") == (
+                "Pick the chosen option works for the long build "
+                "Please provide detailed information."
+            )
+        finally:
+            VAGUE_TERM_REWRITER.unregister("whatever")
+        assert plan.develop("Pick whatever") == (
+            "Pick whatever Please provide detailed information."
+        )
+
+
+class TestPlatformRegistry:
+    """Platform templates are compiled once and extend by registration"""
+
+    def teardown_method(self):
+        if "mistral" in PLATFORMS:
+            OptimizationTechniques.unregister_platform("mistral")
+        OptimizationTechniques.register_platform("generic")
+
+    def test_builtin_templates(self):
+        """Built-in platforms render as their original format strings did"""
+        for name, spec in OptimizationTechniques.PLATFORM_TEMPLATES.items():
+            expected = spec["prefix"] + spec["structure"].format(action="do it")
+            if spec["suffix"]:
+                expected += " " + spec["suffix"]
+            assert PLATFORMS.get(name).apply("do it") == expected
+        assert PLATFORMS.names == OptimizationTechniques.ALLOWED_PLATFORMS
+
+    def test_template_without_placeholder(self):
+        """A structure without {action} is followed by the action"""
+        template = PlatformTemplate.compile("You are concise.", suffix="Thanks.")
+        assert template.apply("list it") == "You are concise. list it Thanks."
+        with pytest.raises(ValueError):
+            PlatformTemplate.compile("{action} and {action}")
+
+    def test_register_platform(self):
+        """A registered platform is authorized and used by plans"""
+        techniques = OptimizationTechniques()
+        with pytest.raises(ValueError):
+            techniques.plan("general", "mistral", "general")
+        OptimizationTechniques.register_platform(
+            "mistral", "[INST] {action} [/INST]"
+        )
+        assert AccessControl.validate_platform_access(Role.USER, "mistral")
+        assert techniques.design_structure("Sort a list", "mistral", "general") == (
+            "[INST] sort a list [/INST]"
+        )
+        with pytest.raises(ValueError):
+            OptimizationTechniques.register_platform("Not Valid")
+
+        OptimizationTechniques.unregister_platform("mistral")
+        with pytest.raises(ValueError):
+            techniques.plan("general", "mistral", "general")
+        assert not AccessControl.validate_platform_access(Role.USER, "mistral")
+
+    def test_reregister_drops_cached_plans(self):
+        """Replacing a platform's template recompiles its plans"""
+        techniques = OptimizationTechniques()
+        assert techniques.design_structure("Sort a list", "generic", "general") == (
+            "sort a list"
+        )
+        OptimizationTechniques.register_platform("generic", suffix="Be brief.")
+        assert techniques.design_structure("Sort a list", "generic", "general") == (
+            "sort a list Be brief."
+        )
+
+    def test_authorization_cached_per_role(self, monkeypatch):
+        """Access is checked once per (role, platform)"""
+        calls = []
+        check = AccessControl.validate_platform_access
+
+        def counting(role, platform):
+            calls.append((role, platform))
+            return check(role, platform)
+
+        monkeypatch.setattr(AccessControl, "validate_platform_access", counting)
+        monkeypatch.setattr(OptimizationTechniques, "_access", {})
+        for _ in range(3):
+            OptimizationTechniques.authorize("gemini")
+            OptimizationTechniques.authorize("gemini", Role.ADMIN)
+        assert calls == [(Role.USER, "gemini"), (Role.ADMIN, "gemini")]
+
+
+class TestEditScripts:
+    """Plan steps describe their changes as edits over their input"""
+
+    def setup_method(self):
+        self.plan = OptimizationTechniques().plan("technical", "generic", "code")
+
+    def test_develop_edits(self):
+        """Context, vague-term and detail edits carry input offsets"""
+        rewrite = self.plan.develop_edits("Fix stuff")
+        assert rewrite.edits == (
+            Edit(0, 0, "Context: "),
+            Edit(4, 9, "relevant details"),
+            Edit(9, 9, " Please provide detailed information."),
+        )
+        assert rewrite.text == apply_edits("Fix stuff", rewrite.edits)
+
+    def test_deliver_whitespace_edits(self):
+        """Whitespace runs collapse and the closing text is appended"""
+        rewrite = self.plan.deliver_edits("  Use a  clear format")
+        assert rewrite.edits == (Edit(0, 2, ""), Edit(7, 9, " "), Edit(21, 21, "."))
+        assert rewrite.text == "Use a clear format."
+
+    def test_unchanged_step_has_no_edits(self):
+        """A no-op step returns its input and an empty script"""
+        prompt = "Use a clear format."
+        rewrite = self.plan.deliver_edits(prompt)
+        assert not rewrite.changed and rewrite.text is prompt
+
+    def test_fit_edits(self):
+        """Shrinking edits stay; growing ones are kept in order while they fit"""
+        source = "Fix  stuff"
+        rewrite = self.plan.develop_edits(source)
+        assert fit_edits(source, rewrite, 1000) is rewrite
+        fitted = fit_edits(source, rewrite, len("Context: Fix  relevant details"))
+        assert fitted.text == "Context: Fix  relevant details"
+        assert fitted.edits == rewrite.edits[:2]
+        assert fit_edits(source, rewrite, 3).text == source
@@ -0,0 +1,43 @@
+"""
+Tests for shared text statistics.
+"""
+
+from dmps.engine import OptimizationEngine
+from dmps.keywords import scan_keywords
+from dmps.textstats import TextStats, text_stats
+
+
+class TestTextStats:
+    """Statistics are computed lazily, once per string"""
+
+    def test_values_match_str_methods(self):
+        """Each statistic equals the str method it replaces"""
+        text = "Tell ME about\tthe  Things and things"
+        stats = TextStats(text)
+        assert stats.words == text.split()
+        assert stats.word_count == 7
+        assert stats.char_count == len(text)
+        assert stats.lowered == text.lower()
+        assert stats.lower_words == text.lower().split()
+        assert stats.vocabulary == frozenset(text.lower().split())
+
+    def test_computed_lazily_and_once(self):
+        """Nothing is computed until asked, and results are reused"""
+        stats = TextStats("One Two")
+        assert stats._words is None and stats._lowered is None
+        assert stats.words is stats.words
+        assert stats._lowered is None
+        assert stats.lower_words is stats.lower_words
+
+    def test_shared_per_string(self):
+        """Consumers of the same string share one TextStats"""
+        prompt = "Explain closures with something concrete"
+        assert text_stats(prompt) is text_stats(prompt)
+        assert scan_keywords(prompt).lowered is text_stats(prompt).lowered
+
+    def test_analysis_carries_stats(self):
+        """The prompt analysis exposes the original prompt's statistics"""
+        prompt = "Write a short story about stuff"
+        analysis = OptimizationEngine().analyze(prompt)
+        assert analysis.stats is text_stats(prompt)
+        assert analysis.word_count == analysis.stats.word_count == 6